@@ -1,7 +1,10 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-import pandas as pd
-import joblib
-import time
+
+# stdlib only, spans are no-ops unless CAREER_TRACE is set
+from src.instrumentation import span, traced
 
 
 #  1. SETUP PAGE & CONFIGURATION (MUST BE FIRST) ---
@@ -12,16 +15,61 @@ st.set_page_config(
 )
 
 #  2. LOAD YOUR ML MODEL 
-@st.cache_resource
-def load_model():
+# Every quiz answer combination is scored once into a lookup table.
+# The table is rebuilt automatically when the model or preprocessor file changes.
+# The src modules (numpy, pandas, sklearn) are imported inside the loaders,
+# which run in a background thread started on the first render: the page
+# shows straight away and the model is usually ready before the first answer.
+def _load_quiz_table():
+    from src import quiz_table
+    try:
+        # Make sure these paths are correct on your computer
+        return quiz_table.load_table(
+            "data/models/best_model.joblib", "data/models/preprocessor.joblib"
+        )
+    except (FileNotFoundError, OSError, ValueError):
+        # If a file is missing, we return None so app doesn't crash
+        return None
+
+
+# "Students like you": past students with the closest encoded profiles
+def _load_student_index():
+    from src import inference, similarity
     try:
-        # Make sure this path is correct on your computer
-        return joblib.load("data/models/best_model.joblib")
-    except (FileNotFoundError, OSError):
-        # If file is missing, we return None so app doesn't crash
+        return similarity.load_index(), inference.load_preprocessor("data/models/preprocessor.joblib")
+    except (FileNotFoundError, OSError, ValueError):
         return None
 
 
+@st.cache_resource
+def warm_load():
+    executor = ThreadPoolExecutor(max_workers=1)
+    return {
+        "quiz_table": executor.submit(_load_quiz_table),
+        "students": executor.submit(_load_student_index),
+    }
+
+
+def load_quiz_table():
+    return warm_load()["quiz_table"].result()
+
+
+def load_student_index():
+    return warm_load()["students"].result()
+
+
+# Static images are read from assets/ (python -m src.assets) once per process;
+# the remote URL is only used when the file was never fetched
+@st.cache_resource
+def load_image(name):
+    from src import assets
+    path = assets.asset(name)
+    if not os.path.exists(path):
+        return path
+    with open(path, "rb") as f:
+        return f.read()
+
+
 
 
 
@@ -146,7 +194,7 @@ def show_home():
     st.write(get_text("home_sub"))
     
     # Placeholder image
-    st.image("https://cdn.pixabay.com/photo/2018/03/10/12/00/teamwork-3213924_1280.jpg", caption="AI Career Guidance")
+    st.image(load_image("home_banner.jpg"), caption="AI Career Guidance")
     
     # Info box only shows in English generally unless translated
     if st.session_state["lang"] == "hi":
@@ -156,20 +204,21 @@ def show_home():
     else:
         st.info("Navigate to the 'Career Quiz' section to start your assessment.")
 
+@traced("app.show_quiz")
 def show_quiz():
+    from src import inference
+
     st.header(get_text("quiz_title"))
     st.write(get_text("quiz_intro"))
     st.write("---")
 
     # --- Q1: Environment ---
-    q1_opts = [
-        get_text("opt_tech"), 
-        get_text("opt_corp"), 
-        get_text("opt_res"), 
-        get_text("opt_pub"), 
-        get_text("opt_art")
-    ]
-    q1 = st.radio(get_text("q_env"), options=q1_opts)
+    # Options are stored as language-independent keys, only the label is translated
+    q1 = st.radio(
+        get_text("q_env"),
+        options=inference.ENV_OPTIONS,
+        format_func=get_text
+    )
 
     st.write("") 
 
@@ -184,13 +233,7 @@ def show_quiz():
     # --- Q3: Activities ---
     q3 = st.selectbox(
         get_text("q_act"),
-        options=[
-            "Coding / Gaming",
-            "Leading Team / Managing",
-            "Solving Math Puzzles",
-            "Debating / History",
-            "Singing / Painting / Sports"
-        ]
+        options=inference.ACTIVITY_OPTIONS
     )
 
     st.write("")
@@ -201,66 +244,46 @@ def show_quiz():
     st.write("")
 
     # --- Q5: Language (Extra Feature) ---
-    q_lang_pref = st.selectbox(get_text("q_lang"), ["English", "French", "Hindi"])
+    q_lang_pref = st.selectbox(get_text("q_lang"), list(inference.QUIZ_LANGUAGES))
 
     st.write("---")
 
     # --- PREDICTION LOGIC ---
     if st.button(get_text("btn_predict"), type="primary"):
         
-        # 1. Fake Loading Animation
-        with st.spinner('AI Model Analyzing Patterns...'):
-            time.sleep(1.5) # Simulating AI processing
-        
-        # 2. Calculate Score
-        score = 0
-        
-        # Environment Logic
-        if q1 == get_text("opt_tech"): score += 25
-        elif q1 == get_text("opt_corp"): score += 20
-        elif q1 == get_text("opt_res"): score += 15
-        elif q1 == get_text("opt_pub"): score += 10
-        elif q1 == get_text("opt_art"): score += 5
-        
-        # Problem Solving Logic (Slider 0-10)
-        # 8-10 = High score (Love it)
-        if q2 >= 8: score += 25
-        elif q2 >= 5: score += 20
-        elif q2 >= 3: score += 10
-        else: score += 5
-
-        # Activity Logic
-        if "Coding" in q3: score += 25
-        elif "Leading" in q3: score += 20
-        elif "Math" in q3: score += 15
-        elif "Debating" in q3: score += 10
-        elif "Singing" in q3: score += 5
-        
-        # Skills Logic
-        score += (q4_slider * 2.5)
-
-        # Cap score
-        if score > 100: score = 100
-        
-        # 3. Determine Result
-        final_career = ""
-        if score >= 70:
-            final_career = get_text("res_cs")
-            st.balloons()
-        elif score >= 60:
-            final_career = get_text("res_biz")
-        elif score >= 50:
-            final_career = get_text("res_math")
-        elif score >= 40:
-            final_career = get_text("res_pol")
+        with span("app.load"):
+            table = load_quiz_table()
+
+        if table is None:
+            st.error("Model not found. Run feature_engineering.py and train a model first.")
+            return
+
+        # 1. Look the answers up in the precomputed table (same result as scoring them)
+        with span("app.predict", rows=1):
+            result = table.lookup(q1, q2, q3, q4_slider, q_lang_pref)
+
+        # 2. Display Result
+        score = result["score"]
+        if score is not None:
+            if score >= 70:
+                st.balloons()
+            st.success(f"Analysis Complete! Match Score: {int(score)}%")
         else:
-            final_career = get_text("res_art")
+            st.success("Analysis Complete!")
+
+        st.markdown(f"## 🎯 Recommended Path: **{result['career']}**")
+        st.caption(f"Inference time: {result['latency_ms']:.2f} ms")
+
+        # 3. Past students with the most similar profiles and what they chose
+        students = load_student_index()
+        if students is not None:
+            from src import similarity
+
+            index, preprocessor = students
+            record = inference.quiz_to_record(q1, q2, q3, q4_slider, q_lang_pref)
+            st.write("Students like you went on to:")
+            st.dataframe(similarity.similar_students(index, preprocessor, record, k=5), hide_index=True)
 
-        # 4. Display Result
-        st.success(f"Analysis Complete! Match Score: {int(score)}%")
-        
-        st.markdown(f"## 🎯 Recommended Path: **{final_career}**")
-        
         if st.session_state["lang"] == "hi":
             st.info(f"जानकारी: **{q_lang_pref}** के लिए आपकी प्राथमिकता इस क्षेत्र में एक बड़ी संपत्ति है।")
         elif st.session_state["lang"] == "fr":
@@ -288,6 +311,9 @@ def main():
     if "lang" not in st.session_state:
         st.session_state["lang"] = "en"
 
+    # start loading the model while the first page renders
+    warm_load()
+
     # --- Sidebar ---
     st.sidebar.title("Dashboard")
     
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.feature_engineering import assign_career, assign_careers, load_career_rules
+
+
+# Target generation: df.apply(assign_career) vs the vectorized rule table
+INTERESTS = ["Computer science", "Mathematics", "Biology", "History", " history ", "BIOLOGY", "Art"]
+
+
+def make_frame(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "gpa": np.round(rng.uniform(4.0, 8.0, n_rows), 2),
+        "interestarea": rng.choice(INTERESTS, n_rows),
+    })
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,100000,10000000",
+                        help="comma-separated row counts")
+    args = parser.parse_args()
+
+    rules = load_career_rules()
+
+    print(f"{'rows':>12} {'apply (s)':>12} {'vectorized (s)':>15} {'speedup':>10}  identical")
+    for n_rows in [int(n) for n in args.sizes.split(",")]:
+        df = make_frame(n_rows)
+
+        expected, t_apply = timed(lambda: df.apply(assign_career, axis=1))
+        result, t_vec = timed(lambda: assign_careers(df, rules))
+
+        same = expected.equals(result)
+        print(f"{n_rows:>12} {t_apply:>12.3f} {t_vec:>15.4f} {t_apply / t_vec:>9.0f}x  {same}")
+        if not same:
+            print("FAIL: vectorized output differs from assign_career")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
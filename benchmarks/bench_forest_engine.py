@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import warnings
+
+import joblib
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.forest_engine import FlatForest, MODEL_FILE
+
+
+# sklearn RandomForestClassifier vs the compiled flat-array engine:
+# load time, single-row latency and a large batch, with identical outputs
+def percentiles(fn, rows, repeat):
+    timings = []
+    for i in range(repeat):
+        row = rows[i % len(rows)][None, :]
+        start = time.perf_counter()
+        fn(row)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, [50, 99])
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=MODEL_FILE)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=1000, help="single-row predictions")
+    args = parser.parse_args()
+
+    # sklearn warns about feature names when given plain arrays
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # the first load also imports sklearn; time the second, unpickling only
+        joblib.load(args.model)
+        model, t_joblib = timed(lambda: joblib.load(args.model))
+        FlatForest.from_sklearn(model).save(tmp)
+        engine, t_mmap = timed(lambda: FlatForest.load(tmp))
+
+        rng = np.random.default_rng(42)
+        X = rng.normal(0, 2, (args.rows, model.n_features_in_)).astype(np.float32)
+        # multi-hot columns are 0/1
+        X[:, X.shape[1] // 3:] = (X[:, X.shape[1] // 3:] > 1).astype(np.float32)
+
+        sk_p50, sk_p99 = percentiles(model.predict_proba, X, args.repeat)
+        fe_p50, fe_p99 = percentiles(engine.predict_proba, X, args.repeat)
+
+        expected, t_sk = timed(lambda: model.predict_proba(X))
+        result, t_fe = timed(lambda: engine.predict_proba(X))
+
+        print(f"trees: {len(engine.roots)}, nodes: {len(engine.feature)}, depth: {engine.max_depth}")
+        print(f"{'':<22} {'sklearn':>10} {'engine':>10}")
+        print(f"{'load (ms)':<22} {t_joblib * 1000:>10.2f} {t_mmap * 1000:>10.2f}")
+        print(f"{'1 row p50 (ms)':<22} {sk_p50:>10.3f} {fe_p50:>10.3f}")
+        print(f"{'1 row p99 (ms)':<22} {sk_p99:>10.3f} {fe_p99:>10.3f}")
+        print(f"{f'{args.rows} rows (s)':<22} {t_sk:>10.3f} {t_fe:>10.3f}")
+
+        same = np.array_equal(expected, result)
+        print(f"identical predict_proba: {same}")
+        if not same:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.label_noise import inject_label_noise, uniform_noise_matrix
+
+
+# 12% label noise: the old per-row df.loc loop vs inject_label_noise
+N_CLASSES = 12
+RATE = 0.12
+
+
+def loop_noise(df, col):
+    np.random.seed(42)
+    n_noise = int(RATE * len(df))
+    noise_indices = np.random.choice(df.index, n_noise, replace=False)
+    unique_labels = df[col].unique()
+    for idx in noise_indices:
+        current_val = df.loc[idx, col]
+        possible_choices = [x for x in unique_labels if x != current_val]
+        df.loc[idx, col] = np.random.choice(possible_choices)
+    return df[col]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+# uniform: exactly int(rate * n) flips; matrix: flip rate within 4 standard errors
+def check(clean, uniform, matrix):
+    n = len(clean)
+    n_uniform = (np.asarray(uniform) != np.asarray(clean)).sum()
+    matrix_rate = (np.asarray(matrix) != np.asarray(clean)).mean()
+    return n_uniform == int(RATE * n) and abs(matrix_rate - RATE) < 4 * np.sqrt(RATE * (1 - RATE) / n)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,100000,10000000",
+                        help="comma-separated row counts")
+    parser.add_argument("--loop-max", type=int, default=100000,
+                        help="skip the Python loop above this many rows")
+    args = parser.parse_args()
+
+    T = uniform_noise_matrix(N_CLASSES, RATE)
+
+    print(f"{'rows':>12} {'loop (s)':>10} {'uniform (s)':>12} {'matrix (s)':>11} {'speedup':>9}  rate ok")
+    for n_rows in [int(n) for n in args.sizes.split(",")]:
+        y = pd.Series(np.random.default_rng(0).integers(0, N_CLASSES, n_rows), name="career_role")
+
+        t_loop = float("nan")
+        if n_rows <= args.loop_max:
+            _, t_loop = timed(lambda: loop_noise(y.to_frame(), "career_role"))
+
+        uniform, t_uni = timed(lambda: inject_label_noise(y, RATE, np.random.default_rng(42)))
+        matrix, t_mat = timed(lambda: inject_label_noise(y, RATE, np.random.default_rng(42), noise_matrix=T))
+
+        ok = check(y, uniform, matrix)
+        speedup = f"{t_loop / t_uni:>8.0f}x" if t_loop == t_loop else f"{'-':>9}"
+        print(f"{n_rows:>12} {t_loop:>10.3f} {t_uni:>12.4f} {t_mat:>11.4f} {speedup}  {ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.data_io import read_frame, write_frame
+from src.preprocessing import ENCODED_FILE, load_encoded
+
+
+# Load time of the processed artifacts: CSV (old format) vs memory-mapped Feather
+LEAKAGE_COLS = ["gpa", "interestarea"]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    # Scale the real encoded dataset up to the requested size
+    base = read_frame(ENCODED_FILE)
+    reps = int(np.ceil(args.rows / len(base)))
+    df = pd.concat([base] * reps, ignore_index=True).iloc[:args.rows]
+    trainer_cols = [c for c in df.columns if c not in LEAKAGE_COLS]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "encoded.csv")
+        feather_path = os.path.join(tmp, "encoded.feather")
+        df.astype({c: np.float64 for c in df.columns[:-1]}).to_csv(csv_path, index=False)
+        write_frame(df, feather_path)
+
+        results = [
+            ("csv, all columns (pd.read_csv)", lambda: pd.read_csv(csv_path)),
+            ("feather, all columns (mmap)", lambda: read_frame(feather_path)),
+            ("feather, trainer columns (mmap)", lambda: read_frame(feather_path, columns=trainer_cols)),
+            ("load_encoded, trainer columns", lambda: load_encoded(feather_path, exclude=LEAKAGE_COLS)),
+        ]
+
+        print(f"rows: {args.rows}")
+        print(f"csv size:     {os.path.getsize(csv_path) / 1e6:.1f} MB")
+        print(f"feather size: {os.path.getsize(feather_path) / 1e6:.1f} MB")
+        baseline = None
+        for name, fn in results:
+            t = timed(fn)
+            baseline = baseline or t
+            print(f"{name:<36} {t:>8.3f}s  {baseline / t:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
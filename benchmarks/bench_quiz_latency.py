@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import random
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src import inference
+from src.quiz_table import load_table
+
+
+# Click-to-result latency of the quiz: answers -> feature vector -> cached model
+N_CLICKS = 2000
+LIMIT_MS = 50.0
+
+model = inference.load_model()
+preprocessor = inference.load_preprocessor()
+table = load_table()
+
+random.seed(42)
+answers = [
+    (
+        random.choice(inference.ENV_OPTIONS),
+        random.randint(0, 10),
+        random.choice(inference.ACTIVITY_OPTIONS),
+        random.randint(0, 10),
+        random.choice(list(inference.QUIZ_LANGUAGES)),
+    )
+    for _ in range(N_CLICKS)
+]
+
+# Warm-up (first call pays for lazy imports inside sklearn)
+inference.recommend(model, preprocessor, inference.quiz_to_record(*answers[0]))
+
+latencies = []
+for a in answers:
+    start = time.perf_counter()
+    record = inference.quiz_to_record(*a)
+    inference.recommend(model, preprocessor, record)
+    latencies.append((time.perf_counter() - start) * 1000)
+
+# Same clicks answered from the precomputed answer grid (what the app does)
+table_latencies = []
+for a in answers:
+    start = time.perf_counter()
+    table.lookup(*a)
+    table_latencies.append((time.perf_counter() - start) * 1000)
+
+p50, p99 = np.percentile(latencies, [50, 99])
+t50, t99 = np.percentile(table_latencies, [50, 99])
+print(f"clicks: {N_CLICKS}")
+print(f"model  p50: {p50:.3f} ms   p99: {p99:.3f} ms")
+print(f"table  p50: {t50:.4f} ms  p99: {t99:.4f} ms")
+
+if p99 >= LIMIT_MS:
+    print(f"FAIL: p99 above {LIMIT_MS} ms")
+    sys.exit(1)
+print("OK")
@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+import numpy as np
+from tornado.httpserver import HTTPServer
+from tornado.testing import bind_unused_port
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src import inference
+from src.serve import make_app
+
+
+# Scoring service throughput, server and client in one process / event loop
+# (the client takes CPU from the server, so real numbers are higher).
+# Each client connection is kept alive and reused, like a load balancer or
+# a pooled client would: tornado's AsyncHTTPClient opens a connection per
+# request and the bench measured its own connect / close instead of the
+# service.
+def random_quiz(rng):
+    return {
+        "env_key": str(rng.choice(inference.ENV_OPTIONS)),
+        "problem_solving": int(rng.integers(0, 11)),
+        "activity": str(rng.choice(inference.ACTIVITY_OPTIONS)),
+        "communication": int(rng.integers(0, 11)),
+        "language": str(rng.choice(list(inference.QUIZ_LANGUAGES))),
+    }
+
+
+# One HTTP/1.1 request on an open keep-alive connection -> (status, body)
+async def post(reader, writer, path, body):
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    headers = dict(line.split(":", 1) for line in head[1:] if ":" in line)
+    length = int({k.lower(): v for k, v in headers.items()}.get("content-length", 0))
+    return int(head[0].split()[1]), await reader.readexactly(length)
+
+
+async def run(model, preprocessor, window_ms, n_requests, concurrency):
+    app = make_app(model, preprocessor, window_ms=window_ms)
+    sock, port = bind_unused_port()
+    server = HTTPServer(app)
+    server.add_sockets([sock])
+
+    rng = np.random.default_rng(42)
+    quizzes = [random_quiz(rng) for _ in range(n_requests)]
+    latencies, responses = [], []
+    queue = iter(quizzes)
+
+    async def worker():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for quiz in queue:
+            start = time.perf_counter()
+            status, body = await post(reader, writer, "/recommend", json.dumps({"quiz": quiz}).encode())
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                raise RuntimeError(f"HTTP {status}: {body[:200]!r}")
+            responses.append((quiz, json.loads(body)))
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    metrics = app.batcher.metrics.snapshot()
+    server.stop()
+    app.batcher.close()
+
+    # batched answers must match the single-record path
+    for quiz, body in responses[:200]:
+        expected = inference.recommend(model, preprocessor, inference.quiz_to_record(**quiz))
+        if body["career"] != expected["career"] or abs(body["score"] - expected["score"]) > 1e-6:
+            print(f"FAIL: {quiz} -> {body['career']}, expected {expected['career']}")
+            sys.exit(1)
+
+    return n_requests / elapsed, np.percentile(latencies, [50, 99]), metrics
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--windows", default="0,2", help="comma-separated batch windows in ms")
+    args = parser.parse_args()
+
+    model = inference.load_model()
+    preprocessor = inference.load_preprocessor()
+
+    print(f"{'window (ms)':>11} {'req/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'mean batch':>11}")
+    for window_ms in [float(w) for w in args.windows.split(",")]:
+        rps, (p50, p99), metrics = asyncio.run(
+            run(model, preprocessor, window_ms, args.requests, args.concurrency)
+        )
+        print(f"{window_ms:>11.1f} {rps:>8.0f} {p50:>9.2f} {p99:>9.2f} {metrics['mean_batch_size']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocessing import load_encoded, MULTI_VALUED_COLS
+from src.similarity import StudentIndex, TARGET_COL
+
+
+# Exact (blocked matmul) vs LSH "students like you" queries on synthetic
+# students drawn from the encoded data's marginals. recall@k is tie-aware:
+# an LSH neighbour counts if it is as similar as the k-th exact one. "auto"
+# is the backend query() picks at that size (similarity.LSH_MIN_ROWS).
+#
+# Rows are generated per slice on demand, so 10M students are never held twice.
+class SyntheticStudents:
+
+    def __init__(self, columns, binary, n, seed):
+        self.columns = columns
+        self.binary = binary
+        self.n = n
+        self.seed = seed
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, rows):
+        start, stop, _ = rows.indices(self.n)
+        rng = np.random.default_rng([self.seed, start])
+        out = np.empty((stop - start, len(self.columns)), dtype=np.float32)
+        for j, values in enumerate(self.columns):
+            if self.binary[j]:
+                out[:, j] = rng.random(stop - start) < values.mean()
+            else:
+                out[:, j] = rng.choice(values, stop - start) + rng.normal(0, 0.05, stop - start)
+        return out
+
+
+def recall_at_k(exact_sims, lsh_sims):
+    kth = exact_sims[:, -1:]
+    return float(np.mean((lsh_sims >= kth - 1e-5).sum(axis=1) / exact_sims.shape[1]))
+
+
+def timed_queries(index, Q, k, metric, backend):
+    latencies, ids, sims = [], [], []
+    for q in Q:
+        start = time.perf_counter()
+        i, s = index.query(q, k=k, metric=metric, backend=backend)
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids.append(i[0])
+        sims.append(s[0])
+    return np.percentile(latencies, 50), np.array(ids), np.array(sims)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,1000000,10000000")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    df = load_encoded()
+    X = df.drop(columns=[TARGET_COL])
+    X = X.sparse.to_dense() if hasattr(X, "sparse") else X
+    names = [str(c) for c in X.columns]
+    binary = [c.split("_")[0] in MULTI_VALUED_COLS for c in names]
+    columns = [X[c].to_numpy(dtype=np.float32) for c in X.columns]
+    binary_names = [c for c, b in zip(names, binary) if b]
+
+    queries = SyntheticStudents(columns, binary, args.queries, seed=1)[0:args.queries]
+
+    print(f"{'rows':>10} {'build (s)':>9} {'metric':>8} {'exact p50 (ms)':>15} {'lsh p50 (ms)':>13} "
+          f"{'recall@' + str(args.k):>10} {'auto':>6}")
+    for n in [int(s) for s in args.sizes.split(",")]:
+        students = SyntheticStudents(columns, binary, n, seed=0)
+
+        start = time.perf_counter()
+        index = StudentIndex.build(students, names, binary_names, np.zeros(n, dtype=np.int8))
+        build_s = time.perf_counter() - start
+
+        if n <= 10000:
+            # the blocked scan must agree with one full similarity matrix
+            _, exact_sims = index.query(queries, k=args.k)
+            full = np.sort(index._similarity(queries / np.linalg.norm(queries, axis=1, keepdims=True),
+                                             slice(0, n), "cosine"), axis=1)[:, ::-1][:, :args.k]
+            if not np.allclose(exact_sims, full, atol=1e-5):
+                print("FAIL: blocked exact scan differs from brute force")
+                sys.exit(1)
+
+        for metric in ["cosine", "jaccard"]:
+            exact_ms, _, exact_sims = timed_queries(index, queries, args.k, metric, "exact")
+            lsh_ms, _, lsh_sims = timed_queries(index, queries, args.k, metric, "lsh")
+            print(f"{n:>10} {build_s:>9.1f} {metric:>8} {exact_ms:>15.2f} {lsh_ms:>13.2f} "
+                  f"{recall_at_k(exact_sims, lsh_sims):>10.3f} {index.auto_backend(metric):>6}")
+
+        del index
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import os
+import re
+import ast
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+APP_FILE = os.path.join(PROJECT_ROOT, "app_streamlit.py")
+BASELINE_FILE = os.path.join(BASE_DIR, "baselines", "startup.json")
+
+TRAINERS = ["train_decision_tree", "train_logistic_regression", "train_random_forest",
+            "train_svm", "train_xgboost", "train_all"]
+
+# extra runs of a target over its limit before it counts as a regression
+CONFIRM_RUNS = 4
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+# Start-up cost from `python -X importtime`, each target in a fresh interpreter:
+#
+#   app_first_render - the app's module-level imports plus the home page
+#   app_quiz_page    - what the quiz page imports once the model is warm
+#   app_model_ready  - the background warm-load (quiz table) finishing
+#   <trainer>        - importing a training script
+#
+# "ms" is the wall time of the whole interpreter run (what a user waits for),
+# "imports" the part -X importtime attributes to imports, broken down by
+# top-level package. The median of --repeat runs counts, and the baseline is
+# recorded the same way: a best-of baseline sits at the bottom of the noise,
+# so even one ordinary run could exceed it. With a baseline, a target slower
+# than baseline * (1 + tolerance) (and by more than --min-ms) is measured
+# CONFIRM_RUNS more times and is a regression if the median stays over.
+# The app targets import streamlit and are skipped where it isn't installed.
+def app_imports():
+    tree = ast.parse(open(APP_FILE, encoding="utf-8").read())
+    lines = [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return lines + ["import src.assets"]
+
+
+def targets():
+    out = {
+        "app_first_render": "; ".join(app_imports()),
+        "app_quiz_page": "import src.inference, src.quiz_table",
+        "app_model_ready": "from src import quiz_table; quiz_table.load_table()",
+    }
+    for name in TRAINERS:
+        out[name] = f"import src.models.{name}"
+    return out
+
+
+# -> (wall ms, import ms, [(package, ms)] heaviest first)
+def import_time(code):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total, packages = 0.0, {}
+    for match in LINE.finditer(result.stderr):
+        self_us, cumulative, indent, module = match.groups()
+        if len(indent) == 1:
+            total += int(cumulative) / 1000
+        package = module.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1000
+    return wall_ms, total, sorted(packages.items(), key=lambda t: -t[1])
+
+
+def median(runs):
+    return sorted(runs, key=lambda r: r[0])[(len(runs) - 1) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    results, regressions = {}, []
+    print(f"{'target':>26} {'ms':>8} {'baseline':>9} {'imports':>8}  heaviest imports (ms)")
+    for name, code in targets().items():
+        try:
+            runs = [import_time(code) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{name:>26} {'skipped':>8}  ({e})")
+            continue
+
+        ms, imports_ms, heaviest = median(runs)
+
+        flag = ""
+        if name in baseline:
+            limit = max(baseline[name] * (1 + args.tolerance), baseline[name] + args.min_ms)
+            if ms > limit:
+                # one slow interpreter start is common on a busy machine:
+                # measure again, flag only if the median of all runs is slow
+                runs += [import_time(code) for _ in range(CONFIRM_RUNS)]
+                ms, imports_ms, heaviest = median(runs)
+            if ms > limit:
+                flag = "  REGRESSION"
+                regressions.append(name)
+        results[name] = round(ms, 1)
+        top = ", ".join(f"{m} {t:.0f}" for m, t in heaviest[:3])
+        print(f"{name:>26} {ms:>8.0f} {baseline.get(name, float('nan')):>9.0f} {imports_ms:>8.0f}  {top}{flag}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"saved baseline to {args.baseline}")
+
+    if regressions:
+        print(f"FAIL: start-up regressions in {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
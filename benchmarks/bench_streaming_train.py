@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.data_io import read_frame, FrameWriter
+from src.preprocessing import ENCODED_FILE
+
+
+# Streaming (partial_fit) training of the linear model on encoded files of
+# growing size. Each run is a separate process; peak memory should stay flat
+# while the file grows, because only one chunk is loaded at a time.
+#
+# Files are the real encoded rows repeated with a little noise on the dense
+# columns, written chunk by chunk.
+def make_file(path, n_rows, chunk_rows=100000, seed=0):
+    base = read_frame(ENCODED_FILE)
+    dense = [c for c in base.columns if base[c].dtype == np.float64]
+    rng = np.random.default_rng(seed)
+
+    with FrameWriter(path) as writer:
+        for start in range(0, n_rows, chunk_rows):
+            chunk = base.iloc[rng.integers(0, len(base), min(chunk_rows, n_rows - start))].reset_index(drop=True)
+            for col in dense:
+                chunk[col] = chunk[col] + rng.normal(0, 0.05, len(chunk))
+            writer.write(chunk)
+
+
+CHILD = """
+import json, resource, time
+from src.models.train_logistic_regression import train_streaming
+start = time.perf_counter()
+train_streaming({path!r}, {model!r}, epochs={epochs}, chunk_rows={chunk_rows})
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100000,1000000,5000000")
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--chunk-rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'file (MB)':>10} {'train (s)':>10} {'peak RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in [int(s) for s in args.sizes.split(",")]:
+            path = os.path.join(tmp, f"encoded_{n}.feather")
+            make_file(path, n)
+
+            code = CHILD.format(path=path, model=os.path.join(tmp, "lr.joblib"),
+                                epochs=args.epochs, chunk_rows=args.chunk_rows)
+            result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                                    capture_output=True, text=True, check=True)
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+
+            print(f"{n:>10} {os.path.getsize(path) / 2**20:>10.0f} {stats['seconds']:>10.1f} {stats['peak_mb']:>14.0f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
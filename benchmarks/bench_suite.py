@@ -0,0 +1,238 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import textwrap
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src import synthetic
+
+BASELINE_FILE = os.path.join(BASE_DIR, "baselines", "suite.json")
+
+TRAINERS = ["train_decision_tree", "train_logistic_regression", "train_random_forest",
+            "train_svm", "train_xgboost"]
+
+
+# End-to-end benchmark: for every row count in --sizes a synthetic raw CSV
+# is generated (src/synthetic.py) and run through
+#
+#   clean          data_cleaning.clean_file
+#   encode         feature_engineering.encode_file
+#   train_*        each trainer on the encoded file
+#   predict_single inference.recommend, one record at a time (SINGLE_CALLS)
+#   predict_batch  inference.recommend_batch on up to BATCH_ROWS records
+#
+# Each stage runs in a fresh interpreter, so memory and warm caches don't
+# leak between stages; its wall time (imports excluded) and peak RSS are
+# reported. Every stage runs --repeats times and the median time counts:
+# a trainer at 1k rows takes about a second, most of it process and
+# plot-pool start-up, and single runs vary by more than the tolerance.
+# Results are keyed "<stage>@<rows>" and compared with the JSON baseline:
+# slower than baseline * (1 + tolerance), and by more than --min-seconds,
+# is run CONFIRM_RUNS more times and is a regression if the median of all
+# its runs stays over.
+#
+# A stage that raises is a failure. Only a stage that can't run here is
+# skipped: an optional dependency is not installed (xgboost), or the
+# model the predict stages load was not trained in this run. Regressions
+# and failures both make the run exit with status 1.
+SINGLE_CALLS = 200
+BATCH_ROWS = 10000
+PREDICT_MODEL = "train_random_forest"
+# extra runs of a stage over its limit before it counts as a regression
+CONFIRM_RUNS = 2
+
+
+#  Stages
+# -> (setup, timed) code for the child; p holds the file paths of one size
+def stage_code(stage, p):
+    if stage == "clean":
+        return ("from src.data_cleaning import clean_file",
+                f"clean_file({p['raw']!r}, {p['cleaned']!r})")
+    if stage == "encode":
+        # the preprocessor imports sklearn only when it is fitted; import it
+        # here so that is not timed, like the trainers' top-level imports
+        return ("from src.feature_engineering import encode_file\nimport sklearn.preprocessing",
+                f"encode_file({p['cleaned']!r}, {p['encoded']!r}, {p['label_map']!r}, {p['preprocessor']!r})")
+    if stage in TRAINERS:
+        model = os.path.join(p["models"], f"{stage}.joblib")
+        plot = os.path.join(p["models"], f"{stage}.png")
+        return (f"from src.models.{stage} import train",
+                f"train({p['encoded']!r}, {model!r}, {plot!r}, {p['report']!r})")
+
+    model = os.path.join(p["models"], f"{PREDICT_MODEL}.joblib")
+    setup = ("from src.inference import load_model, load_preprocessor, recommend, recommend_batch\n"
+             "from src.data_io import read_frame\n"
+             f"model = load_model({model!r})\n"
+             f"preprocessor = load_preprocessor({p['preprocessor']!r})\n"
+             f"records = read_frame({p['cleaned']!r}).to_dict('records')\n")
+    if stage == "predict_single":
+        return (setup + f"records = records[:{SINGLE_CALLS}]\nrecommend(model, preprocessor, records[0])",
+                "latencies = [recommend(model, preprocessor, r)['latency_ms'] for r in records]\n"
+                "info = {'p50_ms': float(np.percentile(latencies, 50)), 'p99_ms': float(np.percentile(latencies, 99))}")
+    if stage == "predict_batch":
+        return (setup + f"records = records[:{BATCH_ROWS}]",
+                "recommend_batch(model, preprocessor, records)\n"
+                "info = {'rows': len(records)}")
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+STAGES = ["clean", "encode"] + TRAINERS + ["predict_single", "predict_batch"]
+
+# peak RSS from VmHWM: ru_maxrss survives exec, so it would report this
+# (larger) benchmark process the child was forked from
+CHILD = """
+import json, resource, sys, time
+import numpy as np
+sys.path.insert(0, {root!r})
+try:
+{setup}
+except ImportError as e:
+    print(json.dumps({{"unavailable": str(e)}}))
+    sys.exit(0)
+info = {{}}
+start = time.perf_counter()
+{timed}
+seconds = time.perf_counter() - start
+try:
+    peak_kb = next(int(line.split()[1]) for line in open("/proc/self/status") if line.startswith("VmHWM"))
+except OSError:
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": seconds, "peak_mb": peak_kb / 1024, **info}}))
+"""
+
+
+class StageUnavailable(Exception):
+    pass
+
+
+# -> {"seconds", "peak_mb", ...stage-specific numbers}
+def run_stage(stage, paths):
+    if stage.startswith("predict"):
+        model = os.path.join(paths["models"], f"{PREDICT_MODEL}.joblib")
+        if not os.path.exists(model):
+            raise StageUnavailable(f"{PREDICT_MODEL} was not trained")
+
+    setup, timed = stage_code(stage, paths)
+    code = CHILD.format(root=PROJECT_ROOT, setup=textwrap.indent(setup, "    "), timed=timed)
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                            env={**os.environ, "MPLBACKEND": "Agg"})
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines() or [f"exit status {result.returncode}"]
+        raise RuntimeError(lines[-1])
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    if "unavailable" in stats:
+        raise StageUnavailable(stats["unavailable"])
+    return stats
+
+
+# -> stats of the median run (by time), peak RSS the largest of all runs
+def summarize(runs):
+    runs = sorted(runs, key=lambda r: r["seconds"])
+    stats = dict(runs[(len(runs) - 1) // 2])
+    stats["peak_mb"] = max(r["peak_mb"] for r in runs)
+    if len(runs) > 1:
+        stats["spread_s"] = runs[-1]["seconds"] - runs[0]["seconds"]
+    return stats
+
+
+def is_slow(seconds, baseline_seconds, args):
+    if baseline_seconds is None or args.save_baseline:
+        return False
+    return seconds > max(baseline_seconds * (1 + args.tolerance), baseline_seconds + args.min_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per stage, the median time counts")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-seconds", type=float, default=0.25,
+                        help="never flag a slowdown smaller than this (start-up noise)")
+    parser.add_argument("--output", default=None, help="also write this run's results as JSON")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    stages = [s for s in STAGES if s in args.stages.split(",")]
+    generator = synthetic.fit()
+    results, regressions, failures = {}, [], []
+    print(f"{'stage':>28} {'rows':>9} {'seconds':>9} {'baseline':>9} {'peak RSS (MB)':>14}  notes")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in [int(s) for s in args.sizes.split(",")]:
+            paths = {
+                "raw": os.path.join(tmp, f"raw_{n}.csv"),
+                "cleaned": os.path.join(tmp, f"cleaned_{n}.feather"),
+                "encoded": os.path.join(tmp, f"encoded_{n}.feather"),
+                "label_map": os.path.join(tmp, f"label_map_{n}.json"),
+                "preprocessor": os.path.join(tmp, f"preprocessor_{n}.joblib"),
+                "report": os.path.join(tmp, f"evaluation_{n}.json"),
+                "models": os.path.join(tmp, f"models_{n}"),
+            }
+            os.makedirs(paths["models"])
+            synthetic.generate(paths["raw"], n, model=generator)
+
+            for stage in stages:
+                key = f"{stage}@{n}"
+                try:
+                    runs = [run_stage(stage, paths) for _ in range(args.repeats)]
+                    stats = summarize(runs)
+                    if is_slow(stats["seconds"], baseline.get(key), args):
+                        # confirm before flagging: re-run, judge the median of all runs
+                        runs += [run_stage(stage, paths) for _ in range(CONFIRM_RUNS)]
+                        stats = summarize(runs)
+                except StageUnavailable as e:
+                    print(f"{stage:>28} {n:>9} {'skipped':>9}  ({e})")
+                    continue
+                except RuntimeError as e:
+                    print(f"{stage:>28} {n:>9} {'FAILED':>9}  ({e})")
+                    failures.append(key)
+                    continue
+
+                seconds = stats.pop("seconds")
+                peak_mb = stats.pop("peak_mb")
+                results[key] = round(seconds, 4)
+
+                flag = ""
+                if is_slow(seconds, baseline.get(key), args):
+                    flag = "  REGRESSION"
+                    regressions.append(key)
+                notes = ", ".join(f"{k} {v:.3g}" for k, v in stats.items())
+                print(f"{stage:>28} {n:>9} {seconds:>9.3f} {baseline.get(key, float('nan')):>9.3f} "
+                      f"{peak_mb:>14.0f}  {notes}{flag}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline and failures:
+        print("baseline not saved: some stages failed")
+    elif args.save_baseline:
+        # merged, so a run over a subset of stages / sizes keeps the others
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+        print(f"saved baseline to {args.baseline}")
+
+    if failures:
+        print(f"FAIL: stages failed: {', '.join(failures)}")
+    if regressions:
+        print(f"FAIL: regressions in {', '.join(regressions)}")
+    if failures or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.model_selection import train_test_split
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocessing import load_encoded
+from src.models.train_svm import build_model, DEFAULT_RANK
+
+
+# Exact RBF SVC vs the approximate backends of train_svm.py at growing
+# training sizes. Training rows are resampled from the real training split
+# with a little noise on the dense columns; every model is scored on the
+# real test split (same split as train_svm.py).
+def grow(X, y, n, rng, dense_cols):
+    idx = rng.integers(0, X.shape[0], n)
+    X_n = X[idx].toarray()
+    X_n[:, dense_cols] += rng.normal(0, 0.05, (n, len(dense_cols)))
+    return sp.csr_matrix(X_n), y[idx]
+
+
+def measure(model, X_train, y_train, X_test, y_test):
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - start
+
+    accuracy = float(np.mean(model.predict(X_test) == y_test))
+
+    # single-row predictions, like one click in the app
+    timings = []
+    for i in range(X_test.shape[0]):
+        start = time.perf_counter()
+        model.predict(X_test[i])
+        timings.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "svm.joblib")
+        joblib.dump(model, path)
+        size_kb = os.path.getsize(path) / 1024
+
+    return fit_s, np.percentile(timings, 50) * 1000, size_kb, accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,5000,20000,100000")
+    parser.add_argument("--rank", type=int, default=DEFAULT_RANK)
+    parser.add_argument("--exact-max", type=int, default=20000,
+                        help="largest size the exact SVC is run on (its fit is quadratic or worse)")
+    args = parser.parse_args()
+
+    df = load_encoded(exclude=["gpa", "interestarea"])
+    X = df.drop(columns=["career_role"])
+    y = df["career_role"].to_numpy()
+    X = X.sparse.to_coo().tocsr()
+    # jitter only the non-binary columns
+    dense_cols = [j for j in range(X.shape[1]) if not np.isin(X[:, j].data, [0, 1]).all()]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    rng = np.random.default_rng(42)
+    print(f"{'rows':>8} {'backend':>9} {'fit (s)':>9} {'p50 (ms)':>9} {'size (KB)':>10} {'accuracy':>9}")
+    for n in [int(s) for s in args.sizes.split(",")]:
+        X_n, y_n = grow(X_train, y_train, n, rng, dense_cols)
+        for backend in ["exact", "nystroem", "rff"]:
+            if backend == "exact" and n > args.exact_max:
+                print(f"{n:>8} {backend:>9} {'skipped':>9}")
+                continue
+            fit_s, p50_ms, size_kb, accuracy = measure(build_model(backend, args.rank), X_n, y_n, X_test, y_test)
+            print(f"{n:>8} {backend:>9} {fit_s:>9.2f} {p50_ms:>9.3f} {size_kb:>10.0f} {accuracy:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
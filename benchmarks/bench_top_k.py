@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import argparse
+
+import joblib
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocessing import CareerPreprocessor
+from src.ranking import top_k, rank_chunk, load_temperature, MODEL_FILE
+
+
+# Top-k for a whole cohort: argpartition vs a full sort, then raw students ->
+# calibrated top-k end to end (the real dataset repeated up to --rows)
+RAW_FILE = os.path.join(PROJECT_ROOT, "data", "raw", "career_data.csv")
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    model = joblib.load(MODEL_FILE)
+    preprocessor = CareerPreprocessor.load()
+    class_names = list(preprocessor.decode_target(model.classes_))
+    temperature = load_temperature(MODEL_FILE)
+
+    # ranking step alone (the model's classes, and a wide case where argpartition pays off)
+    for n_classes in [len(class_names), 200]:
+        proba = np.random.default_rng(42).dirichlet(np.ones(n_classes), args.rows)
+        (idx, _), t_top = timed(lambda: top_k(proba, args.k))
+        full, t_sort = timed(lambda: np.argsort(-proba, axis=1, kind="stable")[:, :args.k])
+        print(f"rank {args.rows} x {n_classes}: top_k {t_top:.3f}s, full argsort {t_sort:.3f}s, "
+              f"same: {np.array_equal(idx, full)}")
+
+    # end to end
+    raw = pd.read_csv(RAW_FILE)
+    reps = int(np.ceil(args.rows / len(raw)))
+    students = pd.concat([raw] * reps, ignore_index=True).iloc[:args.rows]
+
+    start = time.perf_counter()
+    for i in range(0, len(students), args.chunksize):
+        chunk = students.iloc[i:i + args.chunksize]
+        rank_chunk(chunk, model, preprocessor, class_names, args.k, temperature)
+    elapsed = time.perf_counter() - start
+    print(f"top-{args.k} for {args.rows} students: {elapsed:.2f}s ({args.rows / elapsed:,.0f} students/s)")
+
+
+if __name__ == "__main__":
+    main()
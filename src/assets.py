@@ -0,0 +1,54 @@
+import os
+import argparse
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+ASSETS_DIR = os.path.join(PROJECT_ROOT, "assets")
+
+# Static files the app shows: local name -> where it was downloaded from
+ASSETS = {
+    "home_banner.jpg": "https://cdn.pixabay.com/photo/2018/03/10/12/00/teamwork-3213924_1280.jpg",
+}
+
+
+# Local copy of an asset, or its URL if it has not been fetched yet
+def asset(name, assets_dir=ASSETS_DIR):
+    path = os.path.join(assets_dir, name)
+    return path if os.path.exists(path) else ASSETS[name]
+
+
+def fetch_assets(assets_dir=ASSETS_DIR, force=False, timeout=30):
+    # not imported at module level: the app only needs asset()
+    import urllib.request
+
+    os.makedirs(assets_dir, exist_ok=True)
+    fetched = []
+    for name, url in ASSETS.items():
+        path = os.path.join(assets_dir, name)
+        if os.path.exists(path) and not force:
+            continue
+
+        # written next to the target and renamed, so a failed download leaves no partial file
+        tmp = path + ".part"
+        with urllib.request.urlopen(url, timeout=timeout) as response, open(tmp, "wb") as f:
+            f.write(response.read())
+        os.replace(tmp, path)
+        fetched.append(name)
+    return fetched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download the app's static assets into assets/.")
+    parser.add_argument("--output", default=ASSETS_DIR)
+    parser.add_argument("--force", action="store_true", help="download again even if present")
+    args = parser.parse_args()
+
+    fetched = fetch_assets(args.output, force=args.force)
+    print(f"Fetched {len(fetched)} of {len(ASSETS)} assets -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
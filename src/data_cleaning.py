@@ -1,6 +1,7 @@
-import pandas as pd
 import numpy as np
 import os
+import sys
+import argparse
 
 
 # current file directory
@@ -8,66 +9,189 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Project root folder (ai_learning)
 PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.quantile_sketch import KLLSketch
+from src.data_io import write_frame, FrameWriter
+from src.instrumentation import span
+from src.ingest import iter_raw, read_raw, print_stats, quarantine_file, CHUNK_BYTES
 
 # Paths
 RAW_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "career_data.csv")
-CLEANED_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "career_data_cleaned.csv")
-
-
+CLEANED_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "career_data_cleaned.feather")
 
-#  loading data 
-print("Loading dataset...")
 
-if not os.path.exists(RAW_DATA_PATH):
-    print(f"Error: File not found at {RAW_DATA_PATH}")
-    print("Please ensure 'career_data.csv' is in the same folder as this script.")
-    exit()
-else:
-    df = pd.read_csv(RAW_DATA_PATH)
-    print(f"Original Data Shape: {df.shape}") 
-
-#  Column name 
+#  Column name
 # Convert to lowercase and replace spaces with underscores
-df.columns = df.columns.str.lower().str.strip().str.replace(' ', '_')
+def normalize_columns(df):
+    df.columns = df.columns.str.lower().str.strip().str.replace(' ', '_')
+    return df
+
 
 #  adding missing 'Gender' Column
 # Simulating gender data since it is missing in the raw dataset
-if 'gender' not in df.columns:
-    np.random.seed(42)  # Ensures reproducibility
-    df['gender'] = np.random.choice(['Male', 'Female'], size=len(df))
-    print(" - 'gender' column created with random values.")
-
-#  Remove Duplicates
-df = df.drop_duplicates()
-
-# Drop rows with any null values for data integrity
-initial_rows = len(df)
-df = df.dropna()
-dropped_rows = initial_rows - len(df)
-if dropped_rows > 0:
-    print(f" - Removed {dropped_rows} rows containing missing values.")
-
-# remove Outliers 
-# filtering numeric columns to remove extreme values
-print(" - Checking for outliers...")
-numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
+def add_gender(df, seed=42):
+    if 'gender' not in df.columns:
+        rng = np.random.RandomState(seed)  # Ensures reproducibility
+        df['gender'] = rng.choice(['Male', 'Female'], size=len(df))
+    return df
 
-for col in numeric_cols:
-    Q1 = df[col].quantile(0.25)
-    Q3 = df[col].quantile(0.75)
-    IQR = Q3 - Q1
-    lower_bound = Q1 - 1.5 * IQR
-    upper_bound = Q3 + 1.5 * IQR
-    
-    # filter: Keep only data within valid bounds
-    df = df[(df[col] >= lower_bound) & (df[col] <= upper_bound)]
 
 #  Basic Text Cleanup
-if 'skills' in df.columns:
-    df['skills'] = df['skills'].str.strip()
+def clean_text(df):
+    if 'skills' in df.columns:
+        df['skills'] = df['skills'].str.strip()
+    return df
+
 
-#  saving the clean file 
-print(f"Final Data Shape: {df.shape}")
-df.to_csv(CLEANED_DATA_PATH, index=False)
-print(f"Success: Cleaned data saved to 'career_data_cleaned.csv'")
+# remove Outliers
+# filtering numeric columns to remove extreme values
+def numeric_columns(df):
+    return list(df.select_dtypes(include=['float64', 'float32', 'int64']).columns)
 
+
+# IQR bounds from the 25% / 75% quantiles of every column
+def iqr_bounds(Q1, Q3):
+    IQR = Q3 - Q1
+    return Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+
+
+# Keep only rows where every numeric column is within its bounds (one combined mask)
+def outlier_mask(df, cols, lower_bound, upper_bound):
+    values = df[cols].to_numpy(dtype=np.float64)
+    return ((values >= lower_bound) & (values <= upper_bound)).all(axis=1)
+
+
+# All bounds are computed on the same data in one pass, so the result
+# no longer depends on the column order.
+def remove_outliers(df):
+    cols = numeric_columns(df)
+    if not cols:
+        return df
+
+    quartiles = df[cols].quantile([0.25, 0.75]).to_numpy()
+    lower_bound, upper_bound = iqr_bounds(quartiles[0], quartiles[1])
+    return df[outlier_mask(df, cols, lower_bound, upper_bound)]
+
+
+# Row-level cleaning only (no dedup / NA / outlier filtering, no simulated
+# gender). Used when scoring new students, where every input row must get a
+# prediction that does not depend on which batch the row arrived in.
+def clean_chunk(df):
+    df = normalize_columns(df)
+    df = clean_text(df)
+    return df
+
+
+# Streaming mode for files larger than RAM: two passes over the file in chunks.
+# Pass 1 feeds approximate quantile sketches, pass 2 filters & writes.
+# Chunks come from ingest.iter_raw: validated, typed, and without the
+# duplicates of earlier chunks (bad rows are quarantined on the first pass).
+def clean_file_streaming(input_path, output_path, chunk_bytes=CHUNK_BYTES, jobs=None):
+    stats = {}
+
+    def prepared_chunks(quarantine=None):
+        chunks = iter_raw(input_path, jobs, chunk_bytes, quarantine, stats)
+        for i, chunk in enumerate(chunks):
+            chunk = normalize_columns(chunk)
+            chunk = add_gender(chunk, seed=42 + i)
+            yield clean_text(chunk)
+
+    # Pass 1: quantile sketches (+ the distinct values of every text column,
+    # so columnar output can use the same categories in every chunk)
+    print(" - Pass 1: estimating quantiles...")
+    sketches = {}
+    categories = {}
+    n_rows = 0
+    with span("clean.sketch") as s:
+        for chunk in prepared_chunks(quarantine_file(input_path)):
+            for col in numeric_columns(chunk):
+                sketches.setdefault(col, KLLSketch()).update(chunk[col].to_numpy())
+            for col in chunk.columns[chunk.dtypes == object]:
+                categories.setdefault(col, set()).update(chunk[col].unique())
+            n_rows += len(chunk)
+        s.rows = n_rows
+    categories = {col: sorted(values) for col, values in categories.items()}
+    print_stats(stats, quarantine_file(input_path))
+
+    cols = list(sketches)
+    Q1 = np.array([sketches[col].quantile(0.25) for col in cols])
+    Q3 = np.array([sketches[col].quantile(0.75) for col in cols])
+    lower_bound, upper_bound = iqr_bounds(Q1, Q3)
+    for col, lo, hi in zip(cols, lower_bound, upper_bound):
+        print(f"   {col}: [{lo:.4f}, {hi:.4f}]")
+
+    # Pass 2: filter & write
+    print(" - Pass 2: filtering outliers...")
+    n_written = 0
+    with span("clean.filter", rows=n_rows), FrameWriter(output_path, categories) as writer:
+        for chunk in prepared_chunks():
+            if cols:
+                chunk = chunk[outlier_mask(chunk, cols, lower_bound, upper_bound)]
+
+            writer.write(chunk)
+            n_written += len(chunk)
+
+    print(f"Valid rows: {n_rows}, rows written: {n_written}")
+    return n_written
+
+
+def clean_file(input_path=RAW_DATA_PATH, output_path=CLEANED_DATA_PATH, jobs=None):
+    #  loading data
+    print("Loading dataset...")
+
+    if not os.path.exists(input_path):
+        print(f"Error: File not found at {input_path}")
+        print("Please ensure 'career_data.csv' is in the same folder as this script.")
+        raise FileNotFoundError(input_path)
+
+    # parsed in parallel and typed with the raw schema; rows with missing or
+    # invalid values are quarantined and duplicates dropped while reading
+    stats = {}
+    with span("clean.load") as s:
+        df = read_raw(input_path, jobs, quarantine=quarantine_file(input_path), stats=stats)
+        s.rows = stats["rows"]
+    print_stats(stats, quarantine_file(input_path))
+    print(f"Original Data Shape: {df.shape}")
+
+    with span("clean.clean", rows=len(df)):
+        df = normalize_columns(df)
+
+        if 'gender' not in df.columns:
+            df = add_gender(df)
+            print(" - 'gender' column created with random values.")
+
+        print(" - Checking for outliers...")
+        df = remove_outliers(df)
+
+        df = clean_text(df)
+
+    #  saving the clean file
+    print(f"Final Data Shape: {df.shape}")
+    with span("clean.save", rows=len(df)):
+        write_frame(df, output_path)
+    print(f"Success: Cleaned data saved to '{os.path.basename(output_path)}'")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean the raw career dataset.")
+    parser.add_argument("--input", default=RAW_DATA_PATH)
+    parser.add_argument("--output", default=CLEANED_DATA_PATH)
+    parser.add_argument("--streaming", action="store_true",
+                        help="two chunked passes with approximate quantiles (for files larger than RAM)")
+    parser.add_argument("--chunk-bytes", type=int, default=CHUNK_BYTES)
+    parser.add_argument("--jobs", type=int, default=None, help="parser processes (default: all cores)")
+    args = parser.parse_args()
+
+    if args.streaming:
+        if not os.path.exists(args.input):
+            raise FileNotFoundError(args.input)
+        clean_file_streaming(args.input, args.output, args.chunk_bytes, args.jobs)
+        print(f"Success: Cleaned data saved to '{os.path.basename(args.output)}'")
+    else:
+        clean_file(args.input, args.output, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.feather as feather
+
+
+# Processed artifacts are stored as uncompressed Feather (Arrow IPC) files:
+# typed columns, categorical text columns kept as dictionaries, and the file
+# can be memory-mapped so reading a few columns only touches those pages.
+# Paths ending in .csv keep working as plain CSV.
+
+
+def _is_csv(path):
+    return str(path).lower().endswith(".csv")
+
+
+# Text columns -> pandas category (Arrow dictionary columns on disk)
+def to_categorical(df, categories=None):
+    df = df.copy()
+    for col in df.columns:
+        if categories and col in categories:
+            df[col] = pd.Categorical(df[col], categories=categories[col])
+        elif df[col].dtype == object:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def write_frame(df, path):
+    if _is_csv(path):
+        df.to_csv(path, index=False)
+    else:
+        feather.write_feather(to_categorical(df), path, compression="uncompressed")
+
+
+# rows: (start, stop) reads only that slice; for Arrow only its pages are touched
+def read_frame(path, columns=None, rows=None):
+    if _is_csv(path):
+        if rows is None:
+            return pd.read_csv(path, usecols=columns)
+        start, stop = rows
+        return pd.read_csv(path, usecols=columns, skiprows=range(1, start + 1), nrows=stop - start)
+
+    # read through the IPC reader: feather.read_table copies the selected
+    # columns even when memory-mapped, this keeps them as views of the file
+    with pa.memory_map(path, "r") as source:
+        table = ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        if rows is not None:
+            table = table.slice(rows[0], rows[1] - rows[0])
+        return table.to_pandas()
+
+
+def frame_columns(path):
+    if _is_csv(path):
+        return list(pd.read_csv(path, nrows=0).columns)
+    with pa.memory_map(path, "r") as source:
+        return ipc.open_file(source).schema.names
+
+
+def frame_rows(path):
+    if _is_csv(path):
+        with open(path, "rb") as f:
+            return sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b"")) - 1
+    with pa.memory_map(path, "r") as source:
+        reader = ipc.open_file(source)
+        return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+
+# Appends chunks to one file. For Arrow output every chunk must use the
+# same categories, so they are passed up front (see clean_file_streaming).
+class FrameWriter:
+
+    def __init__(self, path, categories=None):
+        self.path = path
+        self.categories = categories or {}
+        self._sink = None
+        self._writer = None
+        self._first = True
+
+    def write(self, df):
+        if _is_csv(self.path):
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        else:
+            table = pa.Table.from_pandas(to_categorical(df, self.categories), preserve_index=False)
+            if self._writer is None:
+                self._sink = pa.OSFile(self.path, "wb")
+                self._writer = ipc.new_file(self._sink, table.schema)
+            self._writer.write_table(table)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
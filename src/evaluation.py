@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.instrumentation import span
+from src.locking import locked
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+LABEL_MAP_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "label_encoding_map.json")
+REPORT_FILE = os.path.join(PROJECT_ROOT, "reports", "evaluation.json")
+
+TARGET_COL = "career_role"
+
+
+# Encoded class ids -> career names (ids are returned as text when there
+# is no label map, e.g. for synthetic data)
+def class_names(classes, label_map_file=LABEL_MAP_FILE):
+    inv_map = {}
+    if os.path.exists(label_map_file):
+        with open(label_map_file, "r", encoding="utf-8") as f:
+            inv_map = {v: k for k, v in json.load(f).get(TARGET_COL, {}).items()}
+    return [inv_map.get(int(c), str(c)) if np.issubdtype(type(c), np.integer) else str(c)
+            for c in classes]
+
+
+#  Evaluation
+# Predicts each split once and derives every metric from its confusion
+# matrix, so a trainer never calls predict / score twice on the same rows.
+#   splits: {"train": (X, y), "test": (X, y)}, predicted on first use
+class Evaluation:
+
+    def __init__(self, model, splits, classes=None):
+        self.model = model
+        self.splits = splits
+        if classes is None:
+            classes = getattr(model, "classes_", None)
+        if classes is None:
+            classes = np.unique(np.concatenate([np.asarray(y) for _, y in splits.values()]))
+        self.classes = np.asarray(classes)
+        self.labels = class_names(self.classes)
+        self._predictions = {}
+        self._confusion = {}
+
+    def predictions(self, split):
+        if split not in self._predictions:
+            X, _ = self.splits[split]
+            with span("evaluate.predict", rows=X.shape[0], split=split):
+                self._predictions[split] = np.asarray(self.model.predict(X))
+        return self._predictions[split]
+
+    # -> position of every value in self.classes. A value that isn't a class
+    # raises: a bare searchsorted would count it as a neighbouring class
+    def class_index(self, values, what="labels"):
+        values = np.asarray(values)
+        order = np.argsort(self.classes, kind="stable")
+        ordered = self.classes[order]
+        pos = np.minimum(np.searchsorted(ordered, values), len(ordered) - 1)
+        unknown = ordered[pos] != values
+        if unknown.any():
+            missing = sorted(set(values[unknown].tolist()))
+            raise ValueError(f"{what} not in the model's classes: {missing[:10]}")
+        return order[pos]
+
+    # rows: actual class, columns: predicted class (order of self.classes)
+    def confusion(self, split):
+        if split not in self._confusion:
+            n = len(self.classes)
+            actual = self.class_index(self.splits[split][1], f"{split} labels")
+            predicted = self.class_index(self.predictions(split), f"{split} predictions")
+            self._confusion[split] = np.bincount(actual * n + predicted, minlength=n * n).reshape(n, n)
+        return self._confusion[split]
+
+    def metrics(self, split):
+        cm = self.confusion(split)
+        tp = np.diag(cm).astype(float)
+        support = cm.sum(axis=1)
+        predicted = cm.sum(axis=0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(predicted > 0, tp / predicted, 0.0)
+            recall = np.where(support > 0, tp / support, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+        weights = support / max(support.sum(), 1)
+        return {
+            "rows": int(support.sum()),
+            "accuracy": float(tp.sum() / max(support.sum(), 1)),
+            "macro": {"precision": float(precision.mean()), "recall": float(recall.mean()),
+                      "f1": float(f1.mean())},
+            "weighted": {"precision": float(precision @ weights), "recall": float(recall @ weights),
+                         "f1": float(f1 @ weights)},
+            "per_class": {
+                label: {"precision": float(p), "recall": float(r), "f1": float(f), "support": int(s)}
+                for label, p, r, f, s in zip(self.labels, precision, recall, f1, support)
+            },
+            "confusion_matrix": cm.tolist(),
+        }
+
+    def accuracy(self, split):
+        cm = self.confusion(split)
+        return float(np.trace(cm) / max(cm.sum(), 1))
+
+    # Text table in the layout of sklearn's classification_report
+    def report(self, split):
+        m = self.metrics(split)
+        width = max(len("weighted avg"), *(len(label) for label in self.labels))
+        lines = [f"{'':>{width}} {'precision':>9} {'recall':>9} {'f1-score':>9} {'support':>9}", ""]
+        for label, c in m["per_class"].items():
+            lines.append(f"{label:>{width}} {c['precision']:>9.2f} {c['recall']:>9.2f} "
+                         f"{c['f1']:>9.2f} {c['support']:>9}")
+        lines += ["", f"{'accuracy':>{width}} {'':>9} {'':>9} {m['accuracy']:>9.2f} {m['rows']:>9}"]
+        for name in ("macro", "weighted"):
+            avg = m[name]
+            lines.append(f"{name + ' avg':>{width}} {avg['precision']:>9.2f} {avg['recall']:>9.2f} "
+                         f"{avg['f1']:>9.2f} {m['rows']:>9}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            "labels": self.labels,
+            "splits": {split: self.metrics(split) for split in self.splits},
+        }
+
+
+#  Plots
+# Confusion matrices are drawn in a worker process while the trainer goes
+# on saving the model; the worker imports matplotlib / seaborn as soon as
+# the pool is created, so that cost overlaps training too.
+def _import_plotting():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import seaborn  # noqa: F401
+
+
+def plot_confusion_matrix(cm, labels, title, path, cmap="Blues"):
+    _import_plotting()
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    with span("evaluate.plot", plot=os.path.basename(path)):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        plt.figure(figsize=(10, 8))
+        sns.heatmap(np.asarray(cm), annot=True, fmt="d", cmap=cmap,
+                    xticklabels=labels, yticklabels=labels)
+        plt.title(title)
+        plt.xlabel("Predicted")
+        plt.ylabel("Actual")
+        plt.xticks(rotation=45, ha="right")
+        plt.tight_layout()
+        plt.savefig(path)
+        plt.close()
+    return path
+
+
+class PlotPool:
+
+    def __init__(self, workers=1):
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        self._futures = [self._pool.submit(_import_plotting)]
+
+    def confusion_matrix(self, evaluation, split, title, path, cmap="Blues"):
+        self._futures.append(self._pool.submit(
+            plot_confusion_matrix, evaluation.confusion(split), evaluation.labels, title, path, cmap
+        ))
+
+    # waits for every plot; a failed plot raises here
+    def close(self):
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+#  Report
+# One JSON file for every model: {"models": {name: entry}}. Trainers run
+# in parallel (pipeline.py), so the file is read-modified-written under a
+# lock and replaced atomically.
+def report_entry(evaluation, source, plot=None, **extra):
+    plot = os.path.relpath(plot, PROJECT_ROOT) if plot else None
+    return {"source": source, "plot": plot, "updated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **extra, **evaluation.to_dict()}
+
+
+def update_report(entries, path=REPORT_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with locked(path):
+        report = {"models": {}}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                report = json.load(f)
+        report["models"].update(entries)
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp, path)
+    return report
+
+
+# Rebuilds the report from per-trainer part files (see pipeline.py); parts
+# that don't exist (a skipped trainer) are left out
+def merge_reports(parts, path=REPORT_FILE):
+    report = {"models": {}}
+    for part in parts:
+        if os.path.exists(part):
+            report["models"].update(load_report(part)["models"])
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with locked(path):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp, path)
+    return report
+
+
+def load_report(path=REPORT_FILE):
+    if not os.path.exists(path):
+        return {"models": {}}
+    with open(path, "r") as f:
+        return json.load(f)
@@ -1,27 +1,30 @@
 import pandas as pd
+import numpy as np
 import os
+import sys
 import json
-from sklearn.preprocessing import LabelEncoder, StandardScaler
 
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
 
-INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "career_data_cleaned.csv")
-OUTPUT_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "career_data_encoded.csv")
-MAPPING_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "label_encoding_map.json")
-
+from src.preprocessing import CareerPreprocessor, PREPROCESSOR_FILE, ENCODED_FILE, save_encoded
+from src.data_io import read_frame
+from src.instrumentation import span
 
-# Load data
-if not os.path.exists(INPUT_FILE):
-    raise FileNotFoundError("Run data_cleaning.py first")
+INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "career_data_cleaned.feather")
+OUTPUT_FILE = ENCODED_FILE
+MAPPING_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "label_encoding_map.json")
+RULES_FILE = os.path.join(PROJECT_ROOT, "data", "career_rules.csv")
 
-df = pd.read_csv(INPUT_FILE)
-print("Data loaded:", df.shape)
+TARGET_COL = "career_role"
 
 
 # Create TARGET: career_role
+# Row-by-row reference version. The pipeline uses assign_careers() below,
+# which reads the same rules from data/career_rules.csv.
 def assign_career(row):
     interest = row["interestarea"].strip().lower()
     gpa = row["gpa"]
@@ -49,58 +52,121 @@ def assign_career(row):
     else:
         return "General Management"
 
-print("Generating target column: career_role")
-df["career_role"] = df.apply(assign_career, axis=1)
 
+# Rule table: one row per (GPA band, interest area) -> career.
+# Empty min_gpa / max_gpa mean open-ended, "*" matches any interest.
+# Bands are [min_gpa, max_gpa); the first matching row wins, like the if/elif above.
+def load_career_rules(path=RULES_FILE):
+    rules = pd.read_csv(path, dtype={"interestarea": str, "career_role": str})
+    rules["min_gpa"] = rules["min_gpa"].fillna(-np.inf).astype(float)
+    rules["max_gpa"] = rules["max_gpa"].fillna(np.inf).astype(float)
+    rules["interestarea"] = rules["interestarea"].str.strip().str.lower()
+    return rules
+
+
+# Vectorized target: the rules are compiled into a small
+# (GPA band x interest) lookup table, then every row is one array lookup.
+def assign_careers(df, rules=None):
+    if rules is None:
+        rules = load_career_rules()
+
+    # GPA bands from the rule boundaries
+    edges = np.unique(np.concatenate([rules["min_gpa"], rules["max_gpa"]]))
+    edges = edges[np.isfinite(edges)]
+    band_lo = np.concatenate([[-np.inf], edges])
+    band_hi = np.concatenate([edges, [np.inf]])
+
+    # Interest areas named in the rules, plus one column for "anything else"
+    interests = [i for i in rules["interestarea"].unique() if i != "*"]
+    interest_col = {interest: j for j, interest in enumerate(interests)}
+    other_col = len(interests)
+
+    # table[band, interest] -> index into careers (-1 = no rule matched)
+    careers = list(rules["career_role"].unique())
+    career_idx = {career: k for k, career in enumerate(careers)}
+    table = np.full((len(band_lo), len(interests) + 1), -1, dtype=np.int32)
+
+    for b in range(len(band_lo)):
+        for j in range(len(interests) + 1):
+            for rule in rules.itertuples(index=False):
+                in_band = rule.min_gpa <= band_lo[b] and band_hi[b] <= rule.max_gpa
+                if j == other_col:
+                    matches = rule.interestarea == "*"
+                else:
+                    matches = rule.interestarea in ("*", interests[j])
+                if in_band and matches:
+                    table[b, j] = career_idx[rule.career_role]
+                    break
+
+    # Row -> band (missing GPA fails every ">=" check, so it lands in the lowest band)
+    gpa = df["gpa"].to_numpy(dtype=np.float64)
+    band = np.searchsorted(edges, gpa, side="right")
+    band[np.isnan(gpa)] = 0
+
+    # Row -> interest column: normalise the distinct values only, not every row
+    codes, uniques = pd.factorize(df["interestarea"])
+    unique_cols = np.array(
+        [interest_col.get(str(u).strip().lower(), other_col) for u in uniques] + [other_col],
+        dtype=np.int32
+    )
+    cols = unique_cols[codes]  # code -1 (missing) picks the trailing "other" entry
 
-# Separate target and features
-target_col = "career_role"
-X = df.drop(columns=[target_col])
-y = df[target_col]
+    picked = table[band, cols]
+    labels = np.array(careers + [None], dtype=object)
+    return pd.Series(labels[picked], index=df.index, name=TARGET_COL)
 
 
-# Encode categorical FEATURES
-label_maps = {}
-le = LabelEncoder()
+def encode_file(input_file=INPUT_FILE, output_file=OUTPUT_FILE, mapping_file=MAPPING_FILE,
+                preprocessor_file=PREPROCESSOR_FILE, rules_file=RULES_FILE):
+    # Load data
+    if not os.path.exists(input_file):
+        raise FileNotFoundError("Run data_cleaning.py first")
 
-categorical_cols = X.select_dtypes(include=["object"]).columns
+    with span("encode.load") as s:
+        df = read_frame(input_file)
+        s.rows = len(df)
+    print("Data loaded:", df.shape)
 
-for col in categorical_cols:
-    le = LabelEncoder()
-    X[col] = le.fit_transform(X[col])
+    with span("encode.encode", rows=len(df)):
+        print("Generating target column: career_role")
+        df[TARGET_COL] = assign_careers(df, load_career_rules(rules_file))
 
-    label_maps[col] = {
-        str(cls): int(code)
-        for cls, code in zip(le.classes_, le.transform(le.classes_))
-    }
-   
+        # Separate target and features
+        X = df.drop(columns=[TARGET_COL])
+        y = df[TARGET_COL]
 
-# Encode TARGET separately
-target_encoder = LabelEncoder()
-y_encoded = target_encoder.fit_transform(y)
+        # Encode categorical FEATURES, multi-hot encode skills/languages/clubs,
+        # encode TARGET & scale FEATURES.
+        # Everything is fitted once and saved as a single artifact so serving
+        # code can reproduce this transform without the training CSV.
+        preprocessor = CareerPreprocessor().fit(X, y)
 
-label_maps[target_col] = {
-    str(cls): int(code)
-    for cls, code in zip(
-        target_encoder.classes_,
-        target_encoder.transform(target_encoder.classes_)
-    )
-}
+        X_encoded = preprocessor.transform_sparse(X)
+        y_encoded = preprocessor.encode_target(y)
+        label_maps = preprocessor.label_maps(TARGET_COL)
+
+    # Save (columnar, multi-hot columns as uint8)
+    with span("encode.save", rows=X_encoded.shape[0]):
+        multi_hot_cols = preprocessor.feature_names_[len(preprocessor.dense_features_):]
+        save_encoded(X_encoded, y_encoded, preprocessor.feature_names_, output_file, TARGET_COL,
+                     binary_cols=multi_hot_cols)
+        print(f"Encoded data saved: {X_encoded.shape[0]} rows x {X_encoded.shape[1]} features")
+
+        with open(mapping_file, "w") as f:
+            json.dump(label_maps, f, indent=4)
 
+        preprocessor.save(preprocessor_file)
+    print(f"Preprocessor saved to {preprocessor_file}")
 
-# Scale numeric FEATURES only
-scaler = StandardScaler()
-X[X.columns] = scaler.fit_transform(X[X.columns])
+    print("Feature engineering completed")
+    print("Target distribution:")
+    print(pd.Series(y_encoded).value_counts())
+    return preprocessor
 
-# Combine & save
-df_final = X.copy()
-df_final[target_col] = y_encoded
 
-df_final.to_csv(OUTPUT_FILE, index=False)
+def main():
+    encode_file()
 
-with open(MAPPING_FILE, "w") as f:
-    json.dump(label_maps, f, indent=4)
 
-print("Feature engineering completed")
-print("Target distribution:")
-print(df_final[target_col].value_counts())
+if __name__ == "__main__":
+    main()
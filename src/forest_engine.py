@@ -0,0 +1,188 @@
+import os
+import json
+import argparse
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.instrumentation import traced
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+MODEL_FILE = os.path.join(PROJECT_ROOT, "data", "models", "best_model.joblib")
+ENGINE_DIR = os.path.join(PROJECT_ROOT, "data", "models", "forest_engine")
+
+# Bump when the array layout changes
+ENGINE_VERSION = 1
+
+ARRAYS = ["feature", "threshold", "children", "value", "roots"]
+
+# rows per block in predict_proba (trees x block x classes leaf values in memory)
+BLOCK_ROWS = 512
+
+
+# A fitted random forest flattened into contiguous arrays: all trees' nodes
+# are concatenated and a batch is evaluated one tree level at a time for all
+# trees (max_depth vectorized steps) instead of one Python call per tree.
+#
+# Nodes are renumbered breadth-first so the two children of a node are
+# adjacent: next = children[node] + (x > threshold). A leaf is its own child
+# with an infinite threshold, so rows that reach a leaf early stay there.
+#
+# Arrays are saved as .npy files and memory-mapped on load, so opening the
+# engine does not unpickle anything. Results match predict_proba exactly:
+# features are compared as float32 like sklearn, and tree probabilities
+# are summed in tree order before dividing by the number of trees.
+class FlatForest:
+
+    def __init__(self, arrays, classes, feature_names, max_depth):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.classes_ = np.asarray(classes)
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.n_features_in_ = len(feature_names)
+        self.max_depth = max_depth
+
+    #  Export
+    @classmethod
+    def from_sklearn(cls, forest):
+        if not hasattr(forest, "estimators_") or forest.n_outputs_ != 1:
+            raise ValueError("Only fitted single-output forest classifiers can be compiled")
+
+        n_classes = len(forest.classes_)
+        feature, threshold, children, value, roots = [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            order, first_child = _breadth_first(tree.children_left, tree.children_right)
+            is_leaf = tree.children_left[order] == -1
+
+            feature.append(np.where(is_leaf, 0, tree.feature[order]).astype(np.int32))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold[order]))
+            children.append((first_child + offset).astype(np.int32))
+
+            # class fractions per node, as returned by DecisionTreeClassifier.predict_proba
+            value.append(tree.value[order, 0, :n_classes].astype(np.float64))
+
+            roots.append(offset)
+            offset += len(order)
+            max_depth = max(max_depth, tree.max_depth)
+
+        arrays = {
+            "feature": np.concatenate(feature),
+            "threshold": np.concatenate(threshold),
+            "children": np.concatenate(children),
+            "value": np.concatenate(value),
+            "roots": np.asarray(roots, dtype=np.int32),
+        }
+        names = getattr(forest, "feature_names_in_", [f"x{i}" for i in range(forest.n_features_in_)])
+        return cls(arrays, forest.classes_, [str(c) for c in names], int(max_depth))
+
+    #  Persistence
+    def save(self, path=ENGINE_DIR):
+        os.makedirs(path, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({
+                "version": ENGINE_VERSION,
+                "classes": self.classes_.tolist(),
+                "feature_names": self.feature_names_in_.tolist(),
+                "max_depth": self.max_depth,
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, path=ENGINE_DIR, mmap=True):
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            raise FileNotFoundError(f"{path} is not a compiled forest. Run forest_engine.py first")
+
+        with open(os.path.join(path, "meta.json"), "r") as f:
+            meta = json.load(f)
+        if meta.get("version") != ENGINE_VERSION:
+            raise ValueError(
+                f"Compiled forest version {meta.get('version')} does not match {ENGINE_VERSION}. "
+                f"Re-run forest_engine.py"
+            )
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            for name in ARRAYS
+        }
+        return cls(arrays, meta["classes"], meta["feature_names"], meta["max_depth"])
+
+    #  Prediction
+    def _as_array(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X[list(self.feature_names_in_)]
+            X = X.sparse.to_coo() if hasattr(X, "sparse") else X.to_numpy()
+        if sp.issparse(X):
+            X = X.toarray()
+        # sklearn trees compare float32 features against float64 thresholds
+        return np.asarray(X, dtype=np.float32)
+
+    def predict_proba(self, X):
+        X = self._as_array(X)
+        n_trees = len(self.roots)
+        n_features = X.shape[1]
+        proba = np.empty((len(X), self.value.shape[1]), dtype=np.float64)
+
+        # nodes are (trees x rows); np.take is much faster than fancy indexing
+        for start in range(0, len(X), BLOCK_ROWS):
+            block = X[start:start + BLOCK_ROWS]
+            flat = block.ravel()
+            # offset of each row in the flattened block
+            row_offset = np.arange(len(block), dtype=np.int32) * n_features
+
+            nodes = np.repeat(self.roots[:, None], len(block), axis=1)
+            for _ in range(self.max_depth):
+                x = np.take(flat, np.take(self.feature, nodes) + row_offset)
+                nodes = np.take(self.children, nodes) + (x > np.take(self.threshold, nodes))
+
+            # summing over the outer axis adds the trees in order, like
+            # RandomForestClassifier accumulating one tree at a time
+            proba[start:start + BLOCK_ROWS] = np.take(self.value, nodes, axis=0).sum(axis=0)
+
+        proba /= n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+# -> node order (old ids) and each node's first child in the new numbering
+def _breadth_first(children_left, children_right):
+    order = [0]
+    first_child = []
+    for node in order:
+        if children_left[node] == -1:
+            first_child.append(len(first_child))
+        else:
+            first_child.append(len(order))
+            order += [children_left[node], children_right[node]]
+    return np.asarray(order), np.asarray(first_child)
+
+
+@traced("forest_engine.compile")
+def compile_model(model_file=MODEL_FILE, output_dir=ENGINE_DIR):
+    forest = FlatForest.from_sklearn(joblib.load(model_file))
+    forest.save(output_dir)
+    print(f"Compiled {len(forest.roots)} trees ({len(forest.feature)} nodes, depth {forest.max_depth}) -> {output_dir}")
+    return forest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a fitted random forest into flat memory-mappable arrays.")
+    parser.add_argument("--model", default=MODEL_FILE)
+    parser.add_argument("--output", default=ENGINE_DIR)
+    args = parser.parse_args()
+
+    compile_model(args.model, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import os
+import time
+
+from src.instrumentation import span, traced
+
+# joblib / pandas / sklearn are imported by the loaders below, so the quiz
+# options and quiz_to_record() are available without them (app start-up)
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+MODEL_FILE = os.path.join(PROJECT_ROOT, "data", "models", "best_model.joblib")
+PREPROCESSOR_FILE = os.path.join(PROJECT_ROOT, "data", "models", "preprocessor.joblib")
+
+REGISTRY_PREFIX = "registry:"
+
+
+#  Quiz -> student record
+# The quiz does not ask for every column the model was trained on,
+# so the remaining fields get fixed, neutral values.
+QUIZ_DEFAULTS = {
+    "location": "Delhi",
+    "yearofstudy": "Junior",
+}
+
+# Q1: work environment (keys of the translated options)
+ENV_OPTIONS = ["opt_tech", "opt_corp", "opt_res", "opt_pub", "opt_art"]
+
+ENV_PROFILE = {
+    "opt_tech": {"extracurricularactivities": "Coding Club", "subjects": "Computer Science"},
+    "opt_corp": {"extracurricularactivities": "Debate Club", "subjects": "Mathematics"},
+    "opt_res": {"extracurricularactivities": "Volunteer Group", "subjects": "Physics"},
+    "opt_pub": {"extracurricularactivities": "Sports Team", "subjects": "History"},
+    "opt_art": {"extracurricularactivities": "Art Club", "subjects": "Psychology"},
+}
+
+# Q3: activities
+ACTIVITY_OPTIONS = [
+    "Coding / Gaming",
+    "Leading Team / Managing",
+    "Solving Math Puzzles",
+    "Debating / History",
+    "Singing / Painting / Sports",
+]
+
+ACTIVITY_PROFILE = {
+    "Coding / Gaming": {"interestarea": "Computer science", "clubmemberships": "Coding Club"},
+    "Leading Team / Managing": {"interestarea": "History", "clubmemberships": "Volunteer Group"},
+    "Solving Math Puzzles": {"interestarea": "Mathematics", "clubmemberships": "Coding Club"},
+    "Debating / History": {"interestarea": "History", "clubmemberships": "Debate Club"},
+    "Singing / Painting / Sports": {"interestarea": "Biology", "clubmemberships": "Art Club"},
+}
+
+# Q5: preferred language (Hindi is not in the training data, English is the closest match)
+QUIZ_LANGUAGES = {
+    "English": "English",
+    "French": "French",
+    "Hindi": "English",
+}
+
+
+def quiz_to_record(env_key, problem_solving, activity, communication, language):
+    record = dict(QUIZ_DEFAULTS)
+    record.update(ENV_PROFILE[env_key])
+    record.update(ACTIVITY_PROFILE[activity])
+
+    # Problem solving slider (0-10) is mapped onto the GPA range of the dataset (4-8)
+    record["gpa"] = 4.0 + 0.4 * problem_solving
+
+    # Strongest self-rated skill
+    if activity == "Coding / Gaming" and problem_solving >= communication:
+        record["skills"] = "Programming"
+    elif problem_solving >= communication:
+        record["skills"] = "Problem Solving"
+    elif communication >= 8:
+        record["skills"] = "Leadership"
+    else:
+        record["skills"] = "Public Speaking"
+
+    record["languages"] = QUIZ_LANGUAGES.get(language, "English")
+    return record
+
+
+#  Loading
+def load_preprocessor(path=PREPROCESSOR_FILE):
+    from src.preprocessing import CareerPreprocessor
+    return CareerPreprocessor.load(path)
+
+
+# A directory is a compiled forest (see forest_engine.py), "registry:<ref>"
+# a registry version (registry.py, e.g. "registry:best"). Both, and joblib
+# files, are memory-mapped: processes serving the same model share its pages.
+def load_model(path=MODEL_FILE):
+    if path.startswith(REGISTRY_PREFIX):
+        from src.registry import Registry
+        return Registry().load(path[len(REGISTRY_PREFIX):])
+
+    if os.path.isdir(path):
+        from src.forest_engine import FlatForest
+        return FlatForest.load(path)
+
+    import joblib
+    return joblib.load(path, mmap_mode="r")
+
+
+#  Prediction
+# Transformed rows -> the input the model was fitted on: its columns, in its
+# order. XGBoost is fitted on CSR, where an absent entry means "missing"
+# rather than 0, so it is scored on CSR too; a pandas frame would be
+# densified and take different branches.
+def model_input(model, X):
+    X = X[list(model.feature_names_in_)]
+    if hasattr(model, "get_booster"):
+        return X.sparse.to_coo().tocsr()
+    return X
+
+
+@traced("inference.recommend")
+def recommend(model, preprocessor, record):
+    start = time.perf_counter()
+
+    # Same transform as training, then the exact columns the model was fitted on
+    X = model_input(model, preprocessor.transform(record))
+
+    if hasattr(model, "predict_proba"):
+        proba = model.predict_proba(X)[0]
+        best = proba.argmax()
+        code = model.classes_[best]
+        score = float(proba[best]) * 100
+    else:
+        code = model.predict(X)[0]
+        score = None
+
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "career": preprocessor.decode_target([code])[0],
+        "score": score,
+        "latency_ms": latency_ms,
+    }
+
+
+# Many records at once: one transform and one predict_proba for the whole batch
+def recommend_batch(model, preprocessor, records):
+    with span("inference.predict", rows=len(records)):
+        X = model_input(model, preprocessor.transform(records))
+
+        if hasattr(model, "predict_proba"):
+            proba = model.predict_proba(X)
+            best = proba.argmax(axis=1)
+            codes = model.classes_[best]
+            scores = [float(p) * 100 for p in proba[range(len(best)), best]]
+        else:
+            codes = model.predict(X)
+            scores = [None] * len(codes)
+
+    careers = preprocessor.decode_target(codes)
+    return [{"career": career, "score": score} for career, score in zip(careers, scores)]
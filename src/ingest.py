@@ -0,0 +1,281 @@
+import io
+import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.instrumentation import span
+
+RAW_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "career_data.csv")
+QUARANTINE_DIR = os.path.join(PROJECT_ROOT, "data", "quarantine")
+
+# bytes of CSV parsed per task
+CHUNK_BYTES = 32 * 2**20
+
+
+#  Raw schema
+# Declared once: every column the raw export must have and its dtype.
+# Categories are sorted, the order write_frame() used to infer.
+LOCATIONS = [
+    "Andaman & Nicobar Islands", "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chandigarh",
+    "Chhattisgarh", "Dadra & Nagar Haveli and Daman & Diu", "Delhi", "Goa", "Gujarat", "Haryana",
+    "Himachal Pradesh", "Jammu & Kashmir", "Jharkhand", "Karnataka", "Kerala", "Ladakh", "Lakshadweep",
+    "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya", "Mizoram", "Nagaland", "Odisha", "Puducherry",
+    "Punjab", "Rajasthan", "Sikkim", "Tamil Nadu", "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand",
+    "West Bengal",
+]
+YEARS_OF_STUDY = ["Freshman", "Graduate", "Junior", "Senior", "Sophomore"]
+SUBJECTS = ["Biology", "Computer Science", "History", "Mathematics", "Physics", "Psychology"]
+INTEREST_AREAS = ["Biology", "Computer science", "History", "Mathematics"]
+
+RAW_SCHEMA = {
+    "ExtracurricularActivities": object,
+    "Skills": object,
+    "Location": pd.CategoricalDtype(LOCATIONS),
+    "YearOfStudy": pd.CategoricalDtype(YEARS_OF_STUDY),
+    "Subjects": pd.CategoricalDtype(SUBJECTS),
+    "GPA": np.float32,
+    "Languages": object,
+    "ClubMemberships": object,
+    "InterestArea": pd.CategoricalDtype(INTEREST_AREAS),
+}
+
+GPA_RANGE = (0.0, 10.0)
+
+# quarantine file: the raw fields as read, why the row was rejected, and the
+# original text of lines that could not be split into fields
+QUARANTINE_COLS = list(RAW_SCHEMA) + ["reason", "raw_line"]
+
+
+#  Chunking
+# Splits the data part of the file into byte ranges that end on a newline,
+# so every range holds whole rows and can be parsed on its own.
+# (Assumes no quoted field contains a newline, true of the raw exports.)
+def read_header(path):
+    with open(path, "rb") as f:
+        line = f.readline()
+    return [name.strip().strip('"') for name in line.decode("utf-8-sig").rstrip("\r\n").split(",")], len(line)
+
+
+def byte_ranges(path, data_start, chunk_bytes=CHUNK_BYTES):
+    size = os.path.getsize(path)
+    bounds = [data_start]
+    with open(path, "rb") as f:
+        while bounds[-1] < size:
+            f.seek(min(bounds[-1] + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            bounds.append(max(f.tell(), bounds[-1] + 1))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+#  Validation
+NUMBER = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+
+# Types and checks one parsed table with Arrow kernels (no per-row Python).
+# -> (typed frame of the valid rows, their fingerprints, the invalid rows
+#     as read + reason)
+def _validate(table):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    n = table.num_rows
+    # index of the first failed check of a row, 0 = valid
+    problem = np.zeros(n, dtype=np.int32)
+    reasons = [""]
+    out = {}
+
+    def flag(mask, reason):
+        reasons.append(reason)
+        mask = np.asarray(mask.fill_null(False).to_numpy(zero_copy_only=False), dtype=bool)
+        problem[(problem == 0) & mask] = len(reasons) - 1
+
+    for col, dtype in RAW_SCHEMA.items():
+        values = pc.utf8_trim_whitespace(table[col])
+        missing = pc.or_kleene(pc.is_null(values), pc.equal(values, ""))
+        flag(missing, f"missing {col}")
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            index = pc.index_in(values, value_set=pa.array(list(dtype.categories), type=pa.string()))
+            flag(pc.and_(pc.invert(missing), pc.is_null(index)), f"invalid {col}")
+            out[col] = index.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int8)
+        elif dtype is np.float32:
+            is_number = pc.match_substring_regex(values, NUMBER)
+            number = pc.cast(pc.if_else(is_number, values, None), pa.float32())
+            in_range = pc.and_(pc.greater_equal(number, GPA_RANGE[0]), pc.less_equal(number, GPA_RANGE[1]))
+            flag(pc.and_(pc.invert(missing), pc.invert(in_range.fill_null(False))), f"invalid {col}")
+            out[col] = number
+        else:
+            out[col] = values
+
+    valid = problem == 0
+    typed, hashed = {}, {}
+    for col, dtype in RAW_SCHEMA.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            typed[col] = hashed[col] = pd.Categorical.from_codes(out[col][valid], dtype=dtype)
+        elif dtype is np.float32:
+            typed[col] = hashed[col] = out[col].filter(pa.array(valid)).to_numpy(zero_copy_only=False).astype(dtype)
+        else:
+            # one str object per distinct value, shared by its rows (like
+            # pd.read_csv), instead of one per row
+            encoded = out[col].filter(pa.array(valid)).combine_chunks().dictionary_encode()
+            uniques = np.array(encoded.dictionary.to_pylist(), dtype=object)
+            codes = encoded.indices.to_numpy(zero_copy_only=False)
+            typed[col] = uniques[codes]
+            # pandas hashes a categorical by value, each distinct string once:
+            # the same fingerprint as the plain column, in any chunk
+            hashed[col] = pd.Categorical.from_codes(codes, categories=uniques)
+    typed = pd.DataFrame(typed)
+    fingerprints = pd.util.hash_pandas_object(pd.DataFrame(hashed), index=False).to_numpy()
+
+    quarantined = table.filter(pa.array(~valid)).to_pandas()
+    quarantined["reason"] = np.array(reasons, dtype=object)[problem[~valid]]
+    return typed, fingerprints, quarantined
+
+
+# Worker: parse, type and validate one byte range. Malformed lines (wrong
+# number of fields) and rows that fail the schema come back as quarantine.
+def _parse_range(path, bounds, columns):
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+
+    start, stop = bounds
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(stop - start)
+
+    malformed = []
+
+    def invalid_row(row):
+        malformed.append(row.text)
+        return "skip"
+
+    with span("ingest.parse") as s:
+        table = pcsv.read_csv(
+            io.BytesIO(data),
+            read_options=pcsv.ReadOptions(column_names=columns, use_threads=False),
+            parse_options=pcsv.ParseOptions(invalid_row_handler=invalid_row),
+            convert_options=pcsv.ConvertOptions(
+                column_types={col: pa.string() for col in columns},
+                include_columns=list(RAW_SCHEMA),
+                strings_can_be_null=True,
+            ),
+        )
+        typed, fingerprints, quarantined = _validate(table)
+        if malformed:
+            quarantined = pd.concat([quarantined, pd.DataFrame({"reason": "malformed row", "raw_line": malformed})],
+                                    ignore_index=True)
+        quarantined = quarantined.reindex(columns=QUARANTINE_COLS)
+        s.rows = table.num_rows + len(malformed)
+
+    return typed, fingerprints, quarantined, table.num_rows + len(malformed)
+
+
+#  Ingestion
+def quarantine_file(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(QUARANTINE_DIR, f"{stem}.quarantine.csv")
+
+
+# Yields the valid rows of the raw CSV chunk by chunk, in file order.
+#
+# Byte ranges are parsed by `jobs` worker processes (at most 2 * jobs
+# chunks in flight, so memory is bounded by the window, not the file).
+# Rows are typed with RAW_SCHEMA; rows with a missing or invalid value, and
+# malformed lines, are appended to `quarantine` (a CSV with a reason column,
+# None to drop them). Duplicates are dropped across chunks with a set of
+# row fingerprints, keeping the first occurrence. Counts go into `stats`.
+def iter_raw(path=RAW_DATA_PATH, jobs=None, chunk_bytes=CHUNK_BYTES, quarantine=None, stats=None):
+    columns, data_start = read_header(path)
+    missing = [col for col in RAW_SCHEMA if col not in columns]
+    if missing:
+        raise ValueError(f"{path} is missing column(s): {', '.join(missing)}")
+
+    ranges = byte_ranges(path, data_start, chunk_bytes)
+    stats = stats if stats is not None else {}
+    stats.update({"rows": 0, "valid": 0, "duplicates": 0, "quarantined": 0})
+
+    if quarantine is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(quarantine)), exist_ok=True)
+        if os.path.exists(quarantine):
+            os.remove(quarantine)
+
+    seen = set()
+    for typed, fingerprints, quarantined, n_rows in _parsed(path, ranges, columns, jobs):
+        is_new = ~pd.Series(fingerprints).duplicated().to_numpy()
+        is_new &= np.array([f not in seen for f in fingerprints], dtype=bool)
+        seen.update(fingerprints[is_new].tolist())
+
+        stats["rows"] += n_rows
+        stats["duplicates"] += int((~is_new).sum())
+        stats["quarantined"] += len(quarantined)
+        stats["valid"] += int(is_new.sum())
+
+        if quarantine is not None and len(quarantined):
+            write_header = not os.path.exists(quarantine)
+            quarantined.to_csv(quarantine, mode="a", header=write_header, index=False)
+
+        yield typed[is_new].reset_index(drop=True)
+
+
+def _parsed(path, ranges, columns, jobs):
+    jobs = jobs or os.cpu_count()
+    if jobs == 1 or len(ranges) == 1:
+        for bounds in ranges:
+            yield _parse_range(path, bounds, columns)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = []
+        for bounds in ranges:
+            pending.append(pool.submit(_parse_range, path, bounds, columns))
+            if len(pending) >= 2 * jobs:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+# The whole file as one frame (category / float32 columns, about a third
+# of the memory of pd.read_csv's object columns).
+def read_raw(path=RAW_DATA_PATH, jobs=None, chunk_bytes=CHUNK_BYTES, quarantine=None, stats=None):
+    stats = stats if stats is not None else {}
+    chunks = list(iter_raw(path, jobs, chunk_bytes, quarantine, stats))
+    if not chunks:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in RAW_SCHEMA.items()})
+    return pd.concat(chunks, ignore_index=True)
+
+
+def print_stats(stats, quarantine=None):
+    print(f"Rows read: {stats['rows']}, valid: {stats['valid']}, "
+          f"duplicates dropped: {stats['duplicates']}, quarantined: {stats['quarantined']}")
+    if stats["quarantined"] and quarantine is not None:
+        print(f" - quarantined rows written to {quarantine}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a raw CSV export against the raw schema.")
+    parser.add_argument("input", nargs="?", default=RAW_DATA_PATH)
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-bytes", type=int, default=CHUNK_BYTES)
+    parser.add_argument("--quarantine", default=None, help=f"default: {QUARANTINE_DIR}/<name>.quarantine.csv")
+    args = parser.parse_args()
+
+    quarantine = args.quarantine or quarantine_file(args.input)
+    stats = {}
+    for _ in iter_raw(args.input, args.jobs, args.chunk_bytes, quarantine, stats):
+        pass
+    print_stats(stats, quarantine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import functools
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+SPANS_FILE = os.path.join(PROJECT_ROOT, "reports", "spans.jsonl")
+PROFILE_DIR = os.path.join(PROJECT_ROOT, "reports", "profiles")
+
+# CAREER_TRACE=1 (or a file path) records spans, CAREER_PROFILE=fit,encode
+# (span names or name suffixes, "*" for all) also runs those spans under
+# cProfile + tracemalloc. Environment variables, so worker processes
+# (pipeline.py, train_all.py, plot workers) inherit the setting.
+TRACE_ENV = "CAREER_TRACE"
+PROFILE_ENV = "CAREER_PROFILE"
+
+
+#  Spans
+# with span("train_svm.fit", rows=X.shape[0]):
+#     model.fit(X, y)
+#
+# Each span records wall and CPU time, the process' peak RSS so far and
+# rows/s when rows are given (set s.rows inside the block when the count is
+# only known there), as one JSON line in SPANS_FILE. Disabled, span()
+# returns a shared no-op object, so hot paths (inference.recommend) can
+# keep their spans.
+class _Config:
+    enabled = False
+    path = SPANS_FILE
+    profile = frozenset()
+
+
+_config = _Config()
+_local = threading.local()
+_lock = threading.Lock()
+
+# this process' totals per span name, for the Prometheus endpoint
+_totals = {}
+
+
+def configure(trace=None, profile=None):
+    trace = os.environ.get(TRACE_ENV, "") if trace is None else trace
+    profile = os.environ.get(PROFILE_ENV, "") if profile is None else profile
+
+    _config.enabled = bool(trace) and trace not in ("0", "false")
+    _config.path = trace if _config.enabled and trace not in ("1", "true") else SPANS_FILE
+    _config.profile = frozenset(p.strip() for p in profile.split(",") if p.strip())
+    if _config.enabled:
+        os.environ[TRACE_ENV] = _config.path
+        if _config.profile:
+            os.environ[PROFILE_ENV] = ",".join(sorted(_config.profile))
+
+
+def enabled():
+    return _config.enabled
+
+
+class _NullSpan:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# None where the resource module doesn't exist (Windows): the record then
+# has no peak_rss_mb. Imported here, so the app still imports there
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+class Span:
+
+    def __init__(self, name, rows=None, **attrs):
+        self.name = name
+        self.rows = rows
+        self.attrs = attrs
+        self._profiler = None
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault("stack", [])
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+
+        if _should_profile(self.name) and not getattr(_local, "profiling", False):
+            self._start_profile()
+
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_s = time.perf_counter() - self._wall
+        cpu_s = time.process_time() - self._cpu
+        _local.stack.pop()
+
+        record = {
+            "span": self.name,
+            "parent": self.parent,
+            "ts": time.time(),
+            "pid": os.getpid(),
+            "wall_s": round(wall_s, 6),
+            "cpu_s": round(cpu_s, 6),
+        }
+        peak = _peak_rss_mb()
+        if peak is not None:
+            record["peak_rss_mb"] = round(peak, 1)
+        if self.rows is not None:
+            record["rows"] = int(self.rows)
+            record["rows_per_s"] = round(self.rows / wall_s, 1) if wall_s > 0 else None
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        record.update(self.attrs)
+
+        if self._profiler is not None:
+            record.update(self._stop_profile())
+        _emit(record)
+        return False
+
+    #  Profiling (opt-in)
+    def _start_profile(self):
+        import cProfile
+        import tracemalloc
+
+        _local.profiling = True
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def _stop_profile(self):
+        import tracemalloc
+
+        self._profiler.disable()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        _local.profiling = False
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stem = os.path.join(PROFILE_DIR, f"{self.name}.{os.getpid()}.{int(time.time() * 1000)}")
+        self._profiler.dump_stats(stem + ".prof")
+        with open(stem + ".alloc.txt", "w") as f:
+            for stat in snapshot.statistics("lineno")[:25]:
+                f.write(f"{stat}\n")
+
+        return {"py_alloc_peak_mb": round(peak / 2**20, 2), "profile": os.path.relpath(stem + ".prof", PROJECT_ROOT)}
+
+
+def _should_profile(name):
+    profile = _config.profile
+    if not profile:
+        return False
+    return "*" in profile or name in profile or name.rsplit(".", 1)[-1] in profile
+
+
+def _add(totals, record):
+    t = totals.setdefault(record["span"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows": 0, "peak_rss_mb": 0.0})
+    t["calls"] += 1
+    t["wall_s"] += record["wall_s"]
+    t["cpu_s"] += record["cpu_s"]
+    t["rows"] += record.get("rows", 0)
+    t["peak_rss_mb"] = max(t["peak_rss_mb"], record.get("peak_rss_mb", 0.0))
+
+
+def _emit(record):
+    with _lock:
+        _add(_totals, record)
+
+        # one short write in append mode: lines from parallel processes don't interleave
+        os.makedirs(os.path.dirname(os.path.abspath(_config.path)), exist_ok=True)
+        with open(_config.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def span(name, rows=None, **attrs):
+    if not _config.enabled:
+        return _NULL_SPAN
+    return Span(name, rows, **attrs)
+
+
+# @traced("clean.clean_file"): the whole call is one span
+def traced(name):
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _config.enabled:
+                return func(*args, **kwargs)
+            with Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+#  Export
+def read_spans(path=SPANS_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def aggregate(records):
+    totals = {}
+    for record in records:
+        _add(totals, record)
+    return totals
+
+
+# Prometheus text exposition format; totals default to this process' spans
+def prometheus_text(totals=None, prefix="career"):
+    if totals is None:
+        with _lock:
+            totals = {name: dict(t) for name, t in _totals.items()}
+
+    metrics = [
+        ("span_calls_total", "counter", "Completed spans", "calls", 1),
+        ("span_seconds_total", "counter", "Wall time spent in spans", "wall_s", 1),
+        ("span_cpu_seconds_total", "counter", "Process CPU time spent in spans", "cpu_s", 1),
+        ("span_rows_total", "counter", "Rows processed in spans", "rows", 1),
+        ("span_peak_rss_bytes", "gauge", "Peak resident memory at the end of a span", "peak_rss_mb", 2**20),
+    ]
+    lines = []
+    for metric, kind, help_text, key, scale in metrics:
+        lines.append(f"# HELP {prefix}_{metric} {help_text}")
+        lines.append(f"# TYPE {prefix}_{metric} {kind}")
+        for name in sorted(totals):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{prefix}_{metric}{{span="{label}"}} {totals[name][key] * scale:.6g}')
+    return "\n".join(lines) + "\n"
+
+
+def print_summary(totals):
+    print(f"{'span':<34} {'calls':>6} {'wall (s)':>9} {'cpu (s)':>9} {'rows/s':>11} {'peak RSS (MB)':>14}")
+    print("-" * 88)
+    for name, t in sorted(totals.items(), key=lambda item: -item[1]["wall_s"]):
+        rate = f"{t['rows'] / t['wall_s']:.0f}" if t["rows"] and t["wall_s"] else "-"
+        print(f"{name:<34} {t['calls']:>6} {t['wall_s']:>9.3f} {t['cpu_s']:>9.3f} {rate:>11} {t['peak_rss_mb']:>14.0f}")
+
+
+def serve(path=SPANS_FILE, port=9464):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text(aggregate(read_spans(path))).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    print(f"Serving span metrics from {path} on http://localhost:{port}/metrics")
+    ThreadingHTTPServer(("", port), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize or export recorded spans.")
+    parser.add_argument("command", choices=["summary", "prometheus", "serve"])
+    parser.add_argument("--spans", default=SPANS_FILE)
+    parser.add_argument("--port", type=int, default=9464)
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        print_summary(aggregate(read_spans(args.spans)))
+    elif args.command == "prometheus":
+        print(prometheus_text(aggregate(read_spans(args.spans))), end="")
+    else:
+        serve(args.spans, args.port)
+
+
+configure()
+
+
+if __name__ == "__main__":
+    main()
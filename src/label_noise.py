@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+
+# Label noise for the "realistic" RF / XGBoost targets, vectorized.
+#
+# Uniform mode flips exactly int(rate * n) labels, each to a different class
+# picked uniformly: (code + randint(1, n_classes)) % n_classes can never
+# return the current class. Matrix mode resamples every label from its row
+# of a class-conditional noise matrix, T[i, j] = P(noisy = j | true = i).
+# Classes are the distinct labels present in y (sorted).
+
+
+def uniform_noise_matrix(n_classes, rate):
+    T = np.full((n_classes, n_classes), rate / (n_classes - 1))
+    np.fill_diagonal(T, 1.0 - rate)
+    return T
+
+
+def inject_label_noise(y, rate=0.12, rng=None, noise_matrix=None):
+    rng = rng if rng is not None else np.random.default_rng(42)
+
+    values = np.asarray(y)
+    classes, codes = np.unique(values, return_inverse=True)
+    n_classes = len(classes)
+    noisy = codes.copy()
+
+    if noise_matrix is None:
+        if n_classes > 1:
+            n_noise = int(rate * len(codes))
+            idx = rng.choice(len(codes), n_noise, replace=False)
+            noisy[idx] = (codes[idx] + rng.integers(1, n_classes, size=n_noise)) % n_classes
+    else:
+        T = np.asarray(noise_matrix, dtype=np.float64)
+        if T.shape != (n_classes, n_classes):
+            raise ValueError(f"noise_matrix must be {n_classes}x{n_classes}, got {T.shape}")
+        if (T < 0).any() or not np.allclose(T.sum(axis=1), 1.0):
+            raise ValueError("noise_matrix rows must be probabilities that sum to 1")
+
+        cum = np.cumsum(T, axis=1)
+        draws = rng.random(len(codes))
+        for k in range(n_classes):
+            rows = codes == k
+            noisy[rows] = np.searchsorted(cum[k], draws[rows], side="right")
+        np.minimum(noisy, n_classes - 1, out=noisy)
+
+    result = classes[noisy]
+    if isinstance(y, pd.Series):
+        return pd.Series(result, index=y.index, name=y.name)
+    return result
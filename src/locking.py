@@ -0,0 +1,30 @@
+import os
+from contextlib import contextmanager
+
+
+#  Exclusive file lock
+# Several processes (trainers, train_all workers) read-modify-write the same
+# JSON files; they serialize on <path>.lock. fcntl on POSIX, msvcrt on
+# Windows, imported when a lock is taken so the modules using this still
+# import on either.
+@contextmanager
+def locked(path):
+    with open(path + ".lock", "w") as lock:
+        if os.name == "nt":
+            import msvcrt
+            # LK_LOCK gives up after ~10 s of retries; keep waiting
+            while True:
+                try:
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
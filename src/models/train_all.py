@@ -0,0 +1,324 @@
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# sklearn and joblib are imported where they are used: importing train_all
+# (ranking.py, tune.py, a worker process) shouldn't pay for them up front
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocessing import load_encoded
+from src.label_noise import inject_label_noise
+from src.evaluation import Evaluation, update_report, report_entry
+from src.registry import Registry, REGISTRY_DIR
+from src.pipeline import file_hash
+from src.instrumentation import span
+
+ENCODED_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "career_data_encoded.feather")
+MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
+BEST_MODEL_FILE = os.path.join(PROJECT_ROOT, "data", "models", "best_model.joblib")
+COMPARISON_FILE = os.path.join(PROJECT_ROOT, "reports", "model_comparison.csv")
+TUNED_PARAMS_FILE = os.path.join(PROJECT_ROOT, "data", "models", "tuned_params.json")
+
+TARGET_COL = "career_role"
+
+# gpa / interestarea define the target, the linear / tree / svm scripts leave them out.
+# Models trained on them are compared but never promoted: their accuracy is
+# not comparable with the others'
+LEAKAGE_COLS = ["gpa", "interestarea"]
+
+# name -> (trainer module, model file, features left out)
+MODELS = {
+    "decision_tree": ("src.models.train_decision_tree", "decision_tree_model.joblib", LEAKAGE_COLS),
+    "logistic_regression": ("src.models.train_logistic_regression", "logistic_regression_model.joblib", LEAKAGE_COLS),
+    "random_forest": ("src.models.train_random_forest", "rf_model.joblib", []),
+    "svm": ("src.models.train_svm", "svm_model.joblib", LEAKAGE_COLS),
+    "xgboost": ("src.models.train_xgboost", "xgboost_model.joblib", []),
+}
+
+LATENCY_ROWS = 200
+
+
+#  Split
+# One split for every model (ranking.py calibrates on the same held-out rows).
+# Same 12% label flips as train_random_forest.py / train_xgboost.py, so
+# every model is trained and scored against one realistic target.
+def split_encoded(df):
+    from sklearn.model_selection import train_test_split
+
+    X = df.drop(columns=[TARGET_COL])
+    y = inject_label_noise(df[TARGET_COL], rate=0.12, rng=np.random.default_rng(42))
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+
+#  Shared memory
+# Arrays are copied once into shared memory blocks; workers map the same
+# pages instead of unpickling their own copy of the data.
+def to_shared(arrays):
+    blocks, specs = [], {}
+    for key, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        blocks.append(shm)
+        specs[key] = (shm.name, arr.shape, arr.dtype.str)
+    return blocks, specs
+
+
+def attach_shared(specs):
+    blocks, arrays = [], {}
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        blocks.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    return blocks, arrays
+
+
+def share_csr(prefix, matrix):
+    return {
+        f"{prefix}_data": matrix.data,
+        f"{prefix}_indices": matrix.indices,
+        f"{prefix}_indptr": matrix.indptr,
+    }
+
+
+def csr_from_shared(arrays, prefix, n_cols):
+    indptr = arrays[f"{prefix}_indptr"]
+    return sp.csr_matrix(
+        (arrays[f"{prefix}_data"], arrays[f"{prefix}_indices"], indptr),
+        shape=(len(indptr) - 1, n_cols), copy=False
+    )
+
+
+#  Feature names
+# Models are fitted and evaluated on the shared CSR arrays, so the column
+# names the app selects by (model.feature_names_in_) are attached after
+# that; from then on the model is scored on named frames (inference.py).
+def set_feature_names(model, names):
+    names = np.asarray(names, dtype=object)
+    if hasattr(model, "steps"):
+        set_feature_names(model.steps[0][1], names)
+    elif hasattr(model, "get_booster"):
+        model.get_booster().feature_names = list(names)
+    else:
+        model.feature_names_in_ = names
+
+
+#  Models
+# The trainer's build_model(), with hyperparameters from a search (tune.py)
+# applied on top: {"svm__C": 10, ...}
+def make_model(name, n_classes, n_jobs=-1, params=None):
+    module = importlib.import_module(MODELS[name][0])
+    if name == "xgboost":
+        model = module.build_model(n_classes, n_jobs=n_jobs)
+    elif name == "random_forest":
+        model = module.build_model(n_jobs=n_jobs)
+    else:
+        model = module.build_model()
+    if params:
+        model.set_params(**params)
+    return model
+
+
+# Column positions a model is trained on
+def feature_subset(name, feature_names):
+    exclude = MODELS[name][2]
+    return [j for j, col in enumerate(feature_names) if col not in exclude]
+
+
+def load_tuned_params(path=TUNED_PARAMS_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+#  Worker
+def _fit_one(name, specs, feature_names, n_jobs, model_file, params=None):
+    blocks, arrays = attach_shared(specs)
+    try:
+        n_cols = len(feature_names)
+        X_train = csr_from_shared(arrays, "train", n_cols)
+        X_test = csr_from_shared(arrays, "test", n_cols)
+        y_train, y_test = arrays["y_train"], arrays["y_test"]
+
+        keep = feature_subset(name, feature_names)
+        if len(keep) < n_cols:
+            X_train, X_test = X_train[:, keep], X_test[:, keep]
+
+        model = make_model(name, len(np.unique(y_train)), n_jobs=n_jobs, params=params)
+
+        start = time.perf_counter()
+        with span("train_all.fit", rows=X_train.shape[0], model=name):
+            model.fit(X_train, y_train)
+        fit_s = time.perf_counter() - start
+
+        evaluation = Evaluation(model, {"test": (X_test, y_test)})
+
+        # single-row predictions, like one click in the app
+        rows = min(LATENCY_ROWS, X_test.shape[0])
+        timings = []
+        for i in range(rows):
+            start = time.perf_counter()
+            model.predict(X_test[i])
+            timings.append(time.perf_counter() - start)
+
+        # scored on CSR like it was fitted; the names only apply from here on
+        accuracy = evaluation.accuracy("test")
+        entry = report_entry(evaluation, "train_all")
+
+        set_feature_names(model, [feature_names[j] for j in keep])
+
+        import joblib
+        with span("train_all.save", model=name):
+            joblib.dump(model, model_file)
+
+        return {
+            "model": name,
+            "accuracy": accuracy,
+            "fit_s": fit_s,
+            "predict_p50_ms": float(np.percentile(timings, 50) * 1000),
+            "size_kb": os.path.getsize(model_file) / 1024,
+            "model_file": model_file,
+            "features": [feature_names[j] for j in keep],
+            "leakage": any(feature_names[j] in LEAKAGE_COLS for j in keep),
+            "evaluation": entry,
+        }
+    finally:
+        X_train = X_test = y_train = y_test = arrays = None
+        for shm in blocks:
+            shm.close()
+
+
+# promote defaults to True only when every model is trained, so a partial
+# run can't replace the best model with the best of a subset.
+# tuned: apply the hyperparameters found by tune.py (TUNED_PARAMS_FILE)
+# Every trained model is added to the registry (registry.py) with its
+# metrics, features and data hash; promoting points the "best" alias at the
+# winner and links best_model_file to it.
+def train_all(encoded_file=ENCODED_FILE, names=None, jobs=None, models_dir=MODELS_DIR,
+              best_model_file=BEST_MODEL_FILE, comparison_file=COMPARISON_FILE, promote=None,
+              tuned=False, registry_dir=REGISTRY_DIR):
+    if promote is None:
+        promote = not names
+    names = names or list(MODELS)
+    unknown = set(names) - set(MODELS)
+    if unknown:
+        raise ValueError(f"Unknown model(s): {', '.join(sorted(unknown))}")
+
+    #  Load & split once
+    with span("train_all.load"):
+        df = load_encoded(encoded_file)
+    print(f"Data loaded: {df.shape}")
+
+    with span("train_all.split", rows=len(df)):
+        X_train, X_test, y_train, y_test = split_encoded(df)
+    feature_names = [str(c) for c in X_train.columns]
+    X_train, X_test = X_train.sparse.to_coo().tocsr(), X_test.sparse.to_coo().tocsr()
+    y_train, y_test = y_train.to_numpy(), y_test.to_numpy()
+    print("Data split done")
+
+    # worker processes x threads per model ~= cores
+    workers = min(len(names), jobs or os.cpu_count() or 1)
+    n_jobs = max(1, (os.cpu_count() or 1) // workers)
+    os.makedirs(models_dir, exist_ok=True)
+
+    arrays = {**share_csr("train", X_train), **share_csr("test", X_test),
+              "y_train": y_train, "y_test": y_test}
+    blocks, specs = to_shared(arrays)
+    params = load_tuned_params() if tuned else {}
+
+    results, errors = [], {}
+    try:
+        print(f"Training {len(names)} models with {workers} worker(s), n_jobs={n_jobs}...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_fit_one, name, specs, feature_names, n_jobs,
+                            os.path.join(models_dir, MODELS[name][1]), params.get(name)): name
+                for name in names
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results.append(future.result())
+                    print(f" - {name} done")
+                except ImportError as e:
+                    errors[name] = f"skipped ({e})"
+                except Exception as e:
+                    errors[name] = f"failed ({e!r})"
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    for name, error in errors.items():
+        print(f" - {name}: {error}")
+    if not results:
+        raise RuntimeError("No model was trained")
+
+    #  Registry, comparison & promotion
+    update_report({r["model"]: r.pop("evaluation") for r in results})
+
+    registry = Registry(registry_dir)
+    data_hash = file_hash(encoded_file)
+    for r in results:
+        entry = registry.register(
+            r["model"], r["model_file"], features=r.pop("features"), data_hash=data_hash, source="train_all",
+            metrics={k: r[k] for k in ("accuracy", "fit_s", "predict_p50_ms", "size_kb")},
+        )
+        r["version"] = entry["version"]
+
+    # promotion candidates first
+    table = pd.DataFrame(results).sort_values(
+        ["leakage", "accuracy", "predict_p50_ms"], ascending=[True, False, True]
+    ).reset_index(drop=True)
+
+    os.makedirs(os.path.dirname(comparison_file), exist_ok=True)
+    table.drop(columns=["model_file", "version"]).to_csv(comparison_file, index=False)
+
+    print()
+    print(table.drop(columns=["model_file"]).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+    candidates = table[~table["leakage"]]
+    if candidates.empty:
+        print(f"\nNo model trained without {', '.join(LEAKAGE_COLS)}, nothing to promote")
+        return table
+
+    best = candidates.iloc[0]
+    if promote:
+        target = registry.set_alias("best", f"{best['model']}@{best['version']}")
+        registry.export("best", best_model_file)
+        print(f"\nBest model: {target} (accuracy {best['accuracy']:.4f}) -> {best_model_file}")
+    else:
+        print(f"\nBest model: {best['model']} (accuracy {best['accuracy']:.4f}), not promoted")
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train every model on one shared split and promote the best.")
+    parser.add_argument("models", nargs="*", help=f"models to train (default: all of {', '.join(MODELS)})")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--promote", action="store_true", default=None,
+                        help="copy the winner to best_model.joblib even when only some models are trained")
+    parser.add_argument("--tuned", action="store_true",
+                        help="use the hyperparameters found by tune.py instead of the trainers' defaults")
+    args = parser.parse_args()
+
+    train_all(names=args.models, jobs=args.jobs, promote=args.promote, tuned=args.tuned)
+
+
+if __name__ == "__main__":
+    main()
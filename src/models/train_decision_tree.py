@@ -1,20 +1,21 @@
-import pandas as pd
-import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 import os
+import sys
 import joblib
 
 from sklearn.model_selection import train_test_split
 from sklearn.tree import DecisionTreeClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocessing import load_encoded
+from src.evaluation import Evaluation, PlotPool, update_report, report_entry, REPORT_FILE
+from src.instrumentation import span
 
 INPUT_FILE = os.path.join(
-    PROJECT_ROOT, "data", "processed", "career_data_encoded.csv"
+    PROJECT_ROOT, "data", "processed", "career_data_encoded.feather"
 )
 
 MODEL_FILE = os.path.join(
@@ -25,69 +26,74 @@ PLOT_FILE = os.path.join(
     PROJECT_ROOT, "reports", "dt_confusion_matrix.png"
 )
 
-os.makedirs(os.path.dirname(MODEL_FILE), exist_ok=True)
-os.makedirs(os.path.dirname(PLOT_FILE), exist_ok=True)
 
-# Load data
-if not os.path.exists(INPUT_FILE):
-    print("Error: Encoded data not found. Run feature_engineering.py first.")
-    raise FileNotFoundError(INPUT_FILE)
+def build_model():
+    return DecisionTreeClassifier(
+        random_state=42
+    )
 
-df = pd.read_csv(INPUT_FILE)
-print("Data loaded:", df.shape)
 
-# Define features & target
-leakage_cols = ["career_role", "gpa", "interestarea"]
-X = df.drop(columns=leakage_cols)
-y = df["career_role"]
+def train(input_file=INPUT_FILE, model_file=MODEL_FILE, plot_file=PLOT_FILE, report_file=REPORT_FILE):
+    os.makedirs(os.path.dirname(model_file), exist_ok=True)
+    os.makedirs(os.path.dirname(plot_file), exist_ok=True)
+    plots = PlotPool()
 
-print("Features used:", X.columns.tolist())
+    # Load data
+    if not os.path.exists(input_file):
+        print("Error: Encoded data not found. Run feature_engineering.py first.")
+        raise FileNotFoundError(input_file)
 
-# Train-test split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-model = DecisionTreeClassifier(
-    random_state=42
-)
+    # gpa / interestarea define the target (leakage), so they are not even read
+    leakage_cols = ["gpa", "interestarea"]
 
-print("Data split done")
+    # sparse feature columns (multi-hot skills/languages/clubs), memory-mapped
+    with span("train_decision_tree.load"):
+        df = load_encoded(input_file, exclude=leakage_cols)
+    print("Data loaded:", df.shape)
 
+    # Define features & target
+    X = df.drop(columns=["career_role"])
+    y = df["career_role"]
 
+    print("Features used:", X.columns.tolist())
 
-model.fit(X_train, y_train)
-print("Training complete")
+    # Train-test split
+    with span("train_decision_tree.split", rows=len(X)):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42
+        )
+    model = build_model()
 
-# Evaluate
-y_pred = model.predict(X_test)
-acc = accuracy_score(y_test, y_pred)
+    print("Data split done")
 
-print(f"Accuracy: {acc:.4f}")
-print("\nClassification Report:")
-print(classification_report(y_test, y_pred))
 
-# Confusion Matrix
-plt.figure(figsize=(10, 8))
-cm = confusion_matrix(y_test, y_pred)
-labels = np.unique(y)
 
-sns.heatmap(
-    cm,
-    annot=True,
-    fmt="d",
-    cmap="Purples",
-    xticklabels=labels,
-    yticklabels=labels
-)
-plt.title("Confusion Matrix - Decision Tree")
-plt.xlabel("Predicted")
-plt.ylabel("Actual")
-plt.savefig(PLOT_FILE)
-plt.close()
-
-print("Confusion matrix saved")
-
-# Save model
-joblib.dump(model, MODEL_FILE)
-print("Decision Tree model saved")
-print("Done")
+    with span("train_decision_tree.fit", rows=len(X_train)):
+        model.fit(X_train, y_train)
+    print("Training complete")
+
+    # Evaluate (predicted once, plot drawn in the background)
+    evaluation = Evaluation(model, {"test": (X_test, y_test)})
+    print(f"Accuracy: {evaluation.accuracy('test'):.4f}")
+    print(evaluation.report("test"))
+
+    plots.confusion_matrix(evaluation, "test", "Confusion Matrix - Decision Tree", plot_file, cmap="Purples")
+    update_report({"decision_tree": report_entry(evaluation, "train_decision_tree", plot=plot_file)}, report_file)
+
+    # Save model
+    with span("train_decision_tree.save"):
+        joblib.dump(model, model_file)
+    print("Decision Tree model saved")
+
+    plots.close()
+    print("Confusion matrix saved")
+    print("Done")
+    return model
+
+
+def main():
+    train()
+
+
+if __name__ == "__main__":
+    main()
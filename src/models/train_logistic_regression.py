@@ -1,12 +1,10 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 import os
+import sys
 import joblib
+import argparse
 from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import SGDClassifier
@@ -17,9 +15,15 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))  
 # PROJECT_ROOT -> /ai_learning
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocessing import load_encoded
+from src.evaluation import Evaluation, PlotPool, update_report, report_entry, REPORT_FILE
+from src.data_io import read_frame, frame_columns, frame_rows
+from src.instrumentation import span
 
 INPUT_FILE = os.path.join(
-    PROJECT_ROOT, "data", "processed", "career_data_encoded.csv"
+    PROJECT_ROOT, "data", "processed", "career_data_encoded.feather"
 )
 
 MODEL_FILE = os.path.join(
@@ -30,124 +34,192 @@ PLOT_FILE = os.path.join(
     PROJECT_ROOT, "reports", "lr_confusion_matrix.png"
 )
 
-REPORT_FILE = os.path.join(
-    PROJECT_ROOT, "reports", "lr_classification_report.txt"
-)
-
-os.makedirs(os.path.dirname(MODEL_FILE), exist_ok=True)
-os.makedirs(os.path.dirname(PLOT_FILE), exist_ok=True)
-
-
-
-#  LOAD DATA
-if not os.path.exists(INPUT_FILE):
-    print("Error: Encoded data not found. Run feature_engineering.py first.")
-    raise FileNotFoundError(f"File not found at {INPUT_FILE}. Please ensure feature engineering was successful.")
-
-df = pd.read_csv(INPUT_FILE)
-print(f"data loaded: {df.shape}")
-
-
-
-
-#  Split data (remove leakage features)
-
-leakage_cols = ["career_role", "gpa", "interestarea"]
-
-X = df.drop(columns=leakage_cols)
-y = df["career_role"]
-
-print("Features used for training:", X.columns.tolist())
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-print("data split done")
-
-# Split: 80% for training, 20% for testing
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-print("data split done")
-
-
-#  Train model
-print("training model...")
-
-# max_iter=1000 helps prevent errors if the data is complex
-
-
-# Train model
-print("training model...")
-
-
-
-try:
-    model = LogisticRegression(
-        max_iter=1000,
-        class_weight="balanced",
-        solver="lbfgs",
-        multi_class="auto"
-    )
-except TypeError:
-    model = LogisticRegression(
-        max_iter=1000,
-        class_weight="balanced",
-        solver="lbfgs"
-    )
-
-model.fit(X_train, y_train)
-print("training complete")
-
-
-
-model = Pipeline([
-    ("scaler", StandardScaler()),
-    ("sgd", SGDClassifier(
-        loss="log_loss",
-        class_weight="balanced",
-        max_iter=2000,
-        random_state=42
-    ))
-])
-
-
-
-model.fit(X_train, y_train)
+TARGET_COL = "career_role"
 
-print("training complete")
+# gpa / interestarea define the target (leakage), so they are not even read
+LEAKAGE_COLS = ["gpa", "interestarea"]
 
+# Streaming mode: rows per chunk (memory is bounded by one chunk, not the file)
+CHUNK_ROWS = 50000
+EPOCHS = 5
+# rows held out for the accuracy check, chosen per chunk with a fixed seed
+HOLDOUT = 0.2
 
 
+def build_model():
+    return Pipeline([
+        # with_mean=False keeps the input sparse
+        ("scaler", StandardScaler(with_mean=False)),
+        ("sgd", SGDClassifier(
+            loss="log_loss",
+            class_weight="balanced",
+            max_iter=2000,
+            random_state=42
+        ))
+    ])
 
-# Evaluate model
-y_pred = model.predict(X_test)
 
-# Calculate accuracy
-acc = accuracy_score(y_test, y_pred)
-print(f"accuracy: {acc:.4f}")
+def train(input_file=INPUT_FILE, model_file=MODEL_FILE, plot_file=PLOT_FILE, report_file=REPORT_FILE):
+    os.makedirs(os.path.dirname(model_file), exist_ok=True)
+    os.makedirs(os.path.dirname(plot_file), exist_ok=True)
+    plots = PlotPool()
 
-print("\nclassification report:")
-print(classification_report(y_test, y_pred))
+    #  LOAD DATA
+    if not os.path.exists(input_file):
+        print("Error: Encoded data not found. Run feature_engineering.py first.")
+        raise FileNotFoundError(f"File not found at {input_file}. Please ensure feature engineering was successful.")
 
+    # sparse feature columns (multi-hot skills/languages/clubs), memory-mapped
+    with span("train_logistic_regression.load"):
+        df = load_encoded(input_file, exclude=LEAKAGE_COLS)
+    print(f"data loaded: {df.shape}")
 
-#  Visualisation (Confusion Matrix)
-# This creates a picture showing where the model made mistakes
-plt.figure(figsize=(10, 8))
-cm = confusion_matrix(y_test, y_pred)
 
-# Get class labels for the confusion matrix for better readability
-# Assuming `y` contains the original numeric labels after encoding
-class_labels = np.unique(y)
 
-sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', xticklabels=class_labels, yticklabels=class_labels)
-plt.title('Confusion Matrix - Logistic Regression')
-plt.xlabel('Predicted')
-plt.ylabel('Actual')
-plt.savefig(PLOT_FILE)
-print("confusion matrix saved as png")
 
+    #  Split data (leakage features were not loaded)
 
-#  Save model
-joblib.dump(model, MODEL_FILE)
-print("model saved to joblib")
-print("done")
+    X = df.drop(columns=[TARGET_COL])
+    y = df[TARGET_COL]
+
+    print("Features used for training:", X.columns.tolist())
+
+    # Split: 80% for training, 20% for testing
+    with span("train_logistic_regression.split", rows=len(X)):
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    print("data split done")
+
+
+    #  Train model
+    print("training model...")
+    model = build_model()
+    with span("train_logistic_regression.fit", rows=len(X_train)):
+        model.fit(X_train, y_train)
+    print("training complete")
+
+
+    # Evaluate model (predicted once, plot drawn in the background)
+    evaluation = Evaluation(model, {"test": (X_test, y_test)})
+    print(f"accuracy: {evaluation.accuracy('test'):.4f}")
+
+    print("\nclassification report:")
+    print(evaluation.report("test"))
+
+    plots.confusion_matrix(evaluation, "test", "Confusion Matrix - Logistic Regression", plot_file, cmap="Blues")
+    update_report({"logistic_regression": report_entry(evaluation, "train_logistic_regression", plot=plot_file)}, report_file)
+
+
+    #  Save model
+    with span("train_logistic_regression.save"):
+        joblib.dump(model, model_file)
+    print("model saved to joblib")
+
+    plots.close()
+    print("confusion matrix saved as png")
+    print("done")
+    return model
+
+
+#  Streaming (out-of-core) training
+# The encoded file is read one chunk of rows at a time (memory-mapped, so
+# only that chunk's pages are loaded) and the same scaler + SGD pipeline is
+# updated with partial_fit:
+#   1. one pass of StandardScaler.partial_fit for the running mean/variance
+#   2. `epochs` passes of SGDClassifier.partial_fit, chunks in a new random
+#      order every epoch and rows shuffled inside each chunk
+# With update=True the saved model is loaded and trained further on
+# input_file (e.g. a day of new rows) instead of starting from scratch.
+def chunk_bounds(n_rows, chunk_rows=CHUNK_ROWS):
+    return [(start, min(start + chunk_rows, n_rows)) for start in range(0, n_rows, chunk_rows)]
+
+
+def _read_chunk(input_file, features, bounds, seed):
+    df = load_encoded(input_file, columns=features, rows=bounds)
+    # the same rows of a chunk are held out on every pass
+    held = np.random.default_rng([seed, bounds[0]]).random(len(df)) < HOLDOUT
+    return df[features], df[TARGET_COL].to_numpy(), held
+
+
+def train_streaming(input_file=INPUT_FILE, model_file=MODEL_FILE, epochs=EPOCHS,
+                    chunk_rows=CHUNK_ROWS, update=False, seed=42):
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"File not found at {input_file}. Please ensure feature engineering was successful.")
+
+    features = [c for c in frame_columns(input_file) if c not in LEAKAGE_COLS and c != TARGET_COL]
+    chunks = chunk_bounds(frame_rows(input_file), chunk_rows)
+    rng = np.random.default_rng(seed)
+    print(f"streaming {len(chunks)} chunk(s) of up to {chunk_rows} rows, {epochs} epoch(s)")
+
+    if update:
+        model = joblib.load(model_file)
+        scaler, sgd = model.named_steps["scaler"], model.named_steps["sgd"]
+        classes = sgd.classes_
+    else:
+        model = build_model()
+        scaler, sgd = model.named_steps["scaler"], model.named_steps["sgd"]
+
+        # partial_fit can't compute "balanced" weights from one chunk: they
+        # come from the class counts of the whole file (n / (classes * count))
+        counts = pd.Series(dtype=np.int64)
+        for bounds in chunks:
+            y = read_frame(input_file, columns=[TARGET_COL], rows=bounds)[TARGET_COL]
+            counts = counts.add(y.value_counts(), fill_value=0)
+        counts = counts.sort_index()
+        classes = counts.index.to_numpy()
+        weights = counts.sum() / (len(counts) * counts)
+        sgd.set_params(class_weight={c.item(): float(w) for c, w in zip(classes, weights)})
+
+    #  1. Scaler statistics
+    for bounds in chunks:
+        X, _, held = _read_chunk(input_file, features, bounds, seed)
+        scaler.partial_fit(X[~held])
+
+    #  2. SGD epochs
+    for epoch in range(epochs):
+        with span("train_logistic_regression.fit_epoch", epoch=epoch + 1) as s:
+            n_rows = 0
+            for i in rng.permutation(len(chunks)):
+                X, y, held = _read_chunk(input_file, features, chunks[i], seed)
+                order = rng.permutation(np.flatnonzero(~held))
+                sgd.partial_fit(scaler.transform(X.iloc[order]), y[order], classes=classes)
+                n_rows += len(order)
+            s.rows = n_rows
+        print(f"epoch {epoch + 1}/{epochs} done")
+
+    #  Held-out accuracy
+    correct = total = 0
+    for bounds in chunks:
+        X, y, held = _read_chunk(input_file, features, bounds, seed)
+        if held.any():
+            correct += int((model.predict(X[held]) == y[held]).sum())
+            total += int(held.sum())
+    if total:
+        print(f"held-out accuracy: {correct / total:.4f} ({total} rows)")
+
+    os.makedirs(os.path.dirname(model_file), exist_ok=True)
+    joblib.dump(model, model_file)
+    print("model saved to joblib")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the linear (SGD log-loss) model.")
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--model", default=MODEL_FILE)
+    parser.add_argument("--streaming", action="store_true",
+                        help="train chunk by chunk with partial_fit (bounded memory)")
+    parser.add_argument("--update", action="store_true",
+                        help="streaming: continue training the saved model on --input")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if args.streaming or args.update:
+        train_streaming(args.input, args.model, epochs=args.epochs,
+                        chunk_rows=args.chunk_rows, update=args.update)
+    else:
+        train(args.input, args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,141 +1,123 @@
 import os
-import json
+import sys
 import joblib
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 
 
 #  PATHS
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, ROOT)
 
-ENCODED_CSV = os.path.join(ROOT, "data", "processed", "career_data_encoded.csv")
-LABEL_MAP_JSON = os.path.join(ROOT, "data", "processed", "label_encoding_map.json")
+from src.preprocessing import load_encoded
+from src.label_noise import inject_label_noise
+from src.evaluation import Evaluation, PlotPool, update_report, report_entry, REPORT_FILE
+from src.instrumentation import span
+
+ENCODED_FILE = os.path.join(ROOT, "data", "processed", "career_data_encoded.feather")
 
 MODEL_FILE = os.path.join(ROOT, "models", "rf_model.joblib")
 CM_FILE = os.path.join(ROOT, "reports", "rf_confusion_matrix.png")
-REPORT_FILE = os.path.join(ROOT, "reports", "rf_classification_report.txt")
-
-os.makedirs(os.path.dirname(MODEL_FILE), exist_ok=True)
-os.makedirs(os.path.dirname(CM_FILE), exist_ok=True)
-
-
-
-
-
-
-
-
 
 
-#  LOAD Data
-if not os.path.exists(ENCODED_CSV):
-    print("Error: Encoded data not found.")
-    exit()
+def build_model(n_jobs=-1):
+    return RandomForestClassifier(
+        n_estimators=100,
+        max_depth=8,
+        random_state=42,
+        class_weight="balanced",
+        n_jobs=n_jobs
+    )
 
-df = pd.read_csv(ENCODED_CSV)
 
-with open(LABEL_MAP_JSON, "r") as f:
-    label_map = json.load(f)
+def train(encoded_file=ENCODED_FILE, model_file=MODEL_FILE, cm_file=CM_FILE, report_file=REPORT_FILE):
+    os.makedirs(os.path.dirname(model_file), exist_ok=True)
+    os.makedirs(os.path.dirname(cm_file), exist_ok=True)
+    plots = PlotPool()
 
-print(f"Data Loaded. Shape: {df.shape}")
+    #  LOAD Data
+    if not os.path.exists(encoded_file):
+        print("Error: Encoded data not found.")
+        raise FileNotFoundError(encoded_file)
 
+    # sparse feature columns (multi-hot skills/languages/clubs), memory-mapped
+    with span("train_random_forest.load"):
+        df = load_encoded(encoded_file)
 
-#  Inject Noise (To prevent 99% Fake Accuracy)
-# We add noise to the ENTIRE dataset so both Train AND Test are realistic.
-TARGET_COL = "career_role"
-print("-" * 40)
-print("Injecting 12% noise into the entire dataset...")
+    print(f"Data Loaded. Shape: {df.shape}")
 
-np.random.seed(42) # Keep consistent
 
-# Select 12% of the students to have 'random' careers (Simulating human error)
-n_samples = len(df)
-n_noise = int(0.12 * n_samples) 
-noise_indices = np.random.choice(df.index, n_noise, replace=False)
+    #  Inject Noise (To prevent 99% Fake Accuracy)
+    # We add noise to the ENTIRE dataset so both Train AND Test are realistic.
+    TARGET_COL = "career_role"
+    print("-" * 40)
+    print("Injecting 12% noise into the entire dataset...")
 
-unique_labels = df[TARGET_COL].unique()
+    # Give 12% of the students a 'random' career that is NOT their current one (Simulating human error)
+    rng = np.random.default_rng(42) # Keep consistent
+    clean = df[TARGET_COL]
+    df[TARGET_COL] = inject_label_noise(clean, rate=0.12, rng=rng)
 
-for idx in noise_indices:
-    current_val = df.loc[idx, TARGET_COL]
-    # Pick a random career that is NOT the current one
-    possible_choices = [x for x in unique_labels if x != current_val]
-    df.loc[idx, TARGET_COL] = np.random.choice(possible_choices)
+    n_noise = int((df[TARGET_COL] != clean).sum())
+    print(f"Modified {n_noise} rows to simulate real-world data.")
+    print("-" * 40)
 
-print(f"Modified {n_noise} rows to simulate real-world data.")
-print("-" * 40)
 
+    # SPLIT DATA
+    X = df.drop(columns=[TARGET_COL])
+    y = df[TARGET_COL]
 
-# SPLIT DATA
-X = df.drop(columns=[TARGET_COL])
-y = df[TARGET_COL]
+    # Split: 80% Train, 20% Test
+    with span("train_random_forest.split", rows=len(X)):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
 
-# Split: 80% Train, 20% Test
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
+    print("Data split done")
 
-print("Data split done")
+    # 5. TRAIN RANDOM FOREST
+    print("Training Random Forest...")
 
-# 5. TRAIN RANDOM FOREST
-print("Training Random Forest...")
 
+    rf_model = build_model()
+    with span("train_random_forest.fit", rows=len(X_train)):
+        rf_model.fit(X_train, y_train)
+    print("Training complete")
 
-rf_model = RandomForestClassifier(
-    n_estimators=100,
-    max_depth=8,  
-    random_state=42,
-    class_weight="balanced" 
-)
+    # EVALUATE (each split predicted once, plot drawn in the background)
+    evaluation = Evaluation(rf_model, {"train": (X_train, y_train), "test": (X_test, y_test)})
+    train_acc = evaluation.accuracy("train")
+    test_acc = evaluation.accuracy("test")
 
-rf_model.fit(X_train, y_train)
-print("Training complete")
+    print("\n" + "="*50)
+    print(f"Training accuracy: {train_acc:.4f}")
+    print(f"Test accuracy:     {test_acc:.4f}")
+    print("="*50 + "\n")
 
-# EVALUATE
-train_acc = rf_model.score(X_train, y_train)
-test_acc = rf_model.score(X_test, y_test)
+    # Detailed Report
+    print(evaluation.report("test"))
 
-print("\n" + "="*50)
-print(f"Training accuracy: {train_acc:.4f}")
-print(f"Test accuracy:     {test_acc:.4f}")
-print("="*50 + "\n")
+    # SAVE OUTPUTS
+    plots.confusion_matrix(evaluation, "test", "Confusion Matrix - Random Forest", cm_file)
+    update_report({"random_forest": report_entry(evaluation, "train_random_forest", plot=cm_file)}, report_file)
 
-# Detailed Report
-report = classification_report(y_test, rf_model.predict(X_test))
-print(report)
+    # Save Model
+    with span("train_random_forest.save"):
+        joblib.dump(rf_model, model_file)
+    print("model saved to joblib")
 
+    plots.close()
+    print("confusion matrix saved")
+    return rf_model
 
-# SAVE OUTPUTS
-# Save Report to text file
-with open(REPORT_FILE, "w") as f:
-    f.write(f"Training accuracy: {train_acc:.4f}\n")
-    f.write(f"Test accuracy:     {test_acc:.4f}\n\n")
-    f.write(report)
 
-# Save Confusion Matrix Image
-target_mapping = label_map[TARGET_COL]
-inv_map = {v: k for k, v in target_mapping.items()}
-labels_sorted = [inv_map.get(i, str(i)) for i in sorted(inv_map.keys()) if i in y.unique()]
+def main():
+    train()
 
-plt.figure(figsize=(10, 8))
-cm = confusion_matrix(y_test, rf_model.predict(X_test))
-sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
-            xticklabels=labels_sorted, yticklabels=labels_sorted)
-plt.title("Confusion Matrix - Random Forest")
-plt.xlabel("Predicted")
-plt.ylabel("Actual")
-plt.xticks(rotation=45, ha='right')
-plt.tight_layout()
-plt.savefig(CM_FILE)
-print("confusion matrix saved")
 
-# Save Model
-joblib.dump(rf_model, MODEL_FILE)
-print("model saved to joblib")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,12 @@
-import pandas as pd
-import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 import os
+import sys
 import joblib
+import argparse
 
 from sklearn.model_selection import train_test_split
 from sklearn.svm import SVC
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.linear_model import SGDClassifier
+from sklearn.kernel_approximation import Nystroem, RBFSampler
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
@@ -15,66 +14,126 @@ from sklearn.preprocessing import StandardScaler
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
 
-INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "career_data_encoded.csv")
+from src.preprocessing import load_encoded
+from src.evaluation import Evaluation, PlotPool, update_report, report_entry, REPORT_FILE
+from src.instrumentation import span
+
+INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "career_data_encoded.feather")
 MODEL_FILE = os.path.join(PROJECT_ROOT, "models", "svm_model.joblib")
 PLOT_FILE = os.path.join(PROJECT_ROOT, "reports", "svm_confusion_matrix.png")
 
-os.makedirs(os.path.dirname(MODEL_FILE), exist_ok=True)
-os.makedirs(os.path.dirname(PLOT_FILE), exist_ok=True)
-
-# Load data
-if not os.path.exists(INPUT_FILE):
-    raise FileNotFoundError("Run feature_engineering.py first")
-
-df = pd.read_csv(INPUT_FILE)
-print("Data loaded:", df.shape)
-
-# Define features & target
-leakage_cols = ["career_role", "gpa", "interestarea"]
-X = df.drop(columns=leakage_cols)
-y = df["career_role"]
-
-# Split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# Train model (Scaling required for SVM)
-print("Training SVM...")
-model = Pipeline([
-    ("scaler", StandardScaler()),
-    ("svm", SVC(
-        kernel="rbf",
-        C=5,
-        gamma="scale",
-        class_weight="balanced",
-        random_state=42
-    ))
-])
-
-model.fit(X_train, y_train)
-print("Training complete")
-
-# Evaluate
-y_pred = model.predict(X_test)
-acc = accuracy_score(y_test, y_pred)
-print(f"Accuracy: {acc:.4f}")
-print(classification_report(y_test, y_pred))
-
-# Confusion Matrix
-plt.figure(figsize=(10, 8))
-cm = confusion_matrix(y_test, y_pred)
-labels = np.unique(y)
-
-sns.heatmap(cm, annot=True, fmt="d", cmap="Oranges",
-            xticklabels=labels, yticklabels=labels)
-plt.title("Confusion Matrix - SVM")
-plt.xlabel("Predicted")
-plt.ylabel("Actual")
-plt.savefig(PLOT_FILE)
-plt.close()
-
-# Save model
-joblib.dump(model, MODEL_FILE)
-print("SVM model saved")
+
+BACKENDS = ["exact", "nystroem", "rff"]
+
+# Kernel approximation rank (features fed to the linear classifier)
+DEFAULT_RANK = 300
+
+
+# Scaling required for SVM
+#
+#   exact    - RBF SVC: O(n^2)+ to fit, prediction cost and artifact size
+#              grow with the number of support vectors
+#   nystroem - RBF kernel approximated from `rank` sampled training rows
+#   rff      - RBF kernel approximated with `rank` random Fourier features
+#
+# The approximate backends map rows into `rank` features and fit a linear
+# SVM on them with SGD (hinge loss): a fixed number of passes over the rows,
+# so fit is linear in the rows (LinearSVC's solver was slower than the
+# exact SVC already at 20k rows), prediction and artifact size only depend
+# on the rank.
+def build_model(backend="exact", rank=DEFAULT_RANK):
+    if backend == "exact":
+        return Pipeline([
+            # with_mean=False keeps the input sparse
+            ("scaler", StandardScaler(with_mean=False)),
+            ("svm", SVC(
+                kernel="rbf",
+                C=5,
+                gamma="scale",
+                class_weight="balanced",
+                random_state=42
+            ))
+        ])
+
+    if backend == "nystroem":
+        # gamma defaults to 1 / n_features ("scale" on standardized features)
+        kernel = Nystroem(kernel="rbf", n_components=rank, random_state=42)
+    elif backend == "rff":
+        kernel = RBFSampler(gamma="scale", n_components=rank, random_state=42)
+    else:
+        raise ValueError(f"Unknown SVM backend: {backend} (one of {', '.join(BACKENDS)})")
+
+    return Pipeline([
+        ("scaler", StandardScaler(with_mean=False)),
+        ("kernel", kernel),
+        ("svm", SGDClassifier(loss="hinge", class_weight="balanced", random_state=42))
+    ])
+
+
+def train(input_file=INPUT_FILE, model_file=MODEL_FILE, plot_file=PLOT_FILE, report_file=REPORT_FILE,
+          backend="exact", rank=DEFAULT_RANK):
+    os.makedirs(os.path.dirname(model_file), exist_ok=True)
+    os.makedirs(os.path.dirname(plot_file), exist_ok=True)
+    plots = PlotPool()
+
+    # Load data
+    if not os.path.exists(input_file):
+        raise FileNotFoundError("Run feature_engineering.py first")
+
+    # gpa / interestarea define the target (leakage), so they are not even read
+    leakage_cols = ["gpa", "interestarea"]
+
+    # sparse feature columns (multi-hot skills/languages/clubs), memory-mapped
+    with span("train_svm.load"):
+        df = load_encoded(input_file, exclude=leakage_cols)
+    print("Data loaded:", df.shape)
+
+    # Define features & target
+    X = df.drop(columns=["career_role"])
+    y = df["career_role"]
+
+    # Split
+    with span("train_svm.split", rows=len(X)):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42
+        )
+
+    # Train model
+    print(f"Training SVM ({backend})...")
+    model = build_model(backend, rank)
+
+    with span("train_svm.fit", rows=len(X_train), backend=backend):
+        model.fit(X_train, y_train)
+    print("Training complete")
+
+    # Evaluate (predicted once, plot drawn in the background)
+    evaluation = Evaluation(model, {"test": (X_test, y_test)})
+    print(f"Accuracy: {evaluation.accuracy('test'):.4f}")
+    print(evaluation.report("test"))
+
+    plots.confusion_matrix(evaluation, "test", "Confusion Matrix - SVM", plot_file, cmap="Oranges")
+    update_report({"svm": report_entry(evaluation, "train_svm", plot=plot_file, backend=backend)}, report_file)
+
+    # Save model
+    with span("train_svm.save"):
+        joblib.dump(model, model_file)
+    print("SVM model saved")
+
+    plots.close()
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the SVM model.")
+    parser.add_argument("--backend", choices=BACKENDS, default="exact",
+                        help="exact RBF SVC, or an approximate kernel + linear SVM for large data")
+    parser.add_argument("--rank", type=int, default=DEFAULT_RANK, help="approximation rank (nystroem / rff)")
+    args = parser.parse_args()
+
+    train(backend=args.backend, rank=args.rank)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,143 +1,135 @@
 import os
-import json
+import sys
 import joblib
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from xgboost import XGBClassifier
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, ROOT)
 
-ENCODED_CSV = os.path.join(ROOT, "data", "processed", "career_data_encoded.csv")
-LABEL_MAP_JSON = os.path.join(ROOT, "data", "processed", "label_encoding_map.json")
+from src.preprocessing import load_encoded
+from src.label_noise import inject_label_noise
+from src.evaluation import Evaluation, PlotPool, update_report, report_entry, REPORT_FILE
+from src.instrumentation import span
 
-MODEL_FILE = os.path.join(ROOT, "models", "rf_model.joblib")
-CM_FILE = os.path.join(ROOT, "reports", "rf_confusion_matrix.png")
-REPORT_FILE = os.path.join(ROOT, "reports", "rf_classification_report.txt")
+ENCODED_FILE = os.path.join(ROOT, "data", "processed", "career_data_encoded.feather")
 
-os.makedirs(os.path.dirname(MODEL_FILE), exist_ok=True)
-os.makedirs(os.path.dirname(CM_FILE), exist_ok=True)
+MODEL_FILE = os.path.join(ROOT, "models", "xgboost_model.joblib")
+CM_FILE = os.path.join(ROOT, "reports", "xgb_confusion_matrix.png")
 
 
+def build_model(num_classes, n_jobs=-1):
+    return XGBClassifier(
+        n_estimators=100,
+        max_depth=5,
+        learning_rate=0.1,
+        objective="multi:softmax",
+        num_class=num_classes,
+        eval_metric="mlogloss",
+        use_label_encoder=False,
+        random_state=42,
+        n_jobs=n_jobs
+    )
 
 
+def train(encoded_file=ENCODED_FILE, model_file=MODEL_FILE, cm_file=CM_FILE, report_file=REPORT_FILE):
+    os.makedirs(os.path.dirname(model_file), exist_ok=True)
+    os.makedirs(os.path.dirname(cm_file), exist_ok=True)
+    plots = PlotPool()
 
+    #  LOAD DATA
+    if not os.path.exists(encoded_file):
+        print("Error: Encoded data not found.")
+        raise FileNotFoundError(encoded_file)
 
+    # sparse feature columns (multi-hot skills/languages/clubs), memory-mapped
+    with span("train_xgboost.load"):
+        df = load_encoded(encoded_file)
 
+    print(f"Data Loaded. Shape: {df.shape}")
 
 
-#  LOAD DATA
-if not os.path.exists(ENCODED_CSV):
-    print("Error: Encoded data not found.")
-    exit()
+    #  INJECT NOISE (To prevent 99% Fake Accuracy)
+    TARGET_COL = "career_role"
+    print("-" * 40)
+    print("Injecting 12% noise to simulate real-world data...")
 
-df = pd.read_csv(ENCODED_CSV)
-with open(LABEL_MAP_JSON, "r", encoding="utf-8") as f:
-    label_map = json.load(f)
+    # Flip 12% of rows to a random career that is NOT the current one
+    rng = np.random.default_rng(42)
+    clean = df[TARGET_COL]
+    df[TARGET_COL] = inject_label_noise(clean, rate=0.12, rng=rng)
+    unique_labels = clean.unique()
 
-print(f"Data Loaded. Shape: {df.shape}")
+    n_noise = int((df[TARGET_COL] != clean).sum())
+    print(f"Modified {n_noise} rows.")
+    print("-" * 40)
 
 
-#  INJECT NOISE (To prevent 99% Fake Accuracy)
-TARGET_COL = "career_role"
-print("-" * 40)
-print("Injecting 12% noise to simulate real-world data...")
+    #  Spliting data
+    X = df.drop(columns=[TARGET_COL])
+    y = df[TARGET_COL].astype(int) 
 
-np.random.seed(42) 
+    # Split 80/20
+    with span("train_xgboost.split", rows=len(X)):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
 
-# Select 12% of rows to flip randomly
-n_samples = len(df)
-n_noise = int(0.12 * n_samples)
-noise_indices = np.random.choice(df.index, n_noise, replace=False)
+    # XGBoost densifies pandas sparse columns, so it gets CSR; the names
+    # the app selects columns by are set on the booster after fitting
+    feature_names = list(X.columns)
+    X_train = X_train.sparse.to_coo().tocsr()
+    X_test = X_test.sparse.to_coo().tocsr()
 
-unique_labels = df[TARGET_COL].unique()
 
-for idx in noise_indices:
-    current_val = df.loc[idx, TARGET_COL]
-    # Pick a random career that is NOT the current one
-    possible_choices = [x for x in unique_labels if x != current_val]
-    df.loc[idx, TARGET_COL] = np.random.choice(possible_choices)
+    # 5. TRAIN XGBOOST
+    print("Training XGBoost Model...")
 
-print(f"Modified {n_noise} rows.")
-print("-" * 40)
+    # Safe count of classes
+    num_classes = len(unique_labels)
 
+    xgb = build_model(num_classes)
 
-#  Spliting data
-X = df.drop(columns=[TARGET_COL])
-y = df[TARGET_COL].astype(int) 
+    with span("train_xgboost.fit", rows=X_train.shape[0]):
+        xgb.fit(X_train, y_train)
+    xgb.get_booster().feature_names = feature_names
+    print("Training complete")
 
-# Split 80/20
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
 
+    #  EVALUATE (each split predicted once, plot drawn in the background)
+    evaluation = Evaluation(xgb, {"train": (X_train, y_train), "test": (X_test, y_test)})
+    train_acc = evaluation.accuracy("train")
+    test_acc = evaluation.accuracy("test")
 
-# 5. TRAIN XGBOOST
-print("Training XGBoost Model...")
+    print("\n" + "="*50)
+    print(f"Training accuracy: {train_acc:.4f}")
+    print(f"Test accuracy:     {test_acc:.4f}")
+    print("="*50 + "\n")
 
-# Safe count of classes
-num_classes = len(unique_labels)
+    print(evaluation.report("test"))
 
-xgb = XGBClassifier(
-    n_estimators=100,
-    max_depth=5,           
-    learning_rate=0.1,
-    objective="multi:softmax",
-    num_class=num_classes,
-    eval_metric="mlogloss",
-    use_label_encoder=False,
-    random_state=42
-)
 
-xgb.fit(X_train, y_train)
-print("Training complete")
+    #  SAVE OUTPUTS
+    plots.confusion_matrix(evaluation, "test", "Confusion Matrix - XGBoost", cm_file)
+    update_report({"xgboost": report_entry(evaluation, "train_xgboost", plot=cm_file)}, report_file)
 
+    # Save Model
+    with span("train_xgboost.save"):
+        joblib.dump(xgb, model_file)
+    print(f"Model saved to {model_file}")
 
-#  EVALUATE
-train_acc = xgb.score(X_train, y_train)
-test_acc = xgb.score(X_test, y_test)
+    plots.close()
+    print(f"Confusion matrix saved to {cm_file}")
+    return xgb
 
-print("\n" + "="*50)
-print(f"Training accuracy: {train_acc:.4f}")
-print(f"Test accuracy:     {test_acc:.4f}")
-print("="*50 + "\n")
 
-y_pred = xgb.predict(X_test)
-report = classification_report(y_test, y_pred)
-print(report)
+def main():
+    train()
 
 
-#  SAVE OUTPUTS
-# Save Text Report
-with open(REPORT_FILE, "w") as f:
-    f.write(f"Training accuracy: {train_acc:.4f}\n")
-    f.write(f"Test accuracy:     {test_acc:.4f}\n\n")
-    f.write(report)
-
-# Save Confusion Matrix Image
-target_mapping = label_map[TARGET_COL]
-inv_map = {v: k for k, v in target_mapping.items()}
-# Get sorted labels
-labels_sorted = [inv_map.get(i, str(i)) for i in sorted(inv_map.keys()) if i in y.unique()]
-
-plt.figure(figsize=(10, 8))
-cm = confusion_matrix(y_test, y_pred)
-sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
-            xticklabels=labels_sorted, yticklabels=labels_sorted)
-plt.xlabel("Predicted")
-plt.ylabel("Actual")
-plt.title("Confusion Matrix - XGBoost")
-plt.xticks(rotation=45, ha='right')
-plt.tight_layout()
-plt.savefig(CM_FILE)
-print(f"Confusion matrix saved to {CM_FILE}")
-
-# Save Model
-joblib.dump(xgb, MODEL_FILE)
-print(f"Model saved to {MODEL_FILE}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+import os
+import sys
+import json
+import math
+import time
+import sqlite3
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocessing import load_encoded
+from src.pipeline import file_hash, source_closure
+from src.instrumentation import span
+from src.models.train_all import (
+    MODELS, ENCODED_FILE, TUNED_PARAMS_FILE, split_encoded, make_model, feature_subset,
+    to_shared, attach_shared, share_csr, csr_from_shared, load_tuned_params,
+)
+
+TRIALS_DB = os.path.join(PROJECT_ROOT, "data", "tuning", "trials.sqlite")
+
+# Values tried per hyperparameter (keys as accepted by model.set_params)
+SEARCH_SPACES = {
+    "decision_tree": {
+        "max_depth": [4, 6, 8, 10, 12, None],
+        "min_samples_leaf": [1, 2, 5, 10, 20],
+        "criterion": ["gini", "entropy"],
+    },
+    "logistic_regression": {
+        "sgd__alpha": [1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 1e-2],
+        "sgd__penalty": ["l2", "l1", "elasticnet"],
+    },
+    "random_forest": {
+        "n_estimators": [50, 100, 200, 300],
+        "max_depth": [6, 8, 10, 12, None],
+        "min_samples_leaf": [1, 2, 5],
+        "max_features": ["sqrt", "log2", 0.5],
+    },
+    "svm": {
+        "svm__C": [0.1, 0.3, 1, 3, 5, 10, 30, 100],
+        "svm__gamma": ["scale", 0.003, 0.01, 0.03, 0.1],
+    },
+    "xgboost": {
+        "n_estimators": [100, 200, 300],
+        "max_depth": [3, 4, 5, 6, 8],
+        "learning_rate": [0.03, 0.05, 0.1, 0.2, 0.3],
+        "subsample": [0.7, 0.85, 1.0],
+        "colsample_bytree": [0.7, 0.85, 1.0],
+    },
+}
+
+# part of the training split held out to score trials (the test split of
+# train_all.py is never seen by the search)
+VALIDATION_SIZE = 0.2
+
+
+#  Trial store
+# One row per evaluated (model, params, rows, data, code) combination. A
+# trial is looked up before it is run, so a re-run of an interrupted search
+# only evaluates what is missing, and any later search reuses earlier
+# results. A changed trainer (e.g. new build_model defaults) gets a new
+# code hash, so its old scores are not reused.
+class TrialStore:
+
+    def __init__(self, path=TRIALS_DB):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS trials (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                params TEXT NOT NULL,
+                rows INTEGER NOT NULL,
+                data_hash TEXT NOT NULL,
+                code_hash TEXT,
+                score REAL,
+                fit_s REAL,
+                error TEXT,
+                created REAL NOT NULL
+            )
+        """)
+        # stores from before code_hash existed: their trials never match
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(trials)")]
+        if "code_hash" not in columns:
+            self.conn.execute("ALTER TABLE trials ADD COLUMN code_hash TEXT")
+        self.conn.commit()
+
+    @staticmethod
+    def key(model, params, rows, data_hash, code_hash):
+        payload = json.dumps([model, params, rows, data_hash, code_hash], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key):
+        row = self.conn.execute("SELECT score, fit_s, error FROM trials WHERE key = ?", (key,)).fetchone()
+        return None if row is None else {"score": row[0], "fit_s": row[1], "error": row[2]}
+
+    def put(self, key, model, params, rows, data_hash, code_hash, score=None, fit_s=None, error=None):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO trials (key, model, params, rows, data_hash, code_hash, score, fit_s, error, created) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, model, json.dumps(params, sort_keys=True), rows, data_hash, code_hash, score, fit_s, error,
+             time.time())
+        )
+        self.conn.commit()
+
+    # best full-budget result per model for this data and code
+    def best(self, model, data_hash, code_hash, rows):
+        row = self.conn.execute(
+            "SELECT params, score FROM trials WHERE model = ? AND data_hash = ? AND code_hash = ? AND rows = ? "
+            "AND score IS NOT NULL ORDER BY score DESC, fit_s ASC LIMIT 1",
+            (model, data_hash, code_hash, rows)
+        ).fetchone()
+        return None if row is None else (json.loads(row[0]), row[1])
+
+    def close(self):
+        self.conn.close()
+
+
+# Hash of the code a trial's score depends on: the model's trainer module
+# (build_model and its defaults), this search and every src module they import
+def code_hash(name):
+    trainer = os.path.join(PROJECT_ROOT, *MODELS[name][0].split(".")) + ".py"
+    h = hashlib.sha256()
+    for path in source_closure([trainer, os.path.abspath(__file__)]):
+        h.update(os.path.relpath(path, PROJECT_ROOT).encode())
+        h.update(file_hash(path).encode())
+    return h.hexdigest()
+
+
+#  Configurations
+def sample_configs(space, n, rng):
+    configs, seen = [], set()
+    # the space can be smaller than n
+    for _ in range(n * 20):
+        config = {name: _plain(values[rng.integers(len(values))]) for name, values in space.items()}
+        key = json.dumps(config, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+        if len(configs) == n:
+            break
+    return configs
+
+
+# numpy scalars -> Python values, so params are JSON- and set_params-friendly
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+#  Worker
+# Fits on the first `rows` rows of the (shuffled) search-train split and
+# returns validation accuracy
+def _run_trial(name, params, rows, specs, feature_names):
+    blocks, arrays = attach_shared(specs)
+    try:
+        n_cols = len(feature_names)
+        X_fit = csr_from_shared(arrays, "fit", n_cols)[:rows]
+        X_val = csr_from_shared(arrays, "val", n_cols)
+        y_fit, y_val = arrays["y_fit"][:rows], arrays["y_val"]
+
+        keep = feature_subset(name, feature_names)
+        if len(keep) < n_cols:
+            X_fit, X_val = X_fit[:, keep], X_val[:, keep]
+
+        # one thread per trial, trials run side by side
+        model = make_model(name, int(arrays["n_classes"][0]), n_jobs=1, params=params)
+
+        start = time.perf_counter()
+        with span("tune.fit", rows=rows, model=name):
+            model.fit(X_fit, y_fit)
+        fit_s = time.perf_counter() - start
+
+        return float(np.mean(model.predict(X_val) == y_val)), fit_s
+    finally:
+        X_fit = X_val = y_fit = y_val = arrays = None
+        for shm in blocks:
+            shm.close()
+
+
+#  Search
+class Search:
+
+    def __init__(self, specs, feature_names, n_rows, data_hash, store, pool):
+        self.specs = specs
+        self.feature_names = feature_names
+        self.n_rows = n_rows
+        self.data_hash = data_hash
+        self.store = store
+        self.pool = pool
+        self.code_hashes = {}
+        self.evaluated = 0
+        self.reused = 0
+
+    def code_hash(self, name):
+        if name not in self.code_hashes:
+            self.code_hashes[name] = code_hash(name)
+        return self.code_hashes[name]
+
+    # -> [score] in config order; stored trials are not run again
+    def evaluate(self, name, configs, rows):
+        scores = [None] * len(configs)
+        futures = {}
+        code = self.code_hash(name)
+        for i, params in enumerate(configs):
+            key = TrialStore.key(name, params, rows, self.data_hash, code)
+            done = self.store.get(key)
+            if done is not None:
+                scores[i] = done["score"]
+                self.reused += 1
+            else:
+                future = self.pool.submit(_run_trial, name, params, rows, self.specs, self.feature_names)
+                futures[future] = (i, key, params)
+
+        for future in as_completed(futures):
+            i, key, params = futures[future]
+            try:
+                scores[i], fit_s = future.result()
+                self.store.put(key, name, params, rows, self.data_hash, code, score=scores[i], fit_s=fit_s)
+            except ImportError as e:
+                # missing library, not a bad config: not stored, tried again next time
+                print(f"   {name}: skipped ({e})")
+            except Exception as e:
+                self.store.put(key, name, params, rows, self.data_hash, code, error=repr(e))
+            self.evaluated += 1
+        return scores
+
+    # Successive halving: every config on the first budget, the best 1/eta
+    # go on to the next (eta times more rows), the last budget is all rows.
+    def successive_halving(self, name, configs, budgets, eta):
+        for rows in budgets:
+            scores = self.evaluate(name, configs, rows)
+            ranked = sorted(((s, i) for i, s in enumerate(scores) if s is not None), reverse=True)
+            if not ranked:
+                print(f"   {name}: every trial failed at {rows} rows")
+                return
+            print(f"   {name}: {len(configs):>3} configs x {rows:>7} rows, best {ranked[0][0]:.4f}")
+            configs = [configs[i] for _, i in ranked[:max(1, len(configs) // eta)]]
+
+    # Hyperband: successive halving brackets from aggressive (many configs,
+    # few rows) to none (few configs, all rows), so a bad min_rows guess
+    # can't discard every slow starter.
+    def hyperband(self, name, min_rows, eta=3, seed=42):
+        s_max = max(0, int(math.log(self.n_rows / min_rows, eta) + 1e-9))
+        for s in range(s_max, -1, -1):
+            n_configs = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+            budgets = [max(1, int(self.n_rows / eta ** (s - i))) for i in range(s + 1)]
+            # seeded per bracket: a resumed search proposes the same configs
+            rng = np.random.default_rng([seed, s])
+            configs = sample_configs(SEARCH_SPACES[name], n_configs, rng)
+            print(f" bracket {s}: {len(configs)} configs from {budgets[0]} rows")
+            self.successive_halving(name, configs, budgets, eta)
+
+        return self.store.best(name, self.data_hash, self.code_hash(name), self.n_rows)
+
+
+def tune(names=None, encoded_file=ENCODED_FILE, min_rows=None, eta=3, jobs=None, seed=42,
+         trials_db=TRIALS_DB, params_file=TUNED_PARAMS_FILE):
+    names = names or list(SEARCH_SPACES)
+    unknown = set(names) - set(SEARCH_SPACES)
+    if unknown:
+        raise ValueError(f"Unknown model(s): {', '.join(sorted(unknown))}")
+
+    #  Same split as train_all.py; the search only sees its training part
+    df = load_encoded(encoded_file)
+    X_train, _, y_train, _ = split_encoded(df)
+    # fixed seeds (not --seed): stored trials are only comparable on the same rows
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=VALIDATION_SIZE, random_state=42, stratify=y_train
+    )
+    # shuffled once, so the first n rows of X_fit are a random subset for every budget
+    order = np.random.default_rng(42).permutation(len(X_fit))
+    feature_names = [str(c) for c in X_fit.columns]
+    X_fit = X_fit.sparse.to_coo().tocsr()[order]
+    X_val = X_val.sparse.to_coo().tocsr()
+    y_fit, y_val = y_fit.to_numpy()[order], y_val.to_numpy()
+
+    n_rows = X_fit.shape[0]
+    min_rows = min_rows or max(n_rows // 27, 50)
+    data_hash = file_hash(encoded_file)
+
+    arrays = {**share_csr("fit", X_fit), **share_csr("val", X_val), "y_fit": y_fit, "y_val": y_val,
+              "n_classes": np.array([len(np.unique(y_train))])}
+    blocks, specs = to_shared(arrays)
+    store = TrialStore(trials_db)
+
+    best = load_tuned_params(params_file)
+    report = {}
+    try:
+        with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            search = Search(specs, feature_names, n_rows, data_hash, store, pool)
+            for name in names:
+                print(f"{name}: hyperband over {n_rows} rows (min {min_rows}, eta {eta})")
+                result = search.hyperband(name, min_rows, eta, seed)
+                if result is not None:
+                    best[name], report[name] = result[0], result[1]
+            print(f"\n{search.evaluated} trials run, {search.reused} reused from {trials_db}")
+    finally:
+        store.close()
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    os.makedirs(os.path.dirname(params_file), exist_ok=True)
+    with open(params_file, "w") as f:
+        json.dump(best, f, indent=2)
+
+    for name, score in report.items():
+        print(f" - {name}: validation accuracy {score:.4f} with {best[name]}")
+    print(f"Saved to {params_file} (python -m src.models.train_all --tuned uses them)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hyperband search over the trainers' hyperparameters.")
+    parser.add_argument("models", nargs="*", help=f"models to tune (default: all of {', '.join(SEARCH_SPACES)})")
+    parser.add_argument("--min-rows", type=int, default=None, help="smallest training budget (default: rows / 27)")
+    parser.add_argument("--eta", type=int, default=3, help="keep 1/eta of the configs per round")
+    parser.add_argument("--jobs", type=int, default=None, help="trials evaluated in parallel (default: all cores)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=TRIALS_DB)
+    args = parser.parse_args()
+
+    tune(args.models, min_rows=args.min_rows, eta=args.eta, jobs=args.jobs, seed=args.seed, trials_db=args.db)
+
+
+if __name__ == "__main__":
+    main()
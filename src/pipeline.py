@@ -0,0 +1,353 @@
+import os
+import sys
+import ast
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import importlib
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from src.instrumentation import span
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+CACHE_DIR = os.path.join(PROJECT_ROOT, ".pipeline_cache")
+
+
+def _path(*parts):
+    return os.path.join(PROJECT_ROOT, *parts)
+
+
+RAW_DATA = _path("data", "raw", "career_data.csv")
+RULES = _path("data", "career_rules.csv")
+CLEANED = _path("data", "processed", "career_data_cleaned.feather")
+ENCODED = _path("data", "processed", "career_data_encoded.feather")
+LABEL_MAP = _path("data", "processed", "label_encoding_map.json")
+PREPROCESSOR = _path("data", "models", "preprocessor.joblib")
+PLOTS_DIR = _path("visualizations")
+REPORT = _path("reports", "evaluation.json")
+
+
+# One step of the pipeline. func is "module:function" so it can be
+# imported inside a worker process; code lists the source files whose
+# content, and that of every src module they import (source_closure), is
+# part of the cache key.
+class Stage:
+
+    def __init__(self, name, func, inputs, outputs, code, kwargs=None, optional=False):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.outputs = outputs
+        self.code = code
+        self.kwargs = kwargs or {}
+        self.optional = optional
+
+
+# Each trainer writes its evaluation to its own part file; the "report"
+# stage owns reports/evaluation.json and merges the parts into it, so no
+# two stages write the same file.
+def _report_part(short):
+    return _path("reports", "evaluation", f"{short}.json")
+
+
+def _trainer(name, short, outputs, optional=False):
+    return Stage(
+        f"train_{name}",
+        f"src.models.train_{name}:train",
+        # every trainer names the classes in its report from LABEL_MAP
+        inputs=[ENCODED, LABEL_MAP],
+        outputs=outputs + [_report_part(short)],
+        code=[_path("src", "models", f"train_{name}.py")],
+        kwargs={"report_file": _report_part(short)},
+        optional=optional,
+    )
+
+
+TRAINER_SHORT = ["dt", "lr", "rf", "svm", "xgb"]
+
+
+STAGES = [
+    Stage(
+        "clean", "src.data_cleaning:clean_file",
+        inputs=[RAW_DATA], outputs=[CLEANED],
+        code=[_path("src", "data_cleaning.py")],
+    ),
+    Stage(
+        "encode", "src.feature_engineering:encode_file",
+        inputs=[CLEANED, RULES], outputs=[ENCODED, LABEL_MAP, PREPROCESSOR],
+        code=[_path("src", "feature_engineering.py")],
+    ),
+    Stage(
+        "eda", "src.eda:run",
+        inputs=[CLEANED],
+        outputs=[os.path.join(PLOTS_DIR, name) for name in [
+            "correlation_matrix.png", "gpa_distribution.png", "gender_distribution.png",
+            "subjects_distribution.png", "top_skills.png", "activities_distribution.png",
+            "skills_vs_activities.png",
+        ]],
+        code=[_path("src", "eda.py")],
+        kwargs={"output_dir": PLOTS_DIR},
+    ),
+    _trainer("decision_tree", "dt", [_path("models", "decision_tree_model.joblib"),
+                                     _path("reports", "dt_confusion_matrix.png")]),
+    _trainer("logistic_regression", "lr", [_path("models", "logistic_regression_model.joblib"),
+                                           _path("reports", "lr_confusion_matrix.png")]),
+    _trainer("random_forest", "rf", [_path("models", "rf_model.joblib"),
+                                     _path("reports", "rf_confusion_matrix.png")]),
+    _trainer("svm", "svm", [_path("models", "svm_model.joblib"),
+                            _path("reports", "svm_confusion_matrix.png")]),
+    _trainer("xgboost", "xgb", [_path("models", "xgboost_model.joblib"),
+                                _path("reports", "xgb_confusion_matrix.png")],
+             optional=True),
+    Stage(
+        "report", "src.evaluation:merge_reports",
+        inputs=[_report_part(short) for short in TRAINER_SHORT], outputs=[REPORT],
+        code=[_path("src", "evaluation.py")],
+        kwargs={"parts": [_report_part(short) for short in TRAINER_SHORT], "path": REPORT},
+    ),
+]
+
+
+#  Hashing
+# The given source files plus every src module they import, directly or
+# through other src modules (imports inside functions included), sorted
+def source_closure(paths):
+    seen = set()
+    stack = list(paths)
+    while stack:
+        path = stack.pop()
+        if path in seen or not os.path.exists(path):
+            continue
+        seen.add(path)
+
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # "from src import inference" imports the module src.inference
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                parts = name.split(".")
+                if parts[0] == "src" and len(parts) > 1:
+                    stack.append(_path(*parts) + ".py")
+    return sorted(seen)
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def stage_key(stage):
+    h = hashlib.sha256()
+    h.update(stage.name.encode())
+    h.update(stage.func.encode())
+    h.update(json.dumps(stage.kwargs, sort_keys=True).encode())
+    for path in source_closure(stage.code) + stage.inputs:
+        h.update(os.path.relpath(path, PROJECT_ROOT).encode())
+        # an input of a skipped optional stage may not exist
+        h.update(file_hash(path).encode() if os.path.exists(path) else b"missing")
+    return h.hexdigest()
+
+
+#  Cache: content-addressed copies of stage outputs
+def _entry_file(stage, key):
+    return os.path.join(CACHE_DIR, "stages", stage.name, f"{key}.json")
+
+
+def _object_file(digest):
+    return os.path.join(CACHE_DIR, "objects", digest[:2], digest)
+
+
+def restore_from_cache(stage, key):
+    entry_file = _entry_file(stage, key)
+    if not os.path.exists(entry_file):
+        return False
+
+    with open(entry_file, "r") as f:
+        outputs = json.load(f)
+    if not all(os.path.exists(_object_file(d)) for d in outputs.values()):
+        return False
+
+    for rel_path, digest in outputs.items():
+        path = os.path.join(PROJECT_ROOT, rel_path)
+        if not os.path.exists(path) or file_hash(path) != digest:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            shutil.copyfile(_object_file(digest), path)
+    return True
+
+
+def save_to_cache(stage, key):
+    outputs = {}
+    for path in stage.outputs:
+        digest = file_hash(path)
+        obj = _object_file(digest)
+        if not os.path.exists(obj):
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            shutil.copyfile(path, obj)
+        outputs[os.path.relpath(path, PROJECT_ROOT)] = digest
+
+    entry_file = _entry_file(stage, key)
+    os.makedirs(os.path.dirname(entry_file), exist_ok=True)
+    with open(entry_file, "w") as f:
+        json.dump(outputs, f, indent=2)
+
+
+#  Worker
+# Runs one stage in a worker process, its prints go to a log file
+def _run_stage(func, kwargs, log_file):
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    module_name, func_name = func.split(":")
+    with open(log_file, "w") as log, contextlib.redirect_stdout(log):
+        with span(f"pipeline.{module_name.rsplit('.', 1)[-1]}"):
+            getattr(importlib.import_module(module_name), func_name)(**kwargs)
+
+    return time.perf_counter() - start, time.process_time() - cpu_start
+
+
+#  DAG
+def dependencies(stages):
+    producers = {out: s.name for s in stages for out in s.outputs}
+    return {
+        s.name: {producers[i] for i in s.inputs if i in producers and producers[i] != s.name}
+        for s in stages
+    }
+
+
+def select_stages(names):
+    if not names:
+        return STAGES
+    unknown = set(names) - {s.name for s in STAGES}
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+    return [s for s in STAGES if s.name in names]
+
+
+def run(stage_names=None, jobs=None, force=False):
+    stages = select_stages(stage_names)
+    deps = dependencies(stages)
+    by_name = {s.name: s for s in stages}
+
+    # trainers import pyplot; never open windows from worker processes
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+    results = {}
+    pending = dict(by_name)
+    running = {}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        while pending or running:
+            # submit every stage whose dependencies are finished
+            for name in list(pending):
+                if not deps[name] <= set(results):
+                    continue
+                stage = pending.pop(name)
+
+                # a skipped optional stage (xgboost not installed) blocks nothing,
+                # its outputs are simply absent
+                failed_deps = [d for d in deps[name] if results[d]["status"] not in ("ran", "cached", "skipped")]
+                if failed_deps:
+                    results[name] = {"status": "blocked", "wall_s": 0.0, "cpu_s": 0.0}
+                    continue
+
+                absent = {out for d in deps[name] if results[d]["status"] == "skipped"
+                          for out in by_name[d].outputs}
+                missing = [i for i in stage.inputs if not os.path.exists(i) and i not in absent]
+                if missing:
+                    results[name] = {"status": "failed", "wall_s": 0.0, "cpu_s": 0.0,
+                                     "error": f"missing input: {missing[0]}"}
+                    continue
+
+                key = stage_key(stage)
+                if not force and restore_from_cache(stage, key):
+                    results[name] = {"status": "cached", "wall_s": 0.0, "cpu_s": 0.0}
+                    continue
+
+                log_file = os.path.join(CACHE_DIR, "logs", f"{name}.log")
+                future = pool.submit(_run_stage, stage.func, stage.kwargs, log_file)
+                running[future] = (stage, key)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, key = running.pop(future)
+                try:
+                    wall_s, cpu_s = future.result()
+                except ImportError as e:
+                    status = "skipped" if stage.optional else "failed"
+                    results[stage.name] = {"status": status, "wall_s": 0.0, "cpu_s": 0.0, "error": str(e)}
+                    continue
+                except Exception as e:
+                    results[stage.name] = {"status": "failed", "wall_s": 0.0, "cpu_s": 0.0, "error": repr(e)}
+                    continue
+
+                save_to_cache(stage, key)
+                results[stage.name] = {"status": "ran", "wall_s": wall_s, "cpu_s": cpu_s}
+
+    total = time.perf_counter() - start
+    ordered = {s.name: results[s.name] for s in stages}
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, "last_run.json"), "w") as f:
+        json.dump({"total_wall_s": total, "stages": ordered}, f, indent=2)
+
+    return ordered, total
+
+
+def print_report(results, total):
+    print(f"{'stage':<28} {'status':<9} {'wall (s)':>9} {'cpu (s)':>9}")
+    print("-" * 58)
+    for name, r in results.items():
+        print(f"{name:<28} {r['status']:<9} {r['wall_s']:>9.2f} {r['cpu_s']:>9.2f}")
+        if "error" in r:
+            print(f"    {r['error']}")
+    print("-" * 58)
+    hits = sum(r["status"] == "cached" for r in results.values())
+    print(f"cache hits: {hits}/{len(results)}   total wall time: {total:.2f}s")
+    print(f"stage logs: {os.path.join(CACHE_DIR, 'logs')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data / training pipeline with caching.")
+    parser.add_argument("stages", nargs="*", help="stages to run (default: all)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="ignore the cache")
+    parser.add_argument("--list", action="store_true", help="list stages and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        deps = dependencies(STAGES)
+        for s in STAGES:
+            after = ", ".join(sorted(deps[s.name])) or "-"
+            print(f"{s.name:<28} after: {after}")
+        return
+
+    results, total = run(args.stages, jobs=args.jobs, force=args.force)
+    print_report(results, total)
+
+    if any(r["status"] in ("failed", "blocked") for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
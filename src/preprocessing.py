@@ -0,0 +1,273 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.data_cleaning import clean_chunk
+from src.data_io import write_frame, read_frame, frame_columns
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+PREPROCESSOR_FILE = os.path.join(PROJECT_ROOT, "data", "models", "preprocessor.joblib")
+ENCODED_FILE = os.path.join(PROJECT_ROOT, "data", "processed", "career_data_encoded.feather")
+
+# Bump when the transform changes in a way old artifacts can't reproduce
+PREPROCESSOR_VERSION = 3
+
+# Columns holding comma-separated lists ("Leadership, Problem Solving, ...")
+MULTI_VALUED_COLS = ["skills", "languages", "clubmemberships"]
+
+# Filled with random values by data_cleaning.add_gender (missing from the raw
+# data), so never a model input
+SIMULATED_COLS = ["gender"]
+
+
+# Tokenizing multi-hot encoder: one column per vocabulary token, so the
+# width grows with the vocabulary, not with every combination/ordering.
+# Output is a CSR matrix; tokens not seen in fit() are ignored.
+class MultiHotEncoder:
+
+    def __init__(self, sep=","):
+        self.sep = sep
+        self.vocabulary_ = []
+
+    def _tokens(self, values):
+        tokens = pd.Series(values).astype(str).str.split(self.sep).explode().str.strip()
+        return tokens[tokens != ""]
+
+    def fit(self, values):
+        self.vocabulary_ = sorted(self._tokens(values).unique())
+        self._build_index()
+        return self
+
+    def _build_index(self):
+        self._index = {token: i for i, token in enumerate(self.vocabulary_)}
+
+    # Each distinct cell is tokenized once and its row copied to every student
+    # with that cell (the same few combinations repeat across a cohort)
+    def transform(self, values):
+        codes, uniques = pd.factorize(pd.Series(values).astype(str))
+        return self.transform_list(uniques)[codes]
+
+    # Plain-Python path, no pandas overhead. A token listed twice in one cell
+    # is still a single 1
+    def transform_list(self, values):
+        rows, cols = [], []
+        for i, value in enumerate(values):
+            found = sorted({
+                self._index[t.strip()] for t in str(value).split(self.sep)
+                if t.strip() in self._index
+            })
+            rows += [i] * len(found)
+            cols += found
+        return sp.csr_matrix(
+            (np.ones(len(cols)), (np.asarray(rows, dtype=np.int32), np.asarray(cols, dtype=np.int32))),
+            shape=(len(values), len(self.vocabulary_))
+        )
+
+    def transform_one(self, value):
+        return self.transform_list([value])
+
+    def get_feature_names_out(self, prefix):
+        return [f"{prefix}_{token}" for token in self.vocabulary_]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_index", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_index()
+
+
+# Cleaning + label encoding + scaling + multi-hot lists, fitted once in
+# feature_engineering.py and saved next to the model. transform() works on a
+# single record (dict), a list of records or a batch (DataFrame) and never
+# needs the training CSV.
+#
+# Output layout: scaled single-valued columns first, then one 0/1 column
+# per token of each multi-valued column. The result stays sparse.
+class CareerPreprocessor:
+
+    def __init__(self):
+        self.version = PREPROCESSOR_VERSION
+        self.dense_features_ = []
+        self.feature_names_ = []
+        self.categories_ = {}
+        self.multi_hot_ = {}
+        self.scaler_ = None
+        self.target_classes_ = []
+
+    #  Fit
+    def fit(self, X, y=None):
+        X = clean_chunk(X.copy())
+        self.dense_features_ = [c for c in X.columns if c not in MULTI_VALUED_COLS + SIMULATED_COLS]
+
+        categorical_cols = X[self.dense_features_].select_dtypes(include=["object", "category"]).columns
+        self.categories_ = {
+            col: [str(c) for c in np.unique(X[col].astype(str))]
+            for col in categorical_cols
+        }
+        self._build_index()
+
+        self.multi_hot_ = {
+            col: MultiHotEncoder().fit(X[col])
+            for col in MULTI_VALUED_COLS if col in X.columns
+        }
+
+        self.feature_names_ = list(self.dense_features_)
+        for col, encoder in self.multi_hot_.items():
+            self.feature_names_ += encoder.get_feature_names_out(col)
+
+        # only fitting needs sklearn; a loaded artifact imports it when unpickled
+        from sklearn.preprocessing import StandardScaler
+
+        self.scaler_ = StandardScaler()
+        self.scaler_.fit(self._encode_frame(X))
+
+        if y is not None:
+            self.target_classes_ = [str(c) for c in np.unique(y.astype(str))]
+        return self
+
+    def _build_index(self):
+        # value -> code lookups for the single-record fast path
+        self._index = {
+            col: {cat: code for code, cat in enumerate(cats)}
+            for col, cats in self.categories_.items()
+        }
+
+    #  Transform
+    def _encode_frame(self, X):
+        encoded = np.empty((len(X), len(self.dense_features_)), dtype=np.float64)
+        for j, col in enumerate(self.dense_features_):
+            if col in self.categories_:
+                # unseen categories get -1
+                encoded[:, j] = pd.Categorical(
+                    X[col].astype(str).str.strip(), categories=self.categories_[col]
+                ).codes
+            else:
+                encoded[:, j] = X[col].to_numpy(dtype=np.float64)
+        return encoded
+
+    def _encode_records(self, records):
+        encoded = np.empty((len(records), len(self.dense_features_)), dtype=np.float64)
+        for i, record in enumerate(records):
+            for j, col in enumerate(self.dense_features_):
+                value = record[col]
+                if col in self._index:
+                    encoded[i, j] = self._index[col].get(str(value).strip(), -1)
+                else:
+                    encoded[i, j] = float(value)
+        return encoded
+
+    # -> CSR matrix with columns in feature_names_ order
+    def transform_sparse(self, X):
+        if isinstance(X, dict):
+            X = [X]
+        if isinstance(X, list):
+            records = [{k.lower().strip().replace(" ", "_"): v for k, v in r.items()} for r in X]
+            dense = self._encode_records(records)
+            multi = [enc.transform_list([r[col] for r in records]) for col, enc in self.multi_hot_.items()]
+        else:
+            X = clean_chunk(X.copy())
+            dense = self._encode_frame(X)
+            multi = [enc.transform(X[col]) for col, enc in self.multi_hot_.items()]
+
+        dense = sp.csr_matrix(self.scaler_.transform(dense))
+        return sp.hstack([dense] + multi, format="csr")
+
+    # -> DataFrame with sparse columns, so sklearn keeps the feature names
+    # and still receives a sparse matrix
+    def transform(self, X):
+        return pd.DataFrame.sparse.from_spmatrix(self.transform_sparse(X), columns=self.feature_names_)
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X, y).transform(X)
+
+    #  Target
+    def encode_target(self, y):
+        return pd.Categorical(y.astype(str), categories=self.target_classes_).codes.astype(int)
+
+    def decode_target(self, codes):
+        classes = np.asarray(self.target_classes_, dtype=object)
+        return classes[np.asarray(codes, dtype=int)]
+
+    # Same layout as label_encoding_map.json
+    # (multi-valued columns map each token to its position in the vocabulary)
+    def label_maps(self, target_col="career_role"):
+        maps = {
+            col: {cat: code for code, cat in enumerate(cats)}
+            for col, cats in self.categories_.items()
+        }
+        for col, encoder in self.multi_hot_.items():
+            maps[col] = {token: code for code, token in enumerate(encoder.vocabulary_)}
+        maps[target_col] = {cat: code for code, cat in enumerate(self.target_classes_)}
+        return maps
+
+    #  Persistence
+    def save(self, path=PREPROCESSOR_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path=PREPROCESSOR_FILE):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found. Run feature_engineering.py first")
+
+        preprocessor = joblib.load(path)
+        if getattr(preprocessor, "version", None) != PREPROCESSOR_VERSION:
+            raise ValueError(
+                f"Preprocessor artifact version {getattr(preprocessor, 'version', None)} "
+                f"does not match {PREPROCESSOR_VERSION}. Re-run feature_engineering.py"
+            )
+        return preprocessor
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_index", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_index()
+
+
+#  Encoded dataset
+# Stored columnar (one column per feature, 0/1 multi-hot columns as uint8),
+# so trainers can memory-map the file and read only the columns they need.
+def save_encoded(X, y, feature_names, path=ENCODED_FILE, target_col="career_role", binary_cols=()):
+    X = X.tocsc()
+    binary_cols = set(binary_cols)
+
+    columns = {}
+    for j, name in enumerate(feature_names):
+        dtype = np.uint8 if name in binary_cols else np.float64
+        col = np.zeros(X.shape[0], dtype=dtype)
+        start, end = X.indptr[j], X.indptr[j + 1]
+        col[X.indices[start:end]] = X.data[start:end]
+        columns[name] = col
+    columns[target_col] = np.asarray(y)
+
+    write_frame(pd.DataFrame(columns), path)
+
+
+# -> DataFrame with sparse feature columns and a dense target column.
+# columns / exclude pick the features to read, the target is always included.
+# rows: (start, stop) to read one chunk (see train_logistic_regression.py)
+def load_encoded(path=ENCODED_FILE, columns=None, exclude=(), target_col="career_role", rows=None):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found. Run feature_engineering.py first")
+
+    names = columns or [c for c in frame_columns(path) if c != target_col]
+    names = [c for c in names if c not in exclude and c != target_col]
+
+    df = read_frame(path, columns=names + [target_col], rows=rows)
+    for col in names:
+        df[col] = pd.arrays.SparseArray(df[col].to_numpy(dtype=np.float64), fill_value=0.0)
+    return df
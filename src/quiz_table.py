@@ -0,0 +1,144 @@
+import os
+import time
+import hashlib
+import argparse
+import itertools
+
+import numpy as np
+
+from src import inference
+from src.instrumentation import span
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+TABLE_FILE = os.path.join(PROJECT_ROOT, "data", "models", "quiz_table.npz")
+
+# The whole answer space of the quiz, in quiz_to_record() argument order
+QUIZ_AXES = [
+    inference.ENV_OPTIONS,
+    list(range(11)),  # Q2 problem solving slider
+    inference.ACTIVITY_OPTIONS,
+    list(range(11)),  # Q4 communication slider
+    list(inference.QUIZ_LANGUAGES),
+]
+
+
+#  Artifact hashes
+# The table is only valid for the exact model + preprocessor it was built from
+def artifact_hash(*paths):
+    h = hashlib.sha256()
+    for path in paths:
+        # a compiled forest is a directory of files
+        files = [os.path.join(path, f) for f in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+        for file in files:
+            h.update(os.path.basename(file).encode())
+            with open(file, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+    return h.hexdigest()
+
+
+# Every cell of the answer grid, scored once. Per cell the careers are stored
+# ranked best first, with their scores (0-100), so a click is an array lookup.
+class QuizTable:
+
+    def __init__(self, ranking, scores, careers, source_hash):
+        self.ranking = ranking
+        self.scores = scores
+        self.careers = np.asarray(careers, dtype=object)
+        self.source_hash = source_hash
+        self._index = [{value: i for i, value in enumerate(axis)} for axis in QUIZ_AXES]
+        self._shape = tuple(len(axis) for axis in QUIZ_AXES)
+
+    #  Build
+    @classmethod
+    def build(cls, model, preprocessor, source_hash=""):
+        records = [inference.quiz_to_record(*answers) for answers in itertools.product(*QUIZ_AXES)]
+        X = inference.model_input(model, preprocessor.transform(records))
+
+        if hasattr(model, "predict_proba"):
+            proba = model.predict_proba(X)
+        else:
+            proba = (model.predict(X)[:, None] == model.classes_[None, :]).astype(np.float64)
+
+        order = np.argsort(-proba, axis=1, kind="stable")
+        dtype = np.uint8 if len(model.classes_) < 256 else np.uint16
+        ranking = order.astype(dtype)
+        scores = (np.take_along_axis(proba, order, axis=1) * 100).astype(np.float32)
+        careers = preprocessor.decode_target(model.classes_)
+        return cls(ranking, scores, careers, source_hash)
+
+    #  Persistence
+    def save(self, path=TABLE_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(path, ranking=self.ranking, scores=self.scores,
+                 careers=self.careers.astype(str), source_hash=np.array(self.source_hash),
+                 shape=np.array(self._shape))
+
+    @classmethod
+    def load(cls, path=TABLE_FILE):
+        with np.load(path) as data:
+            table = cls(data["ranking"], data["scores"], data["careers"].tolist(), str(data["source_hash"]))
+            shape = tuple(data["shape"])
+        if shape != table._shape:
+            raise ValueError("Quiz table was built for different quiz options")
+        return table
+
+    #  Lookup
+    def cell(self, env_key, problem_solving, activity, communication, language):
+        answers = (env_key, problem_solving, activity, communication, language)
+        # unknown answers raise KeyError
+        return np.ravel_multi_index([index[a] for index, a in zip(self._index, answers)], self._shape)
+
+    def lookup(self, env_key, problem_solving, activity, communication, language, top=1):
+        start = time.perf_counter()
+        i = self.cell(env_key, problem_solving, activity, communication, language)
+
+        ranked = [
+            {"career": self.careers[c], "score": float(s)}
+            for c, s in zip(self.ranking[i, :top], self.scores[i, :top])
+        ]
+        latency_ms = (time.perf_counter() - start) * 1000
+        return dict(ranked[0], ranking=ranked, latency_ms=latency_ms)
+
+
+# Loads the table, rebuilding it when the model or preprocessor changed
+def load_table(model_path=inference.MODEL_FILE, preprocessor_path=inference.PREPROCESSOR_FILE,
+               path=TABLE_FILE, rebuild=False):
+    source_hash = artifact_hash(model_path, preprocessor_path)
+
+    if not rebuild and os.path.exists(path):
+        try:
+            table = QuizTable.load(path)
+            if table.source_hash == source_hash:
+                return table
+        except (OSError, ValueError, KeyError):
+            pass
+
+    model = inference.load_model(model_path)
+    preprocessor = inference.load_preprocessor(preprocessor_path)
+    with span("quiz_table.build"):
+        table = QuizTable.build(model, preprocessor, source_hash)
+    table.save(path)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the quiz answer grid for a model.")
+    parser.add_argument("--model", default=inference.MODEL_FILE)
+    parser.add_argument("--preprocessor", default=inference.PREPROCESSOR_FILE)
+    parser.add_argument("--output", default=TABLE_FILE)
+    parser.add_argument("--force", action="store_true", help="rebuild even if the model is unchanged")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = load_table(args.model, args.preprocessor, args.output, rebuild=args.force)
+    print(f"Quiz table: {len(table.ranking)} answer combinations x {len(table.careers)} careers "
+          f"({time.perf_counter() - start:.2f}s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize_scalar
+from sklearn.model_selection import train_test_split
+
+from src.preprocessing import load_encoded, ENCODED_FILE
+from src.instrumentation import traced
+from src.inference import model_input
+from src.pipeline import file_hash
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+MODEL_FILE = os.path.join(PROJECT_ROOT, "data", "models", "best_model.joblib")
+
+TOP_K = 3
+EPS = 1e-12
+
+# below this many classes one full sort per row is cheaper than argpartition
+FULL_SORT_MAX_CLASSES = 16
+
+
+#  Top-k
+# argpartition picks the k best columns of every row in O(n_classes), only
+# those k are sorted. Ties within the top k are ordered by class.
+def top_k(proba, k=TOP_K):
+    proba = np.asarray(proba)
+    k = min(k, proba.shape[1])
+
+    if proba.shape[1] <= FULL_SORT_MAX_CLASSES:
+        idx = np.argsort(-proba, axis=1, kind="stable")[:, :k]
+        return idx, np.take_along_axis(proba, idx, axis=1)
+
+    # class order first, then a stable sort by score keeps it for ties
+    idx = np.sort(np.argpartition(proba, -k, axis=1)[:, -k:], axis=1)
+    part = np.take_along_axis(proba, idx, axis=1)
+    order = np.argsort(-part, axis=1, kind="stable")
+
+    idx = np.take_along_axis(idx, order, axis=1)
+    return idx, np.take_along_axis(part, order, axis=1)
+
+
+#  Calibration (temperature scaling)
+# p_i ** (1 / T), renormalized. One parameter fitted on held-out rows, so it
+# works with any model and never changes the ranking, only the confidence.
+def apply_temperature(proba, temperature=1.0):
+    proba = np.asarray(proba, dtype=np.float64)
+    if temperature == 1.0:
+        return proba
+
+    logits = np.log(np.clip(proba, EPS, 1.0)) / temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    calibrated = np.exp(logits)
+    calibrated /= calibrated.sum(axis=1, keepdims=True)
+    return calibrated
+
+
+def log_loss(proba, y_idx):
+    return float(-np.mean(np.log(np.clip(proba[np.arange(len(y_idx)), y_idx], EPS, 1.0))))
+
+
+# Expected calibration error of the top-1 confidence (equal-width bins)
+def expected_calibration_error(proba, y_idx, bins=10):
+    confidence = proba.max(axis=1)
+    correct = proba.argmax(axis=1) == y_idx
+    which = np.minimum((confidence * bins).astype(int), bins - 1)
+
+    ece = 0.0
+    for b in range(bins):
+        in_bin = which == b
+        if in_bin.any():
+            ece += in_bin.mean() * abs(correct[in_bin].mean() - confidence[in_bin].mean())
+    return float(ece)
+
+
+def fit_temperature(proba, y_idx):
+    result = minimize_scalar(
+        lambda log_t: log_loss(apply_temperature(proba, np.exp(log_t)), y_idx),
+        bounds=(-3.0, 3.0), method="bounded"
+    )
+    return float(np.exp(result.x))
+
+
+#  Saved next to the model: best_model.joblib -> best_model.calibration.json
+# with the hash of the model it was fitted for. Promoting another model
+# replaces best_model.joblib but not the file next to it, so a temperature
+# whose hash no longer matches is ignored (T = 1) until calibrate() runs again.
+def calibration_file(model_file):
+    return os.path.splitext(model_file)[0] + ".calibration.json"
+
+
+def load_temperature(model_file=MODEL_FILE):
+    path = calibration_file(model_file)
+    if not os.path.exists(path):
+        return 1.0
+    with open(path, "r") as f:
+        report = json.load(f)
+
+    if report.get("model_sha256") != file_hash(model_file):
+        print(f"{path} was fitted for another model, ignored. Re-run: python -m src.ranking --model {model_file}")
+        return 1.0
+    return float(report["temperature"])
+
+
+@traced("ranking.calibrate")
+def calibrate(model_file=MODEL_FILE, encoded_file=ENCODED_FILE):
+    # imported here: train_all pulls in every trainer's dependencies
+    from src.models.train_all import split_encoded
+    from src.inference import load_model
+
+    model = load_model(model_file)
+    if not hasattr(model, "predict_proba"):
+        raise ValueError(f"{model_file} has no predict_proba, there are no probabilities to calibrate")
+
+    # rows the models in train_all.py never saw, halved: fit T on one half,
+    # report on the other
+    _, X_held, _, y_held = split_encoded(load_encoded(encoded_file))
+    X_fit, X_eval, y_fit, y_eval = train_test_split(
+        X_held, y_held, test_size=0.5, random_state=42, stratify=y_held
+    )
+
+    classes = np.asarray(model.classes_)
+    proba_fit = model.predict_proba(model_input(model, X_fit))
+    proba_eval = model.predict_proba(model_input(model, X_eval))
+    y_fit_idx = np.searchsorted(classes, y_fit.to_numpy())
+    y_eval_idx = np.searchsorted(classes, y_eval.to_numpy())
+
+    fitted = fit_temperature(proba_fit, y_fit_idx)
+    calibrated = apply_temperature(proba_eval, fitted)
+    ece_before = expected_calibration_error(proba_eval, y_eval_idx)
+    ece_after = expected_calibration_error(calibrated, y_eval_idx)
+
+    # T is fitted on log loss; it is only applied if the held-out confidence
+    # also gets more reliable, otherwise the model's own probabilities are
+    # used (T = 1) and the fitted value is kept for reference
+    report = {
+        "model_sha256": file_hash(model_file),
+        "temperature": fitted if ece_after < ece_before else 1.0,
+        "fitted_temperature": fitted,
+        "fit_rows": len(y_fit),
+        "eval_rows": len(y_eval),
+        "log_loss_before": log_loss(proba_eval, y_eval_idx),
+        "log_loss_after": log_loss(calibrated, y_eval_idx),
+        "ece_before": ece_before,
+        "ece_after": ece_after,
+    }
+    with open(calibration_file(model_file), "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+#  Cohort ranking
+# One chunk of raw students -> career_1..k / score_1..k (scores 0-100)
+def rank_chunk(chunk, model, preprocessor, class_names, k=TOP_K, temperature=1.0):
+    X = model_input(model, preprocessor.transform(chunk))
+    proba = apply_temperature(model.predict_proba(X), temperature)
+    idx, scores = top_k(proba, k)
+
+    names = np.asarray(class_names)
+    out = pd.DataFrame(index=chunk.index)
+    for j in range(idx.shape[1]):
+        out[f"career_{j + 1}"] = names[idx[:, j]]
+        out[f"score_{j + 1}"] = (scores[:, j] * 100).astype(np.float32)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the calibration layer of a trained model on held-out rows.")
+    parser.add_argument("--model", default=MODEL_FILE)
+    parser.add_argument("--encoded", default=ENCODED_FILE)
+    args = parser.parse_args()
+
+    try:
+        report = calibrate(args.model, args.encoded)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+    print(f"temperature: {report['temperature']:.3f}", end="")
+    if report["temperature"] != report["fitted_temperature"]:
+        print(f" (fitted {report['fitted_temperature']:.3f} did not reduce ECE, not applied)", end="")
+    print()
+    print(f"log loss: {report['log_loss_before']:.4f} -> {report['log_loss_after']:.4f}")
+    print(f"ECE:      {report['ece_before']:.4f} -> {report['ece_after']:.4f}")
+    print(f"saved to {calibration_file(args.model)}")
+
+
+if __name__ == "__main__":
+    main()
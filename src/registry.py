@@ -0,0 +1,267 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.pipeline import file_hash
+from src.instrumentation import span
+from src.locking import locked
+
+REGISTRY_DIR = os.path.join(PROJECT_ROOT, "data", "registry")
+
+
+# Local model registry
+#
+#   data/registry/
+#     index.json                {"models": {name: [entry, ...]}, "aliases": {alias: "name@version"}}
+#     objects/ab/abcd....joblib a joblib file, named by the sha256 of its bytes
+#     objects/ab/abcd.../       a compiled forest (forest_engine.py), named by
+#                               the hash of its files
+#
+# Artifacts are content-addressed: registering the same bytes twice (e.g.
+# models/rf_model.joblib and a copy of it) stores them once, and a model
+# whose artifact did not change does not get a new version. Each entry keeps
+# the metrics, feature schema and training data hash of that version.
+#
+# Joblib artifacts are loaded with mmap_mode="r": numpy arrays in the model
+# (coefficients, support vectors, ...) stay views of the file, so serving
+# processes loading the same version share one page-cached copy. sklearn
+# trees copy their nodes out of the file when unpickled; register the
+# compiled forest directory (forest_engine.py) to share a forest's pages.
+def dir_hash(path):
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            h.update(os.path.relpath(full, path).encode())
+            h.update(file_hash(full).encode())
+    return h.hexdigest()
+
+
+def _read_only(path):
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for name in files:
+                os.chmod(os.path.join(root, name), 0o444)
+    else:
+        os.chmod(path, 0o444)
+
+
+class Registry:
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+        self.index_file = os.path.join(root, "index.json")
+
+    #  Index
+    def _read(self):
+        if not os.path.exists(self.index_file):
+            return {"models": {}, "aliases": {}}
+        with open(self.index_file, "r") as f:
+            return json.load(f)
+
+    # read-modify-write under a lock, the index is replaced atomically
+    def _update(self, change):
+        os.makedirs(self.root, exist_ok=True)
+        with locked(self.index_file):
+            index = self._read()
+            result = change(index)
+
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp, self.index_file)
+        return result
+
+    #  Objects
+    def object_path(self, entry):
+        digest = entry["digest"]
+        name = digest if entry["kind"] == "forest_engine" else f"{digest}.joblib"
+        return os.path.join(self.root, "objects", digest[:2], name)
+
+    def _store(self, path, kind):
+        entry = {"kind": kind, "digest": dir_hash(path) if kind == "forest_engine" else file_hash(path)}
+        target = self.object_path(entry)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.{os.getpid()}.tmp"
+            if kind == "forest_engine":
+                shutil.copytree(path, tmp)
+            else:
+                shutil.copyfile(path, tmp)
+            _read_only(tmp)
+            os.replace(tmp, target)
+        return entry
+
+    #  Register
+    # artifact: a joblib file, a compiled forest directory, or a fitted model
+    # (dumped uncompressed, so it can be memory-mapped on load)
+    def register(self, name, artifact, metrics=None, features=None, data_hash=None, source=None):
+        if isinstance(artifact, (str, os.PathLike)):
+            kind = "forest_engine" if os.path.isdir(artifact) else "joblib"
+            stored = self._store(artifact, kind)
+        else:
+            import joblib
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "model.joblib")
+                joblib.dump(artifact, path)
+                stored = self._store(path, "joblib")
+
+        def add(index):
+            versions = index["models"].setdefault(name, [])
+            if versions and versions[-1]["digest"] == stored["digest"]:
+                return versions[-1]
+            entry = {
+                "version": len(versions) + 1,
+                **stored,
+                "size_bytes": self._size(self.object_path(stored)),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "metrics": metrics or {},
+                "features": list(features) if features is not None else None,
+                "data_hash": data_hash,
+                "source": source,
+            }
+            versions.append(entry)
+            return entry
+
+        return self._update(add)
+
+    @staticmethod
+    def _size(path):
+        if not os.path.isdir(path):
+            return os.path.getsize(path)
+        return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+    #  Lookup
+    # ref: "name" (latest version), "name@3", or an alias ("best")
+    def resolve(self, ref):
+        index = self._read()
+        ref = index["aliases"].get(ref, ref)
+        name, _, version = ref.partition("@")
+        versions = index["models"].get(name)
+        if not versions:
+            raise KeyError(f"No model '{name}' in the registry ({self.root})")
+        if not version:
+            return name, versions[-1]
+        for entry in versions:
+            if entry["version"] == int(version):
+                return name, entry
+        raise KeyError(f"No version {version} of '{name}' in the registry")
+
+    def path(self, ref):
+        return self.object_path(self.resolve(ref)[1])
+
+    def load(self, ref, mmap_mode="r"):
+        name, entry = self.resolve(ref)
+        path = self.object_path(entry)
+        with span("registry.load", model=f"{name}@{entry['version']}"):
+            if entry["kind"] == "forest_engine":
+                from src.forest_engine import FlatForest
+                return FlatForest.load(path)
+
+            import joblib
+            return joblib.load(path, mmap_mode=mmap_mode)
+
+    def set_alias(self, alias, ref):
+        name, entry = self.resolve(ref)
+        target = f"{name}@{entry['version']}"
+
+        def change(index):
+            index["aliases"][alias] = target
+            return target
+
+        return self._update(change)
+
+    def models(self):
+        return self._read()["models"]
+
+    def aliases(self):
+        return self._read()["aliases"]
+
+    # Puts a version at a plain path for the tools that take a model file
+    # (app, score.py, ranking.py, ...): a hard link to the object, so the
+    # bytes are not duplicated; a copy across file systems.
+    def export(self, ref, dest):
+        source = self.path(ref)
+        # already linked (rename() is a no-op between links of one file)
+        if os.path.isfile(dest) and os.path.samefile(source, dest):
+            return dest
+        os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+        tmp = f"{dest}.{os.getpid()}.tmp"
+        if os.path.isdir(source):
+            shutil.copytree(source, tmp)
+        else:
+            try:
+                os.link(source, tmp)
+            except OSError:
+                shutil.copyfile(source, tmp)
+        if os.path.isdir(dest) and not os.path.islink(dest):
+            shutil.rmtree(dest)
+        os.replace(tmp, dest)
+        return dest
+
+
+#  CLI
+def main():
+    parser = argparse.ArgumentParser(description="Local content-addressed model registry.")
+    parser.add_argument("--root", default=REGISTRY_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="every model, version and alias")
+
+    show = sub.add_parser("show", help="metadata of one version")
+    show.add_argument("ref")
+
+    register = sub.add_parser("register", help="add a joblib file or compiled forest directory")
+    register.add_argument("name")
+    register.add_argument("artifact")
+    register.add_argument("--data", default=None, help="training data file, its hash is recorded")
+
+    alias = sub.add_parser("alias", help="point an alias (e.g. best) at a version")
+    alias.add_argument("alias")
+    alias.add_argument("ref")
+
+    export = sub.add_parser("export", help="link a version to a plain file path")
+    export.add_argument("ref")
+    export.add_argument("dest")
+    args = parser.parse_args()
+
+    registry = Registry(args.root)
+    if args.command == "list":
+        aliases = {}
+        for alias_name, target in registry.aliases().items():
+            aliases.setdefault(target, []).append(alias_name)
+        print(f"{'model':<22} {'version':>7} {'kind':<13} {'size (KB)':>10} {'accuracy':>9}  digest")
+        for name, versions in registry.models().items():
+            for e in versions:
+                tags = ", ".join(aliases.get(f"{name}@{e['version']}", []))
+                accuracy = e["metrics"].get("accuracy")
+                accuracy = f"{accuracy:.4f}" if accuracy is not None else "-"
+                print(f"{name:<22} {e['version']:>7} {e['kind']:<13} {e['size_bytes'] / 1024:>10.0f} "
+                      f"{accuracy:>9}  {e['digest'][:12]}" + (f"  [{tags}]" if tags else ""))
+    elif args.command == "show":
+        name, entry = registry.resolve(args.ref)
+        print(json.dumps({"name": name, "path": registry.object_path(entry), **entry}, indent=2))
+    elif args.command == "register":
+        data_hash = file_hash(args.data) if args.data else None
+        entry = registry.register(args.name, args.artifact, data_hash=data_hash, source=args.artifact)
+        print(f"{args.name}@{entry['version']} ({entry['digest'][:12]})")
+    elif args.command == "alias":
+        print(f"{args.alias} -> {registry.set_alias(args.alias, args.ref)}")
+    elif args.command == "export":
+        print(registry.export(args.ref, args.dest))
+
+
+if __name__ == "__main__":
+    main()
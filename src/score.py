@@ -0,0 +1,129 @@
+import os
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import CareerPreprocessor, PREPROCESSOR_FILE
+from src.ranking import rank_chunk, load_temperature
+from src.inference import model_input, load_model
+from src.instrumentation import span
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+MODEL_FILE = os.path.join(PROJECT_ROOT, "data", "models", "best_model.joblib")
+
+CHUNK_SIZE = 50_000
+
+
+# Score one chunk of raw rows -> DataFrame of predictions.
+# A model without predict_proba (e.g. the SVM) only gets predicted_career,
+# with an empty confidence, like inference.recommend_batch.
+def score_chunk(chunk, model, preprocessor, class_names):
+    X = model_input(model, preprocessor.transform(chunk))
+
+    if not hasattr(model, "predict_proba"):
+        codes = model.predict(X)
+        out = pd.DataFrame(index=chunk.index)
+        out["predicted_career"] = preprocessor.decode_target(codes)
+        out["confidence"] = np.nan
+        return out
+
+    proba = model.predict_proba(X)
+    best = proba.argmax(axis=1)
+
+    out = pd.DataFrame(
+        proba.astype(np.float32),
+        columns=[f"proba_{name}" for name in class_names],
+    )
+    out.index = chunk.index
+    out.insert(0, "confidence", out.to_numpy().max(axis=1))
+    out.insert(0, "predicted_career", np.asarray(class_names)[best])
+    return out
+
+
+# Raw rows with a missing value in a column the preprocessor encodes
+# (a NaN GPA would fail the transform for the whole chunk)
+def missing_rows(chunk, preprocessor):
+    needed = set(preprocessor.dense_features_) | set(preprocessor.multi_hot_)
+    names = chunk.columns.str.lower().str.strip().str.replace(" ", "_")
+    return chunk.loc[:, names.isin(needed)].isna().any(axis=1)
+
+
+# Stream the input file through the model, one chunk in memory at a time.
+# With top_k only the k best careers (calibrated if the model has a
+# calibration file, see ranking.py) are written instead of every probability.
+# model_file is anything inference.load_model takes (joblib file, compiled
+# forest directory, "registry:<ref>"). Rows with missing values are skipped
+# and reported; their row numbers are absent from the output.
+def score_file(input_file, output_file, model_file=MODEL_FILE,
+               preprocessor_file=PREPROCESSOR_FILE, chunksize=CHUNK_SIZE, top_k=None):
+    with span("score.load"):
+        model = load_model(model_file)
+        preprocessor = CareerPreprocessor.load(preprocessor_file)
+
+    class_names = list(preprocessor.decode_target(model.classes_))
+    # calibration files sit next to a joblib model file
+    temperature = load_temperature(model_file) if os.path.isfile(model_file) else 1.0
+
+    if top_k and not hasattr(model, "predict_proba"):
+        print(f"{model_file} has no predict_proba, writing the predicted career only")
+        top_k = None
+
+    n_rows = 0
+    skipped = []
+    start = time.perf_counter()
+
+    # row numbers continue across chunks so output rows line up with the input file
+    reader = pd.read_csv(input_file, chunksize=chunksize)
+    for i, chunk in enumerate(reader):
+        missing = missing_rows(chunk, preprocessor)
+        if missing.any():
+            skipped.extend(chunk.index[missing])
+            chunk = chunk[~missing]
+        if chunk.empty:
+            continue
+
+        with span("score.predict", rows=len(chunk)):
+            if top_k:
+                out = rank_chunk(chunk, model, preprocessor, class_names, top_k, temperature)
+            else:
+                out = score_chunk(chunk, model, preprocessor, class_names)
+        out.index.name = "row"
+        with span("score.save", rows=len(out)):
+            out.to_csv(output_file, mode="w" if n_rows == 0 else "a", header=(n_rows == 0))
+
+        n_rows += len(out)
+        print(f" - chunk {i + 1}: {n_rows} rows scored")
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {n_rows} rows in {elapsed:.2f}s -> {output_file}")
+    if skipped:
+        shown = ", ".join(str(r) for r in skipped[:10]) + (", ..." if len(skipped) > 10 else "")
+        print(f"Skipped {len(skipped)} rows with missing values (rows {shown})")
+    return n_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-score a raw student CSV with a trained model.")
+    parser.add_argument("input", help="raw CSV shaped like data/raw/career_data.csv")
+    parser.add_argument("output", help="where to write the predictions CSV")
+    parser.add_argument("--model", default=MODEL_FILE)
+    parser.add_argument("--preprocessor", default=PREPROCESSOR_FILE)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--top-k", type=int, default=None,
+                        help="write the k best careers with calibrated scores instead of all probabilities")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        raise FileNotFoundError(f"Input file not found at {args.input}")
+
+    score_file(args.input, args.output, args.model, args.preprocessor, args.chunksize, args.top_k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import tornado.web
+import tornado.ioloop
+import tornado.netutil
+import tornado.process
+import tornado.httpserver
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src import inference, instrumentation
+
+PORT = 8000
+WINDOW_MS = 2.0
+MAX_BATCH = 256
+
+
+#  Metrics
+# Counters since start-up plus the latencies of the last requests.
+class ServiceMetrics:
+
+    def __init__(self, window=10_000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.latencies_ms = deque(maxlen=window)
+        self.finished_at = deque(maxlen=window)
+
+    def record_batch(self, latencies_ms):
+        now = time.perf_counter()
+        self.requests += len(latencies_ms)
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(latencies_ms))
+        self.latencies_ms.extend(latencies_ms)
+        self.finished_at.extend([now] * len(latencies_ms))
+
+    def record_error(self, n=1):
+        self.errors += n
+
+    def snapshot(self):
+        now = time.perf_counter()
+        uptime = now - self.started
+
+        # throughput over the requests still in the window
+        recent_rps = 0.0
+        if len(self.finished_at) > 1 and now > self.finished_at[0]:
+            recent_rps = len(self.finished_at) / (now - self.finished_at[0])
+
+        latencies = np.asarray(self.latencies_ms)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch,
+            "requests_per_s": round(self.requests / uptime, 1) if uptime else 0.0,
+            "recent_requests_per_s": round(recent_rps, 1),
+            "latency_ms": {"p50": round(float(p50), 3), "p95": round(float(p95), 3), "p99": round(float(p99), 3)},
+        }
+
+
+#  Micro-batching
+# Requests arriving within window_ms of the first one in a batch (or until
+# max_batch are waiting) are scored together with one predict_proba call.
+# Scoring runs on a single worker thread so the event loop keeps accepting
+# requests for the next batch meanwhile.
+class MicroBatcher:
+
+    def __init__(self, model, preprocessor, window_ms=WINDOW_MS, max_batch=MAX_BATCH, metrics=None):
+        self.model = model
+        self.preprocessor = preprocessor
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self.metrics = metrics or ServiceMetrics()
+
+        self._pending = []
+        self._timer = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def submit(self, record):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((record, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._score(batch))
+
+    # A batch that fails is scored again one record at a time, so a record
+    # the handler could not catch fails only its own request
+    async def _score(self, batch):
+        loop = asyncio.get_running_loop()
+        records = [record for record, _, _ in batch]
+        try:
+            results = await loop.run_in_executor(
+                self._executor, inference.recommend_batch, self.model, self.preprocessor, records
+            )
+        except Exception as e:
+            if len(batch) > 1:
+                for item in batch:
+                    await self._score([item])
+                return
+            self.metrics.record_error(len(batch))
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        now = time.perf_counter()
+        latencies = []
+        for (_, future, start), result in zip(batch, results):
+            latency_ms = (now - start) * 1000
+            latencies.append(latency_ms)
+            if not future.done():
+                future.set_result(dict(result, latency_ms=latency_ms, batch_size=len(batch)))
+        self.metrics.record_batch(latencies)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+#  Request validation
+# Column -> float or str, the type the preprocessor reads it as
+def record_fields(preprocessor):
+    fields = {col: str if col in preprocessor.categories_ else float for col in preprocessor.dense_features_}
+    fields.update({col: str for col in preprocessor.multi_hot_})
+    return fields
+
+
+# -> copy of record with numeric fields as floats; ValueError names the bad field
+def parse_record(record, fields):
+    missing = [col for col in fields if col not in record]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+    parsed = dict(record)
+    for col, kind in fields.items():
+        value = record[col]
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f"{col}: expected {'a number' if kind is float else 'text'}, got {value!r}")
+        if kind is float:
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError(f"{col}: expected a number, got {value!r}") from None
+            if not np.isfinite(value):
+                raise ValueError(f"{col}: expected a finite number, got {value!r}")
+        parsed[col] = value
+    return parsed
+
+
+#  HTTP handlers
+class RecommendHandler(tornado.web.RequestHandler):
+
+    def initialize(self, batcher, fields):
+        self.batcher = batcher
+        self.fields = fields
+
+    # body: a student record (raw column names) or {"quiz": {...quiz_to_record args}}
+    # Every field is checked here, so a bad value is a 400 for this request
+    # and never reaches the batch it would have been scored with.
+    async def post(self):
+        try:
+            body = json.loads(self.request.body)
+            if not isinstance(body, dict):
+                raise ValueError("expected a JSON object")
+            if "quiz" in body:
+                record = inference.quiz_to_record(**body["quiz"])
+            else:
+                record = {k.lower().strip().replace(" ", "_"): v for k, v in body.items()}
+            record = parse_record(record, self.fields)
+        except (ValueError, TypeError, KeyError) as e:
+            self.batcher.metrics.record_error()
+            raise tornado.web.HTTPError(400, reason=f"Invalid request: {e}")
+
+        self.write(await self.batcher.submit(record))
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+
+    def initialize(self, batcher):
+        self.batcher = batcher
+
+    def get(self):
+        self.write(self.batcher.metrics.snapshot())
+
+
+# Prometheus text format: the service counters plus the spans recorded in
+# this process (inference.predict per batch when CAREER_TRACE is set)
+class PrometheusHandler(tornado.web.RequestHandler):
+
+    def initialize(self, batcher):
+        self.batcher = batcher
+
+    def get(self):
+        snapshot = self.batcher.metrics.snapshot()
+        lines = []
+        for name, kind, value in [
+            ("requests_total", "counter", snapshot["requests"]),
+            ("errors_total", "counter", snapshot["errors"]),
+            ("batches_total", "counter", snapshot["batches"]),
+            ("uptime_seconds", "gauge", snapshot["uptime_s"]),
+            ("recent_requests_per_second", "gauge", snapshot["recent_requests_per_s"]),
+        ]:
+            lines += [f"# TYPE career_{name} {kind}", f"career_{name} {value}"]
+        lines.append("# TYPE career_request_latency_ms gauge")
+        for q, value in snapshot["latency_ms"].items():
+            lines.append(f'career_request_latency_ms{{quantile="0.{q[1:]}"}} {value}')
+
+        self.set_header("Content-Type", "text/plain; version=0.0.4")
+        self.write("\n".join(lines) + "\n" + instrumentation.prometheus_text())
+
+
+class HealthHandler(tornado.web.RequestHandler):
+
+    def get(self):
+        self.write({"status": "ok"})
+
+
+def make_app(model, preprocessor, window_ms=WINDOW_MS, max_batch=MAX_BATCH):
+    batcher = MicroBatcher(model, preprocessor, window_ms, max_batch)
+
+    app = tornado.web.Application([
+        (r"/recommend", RecommendHandler, {"batcher": batcher, "fields": record_fields(preprocessor)}),
+        (r"/metrics", MetricsHandler, {"batcher": batcher}),
+        (r"/metrics/prometheus", PrometheusHandler, {"batcher": batcher}),
+        (r"/health", HealthHandler),
+    ])
+    app.batcher = batcher
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP scoring service with micro-batching.")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--model", default=inference.MODEL_FILE)
+    parser.add_argument("--preprocessor", default=inference.PREPROCESSOR_FILE)
+    parser.add_argument("--window-ms", type=float, default=WINDOW_MS,
+                        help="how long the first request of a batch waits for others")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--processes", type=int, default=1,
+                        help="server processes sharing the port (0: one per CPU)")
+    args = parser.parse_args()
+
+    # loaded before forking: the memory-mapped model pages are shared
+    model = inference.load_model(args.model)
+    preprocessor = inference.load_preprocessor(args.preprocessor)
+
+    # every process runs its own event loop and batcher on the shared socket
+    sockets = tornado.netutil.bind_sockets(args.port)
+    if args.processes != 1:
+        tornado.process.fork_processes(args.processes)
+
+    app = make_app(model, preprocessor, args.window_ms, args.max_batch)
+    tornado.httpserver.HTTPServer(app).add_sockets(sockets)
+    print(f"Serving on http://localhost:{args.port} (window {args.window_ms} ms, max batch {args.max_batch})")
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == "__main__":
+    main()
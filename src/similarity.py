@@ -0,0 +1,396 @@
+import os
+import json
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.preprocessing import load_encoded, ENCODED_FILE, MULTI_VALUED_COLS
+from src.instrumentation import traced
+from src.pipeline import file_hash
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+INDEX_DIR = os.path.join(PROJECT_ROOT, "data", "models", "similarity_index")
+
+TARGET_COL = "career_role"
+
+# Bump when the saved layout changes
+INDEX_VERSION = 2
+
+ARRAYS = ["vectors", "binary", "set_sizes", "labels",
+          "planes", "offsets", "simhash_keys", "simhash_order",
+          "minhash_coef", "minhash_keys", "minhash_order"]
+
+# index rows scored per matrix multiply in the exact backend
+BLOCK_ROWS = 65536
+# rows read from each probed LSH bucket, around the query's position
+WINDOW = 256
+# extra hyperplanes per SimHash table that order rows inside a bucket
+FINE_BITS = 16
+
+MERSENNE = np.uint64((1 << 31) - 1)
+
+# backend="auto" uses LSH from this many indexed rows, the exact scan below.
+# Measured with bench_similarity.py (p50 per query, one core): cosine LSH
+# is slower up to 400k rows (3.3 ms exact vs 4.5 ms LSH) and faster from
+# 500k (9.4 vs 7.3 ms); Jaccard LSH from 50k (1.3 vs 0.9 ms, 20k: 0.6 vs 0.7)
+LSH_MIN_ROWS = {"cosine": 450_000, "jaccard": 30_000}
+
+
+# "Students like you": k nearest neighbours of an encoded profile.
+#
+#   cosine  - over every encoded feature (rows are L2-normalized once)
+#   jaccard - over the multi-hot skills / languages / clubs sets
+#
+# exact: the index is scanned in blocks of BLOCK_ROWS with one matrix
+#        multiply per block, keeping a running top-k.
+# lsh:   cosine uses random-hyperplane signatures (SimHash) in several
+#        tables, probing the query's bucket and the buckets one bit away;
+#        jaccard uses MinHash with banding. Candidates are re-ranked exactly.
+# auto:  lsh from LSH_MIN_ROWS rows, exact below (faster there, and exact).
+#
+# Every table is one sorted array of 64-bit keys: the bucket in the high 32
+# bits and a finer key in the low 32 (more hyperplanes for SimHash, the set
+# itself for MinHash), so similar rows sit together inside a bucket and only
+# a window of WINDOW rows around the query is read from each probed bucket.
+# Hyperplanes are offset by the median projection of the indexed rows: the
+# multi-hot columns are all non-negative, and planes through the origin
+# would put most students in a few buckets.
+#
+# Arrays are saved as .npy files and memory-mapped on load. X can be a CSR
+# matrix; it is densified BLOCK_ROWS rows at a time.
+class StudentIndex:
+
+    def __init__(self, arrays, meta):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.feature_names = meta["feature_names"]
+        self.binary_features = meta["binary_features"]
+        self.bits = meta["bits"]
+        self.band_rows = meta["band_rows"]
+        # hash of the encoded file the index was built from
+        self.source_hash = meta.get("source_hash", "")
+        self._binary_idx = [self.feature_names.index(f) for f in self.binary_features]
+
+    #  Build
+    @classmethod
+    def build(cls, X, feature_names, binary_features, labels, tables=12, bits=None,
+              bands=8, band_rows=4, seed=42, source_hash=""):
+        rng = np.random.default_rng(seed)
+        n = X.shape[0] if sp.issparse(X) else len(X)
+        feature_names = [str(f) for f in feature_names]
+        binary_idx = [feature_names.index(f) for f in binary_features]
+
+        vectors = np.empty((n, len(feature_names)), dtype=np.float32)
+        binary = np.empty((n, len(binary_idx)), dtype=np.uint8)
+        for start in range(0, n, BLOCK_ROWS):
+            block = X[start:start + BLOCK_ROWS]
+            block = block.toarray().astype(np.float32) if sp.issparse(block) else np.asarray(block, dtype=np.float32)
+            vectors[start:start + len(block)] = _normalize(block)
+            binary[start:start + len(block)] = block[:, binary_idx] > 0
+
+        # about 16 rows per bucket
+        bits = bits or int(np.clip(np.log2(max(n, 1) / 16), 1, 32 - FINE_BITS))
+        planes = rng.standard_normal((tables, bits + FINE_BITS, vectors.shape[1])).astype(np.float32)
+        sample = vectors[rng.choice(n, min(n, 100000), replace=False)]
+        offsets = np.median(np.einsum("tbd,nd->tbn", planes, sample), axis=2).astype(np.float32)
+
+        minhash_coef = rng.integers(1, int(MERSENNE), size=(2, bands * band_rows)).astype(np.uint64)
+
+        simhash_keys, simhash_order = _bucket(_simhash(vectors, planes, offsets, bits))
+        minhash_keys, minhash_order = _bucket(_minhash_bands(binary, minhash_coef, band_rows))
+
+        arrays = {
+            "vectors": vectors,
+            "binary": binary,
+            "set_sizes": binary.sum(axis=1, dtype=np.int32),
+            "labels": np.asarray(labels),
+            "planes": planes,
+            "offsets": offsets,
+            "simhash_keys": simhash_keys,
+            "simhash_order": simhash_order,
+            "minhash_coef": minhash_coef,
+            "minhash_keys": minhash_keys,
+            "minhash_order": minhash_order,
+        }
+        meta = {"feature_names": feature_names, "binary_features": list(binary_features),
+                "bits": bits, "band_rows": band_rows, "source_hash": source_hash}
+        return cls(arrays, meta)
+
+    #  Persistence
+    # Written to a temporary directory next to `path`, then renamed into
+    # place: the app rebuilds the index from a background thread, and a
+    # reader must never see half of the arrays. If another writer finished
+    # first, its index is kept.
+    def save(self, path=INDEX_DIR):
+        path = os.path.abspath(path)
+        parent = os.path.dirname(path)
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(path)}.")
+        old = None
+        try:
+            self._write(tmp)
+            if os.path.exists(path):
+                old = tmp + ".old"
+                os.replace(path, old)
+            os.replace(tmp, path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.exists(os.path.join(path, "meta.json")):
+                raise
+        finally:
+            # open memory maps of the old arrays stay valid after this
+            if old is not None:
+                shutil.rmtree(old, ignore_errors=True)
+
+    def _write(self, path):
+        for name in ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "feature_names": self.feature_names,
+                "binary_features": self.binary_features,
+                "bits": self.bits,
+                "band_rows": self.band_rows,
+                "source_hash": self.source_hash,
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, path=INDEX_DIR, mmap=True):
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            raise FileNotFoundError(f"{path} is not a similarity index. Run similarity.py first")
+
+        with open(os.path.join(path, "meta.json"), "r") as f:
+            meta = json.load(f)
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(
+                f"Similarity index version {meta.get('version')} does not match {INDEX_VERSION}. "
+                f"Re-run similarity.py"
+            )
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            for name in ARRAYS
+        }
+        return cls(arrays, meta)
+
+    #  Query
+    # Q: encoded rows (array, or DataFrame with the index's feature columns)
+    # -> (row ids, similarities), both (n_queries, k), best first. The LSH
+    # backend pads with id -1 when it finds fewer than k candidates.
+    def query(self, Q, k=10, metric="cosine", backend="auto"):
+        if isinstance(Q, pd.DataFrame):
+            Q = Q[self.feature_names]
+            Q = Q.sparse.to_dense() if hasattr(Q, "sparse") else Q
+            Q = Q.to_numpy()
+        Q = np.atleast_2d(np.asarray(Q, dtype=np.float32))
+
+        if metric == "cosine":
+            Q = _normalize(Q)
+        elif metric == "jaccard":
+            Q = (Q[:, self._binary_idx] > 0).astype(np.uint8)
+        else:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        k = min(k, len(self.labels))
+        if backend == "auto":
+            backend = self.auto_backend(metric)
+        if backend == "exact":
+            return self._exact(Q, k, metric)
+        if backend == "lsh":
+            return self._lsh(Q, k, metric)
+        raise ValueError(f"Unknown backend: {backend}")
+
+    def auto_backend(self, metric):
+        return "lsh" if len(self.labels) >= LSH_MIN_ROWS[metric] else "exact"
+
+    def _similarity(self, Q, rows, metric):
+        if metric == "cosine":
+            return Q @ np.asarray(self.vectors[rows]).T
+
+        block = np.asarray(self.binary[rows], dtype=np.float32)
+        inter = Q.astype(np.float32) @ block.T
+        union = Q.sum(axis=1, dtype=np.float32)[:, None] + self.set_sizes[rows][None, :] - inter
+        return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+    def _exact(self, Q, k, metric):
+        best_ids = np.zeros((len(Q), 0), dtype=np.int64)
+        best_sims = np.zeros((len(Q), 0), dtype=np.float32)
+
+        for start in range(0, len(self.labels), BLOCK_ROWS):
+            rows = slice(start, min(start + BLOCK_ROWS, len(self.labels)))
+            block = self._similarity(Q, rows, metric)
+
+            # the block's own top k, then merged with the running best
+            part = np.argpartition(-block, min(k, block.shape[1]) - 1, axis=1)[:, :k]
+            sims = np.concatenate([best_sims, np.take_along_axis(block, part, axis=1)], axis=1)
+            ids = np.concatenate([best_ids, part + start], axis=1)
+
+            keep = np.argpartition(-sims, min(k, sims.shape[1]) - 1, axis=1)[:, :k]
+            best_sims = np.take_along_axis(sims, keep, axis=1)
+            best_ids = np.take_along_axis(ids, keep, axis=1)
+
+        return _sorted(best_ids, best_sims)
+
+    # -> one array of candidate rows per query
+    def _candidates(self, Q, metric):
+        if metric == "cosine":
+            keys = _simhash(Q, self.planes, self.offsets, self.bits)
+            # the query's bucket plus every bucket one bit away
+            flips = np.concatenate([[0], 1 << np.arange(self.bits)]).astype(np.uint64) << np.uint64(32)
+            keys = keys[:, :, None] ^ flips[None, None, :]
+            sorted_keys, order = self.simhash_keys, self.simhash_order
+        else:
+            keys = _minhash_bands(Q, self.minhash_coef, self.band_rows)[:, :, None]
+            sorted_keys, order = self.minhash_keys, self.minhash_order
+
+        bucket = keys >> np.uint64(32) << np.uint64(32)
+        parts = [[] for _ in range(len(Q))]
+        for t in range(keys.shape[0]):
+            lo = np.searchsorted(sorted_keys[t], bucket[t], side="left")
+            hi = np.searchsorted(sorted_keys[t], bucket[t] + np.uint64(1 << 32), side="left")
+            at = np.searchsorted(sorted_keys[t], keys[t], side="left")
+
+            # WINDOW rows centred on the query's fine key, kept inside the bucket
+            start = np.maximum(lo, np.minimum(at - WINDOW // 2, hi - WINDOW))
+            stop = np.minimum(start + WINDOW, hi)
+            for q in range(len(Q)):
+                for a, b in zip(start[q], stop[q]):
+                    if b > a:
+                        parts[q].append(order[t, a:b])
+        return [np.unique(np.concatenate(p)) if p else np.zeros(0, dtype=np.int32) for p in parts]
+
+    def _lsh(self, Q, k, metric):
+        ids = np.full((len(Q), k), -1, dtype=np.int64)
+        sims = np.full((len(Q), k), -np.inf, dtype=np.float32)
+
+        for q, rows in enumerate(self._candidates(Q, metric)):
+            s = self._similarity(Q[q:q + 1], rows, metric)[0]
+            top = np.argsort(-s, kind="stable")[:k]
+            ids[q, :len(top)] = rows[top]
+            sims[q, :len(top)] = s[top]
+        return ids, sims
+
+
+def _normalize(X):
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return X / norms
+
+
+# Sorts every table's keys, keeping the row order
+def _bucket(keys):
+    order = np.empty(keys.shape, dtype=np.int32)
+    for t in range(len(keys)):
+        order[t] = np.argsort(keys[t], kind="stable")
+        keys[t] = keys[t][order[t]]
+    return keys, order
+
+
+def _sorted(ids, sims):
+    order = np.argsort(-sims, axis=1, kind="stable")
+    return np.take_along_axis(ids, order, axis=1), np.take_along_axis(sims, order, axis=1)
+
+
+# -> (tables, rows) uint64 keys: the first `bits` hyperplanes are the bucket
+# (high 32 bits), the remaining FINE_BITS order rows inside it
+def _simhash(vectors, planes, offsets, bits):
+    tables, n_planes, _ = planes.shape
+    weights = np.concatenate([
+        np.uint64(1) << (np.arange(bits, dtype=np.uint64) + np.uint64(32)),
+        np.uint64(1) << np.arange(n_planes - bits, dtype=np.uint64)[::-1],
+    ])
+    keys = np.empty((tables, len(vectors)), dtype=np.uint64)
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + BLOCK_ROWS])
+        for t in range(tables):
+            signs = (block @ planes[t].T) > offsets[t]
+            keys[t, start:start + len(block)] = signs.astype(np.uint64) @ weights
+    return keys
+
+
+# -> (bands, rows) uint64 keys. Each hash is (a * (col + 1) + b) mod 2^31 - 1
+# minimized over the set; band_rows consecutive hashes are mixed into the
+# bucket (high 32 bits), the set's first 32 columns as bits are the low 32.
+def _minhash_bands(binary, coef, band_rows):
+    a, b = coef
+    n_hashes = len(a)
+    cols = np.arange(binary.shape[1], dtype=np.uint64) + np.uint64(1)
+    col_hash = ((a[:, None] * cols[None, :] + b[:, None]) % MERSENNE).astype(np.uint32)
+    empty = np.uint32(np.iinfo(np.uint32).max)
+    set_weights = np.uint64(1) << np.arange(min(binary.shape[1], 32), dtype=np.uint64)
+
+    keys = np.empty((n_hashes // band_rows, len(binary)), dtype=np.uint64)
+    for start in range(0, len(binary), BLOCK_ROWS):
+        block = np.asarray(binary[start:start + BLOCK_ROWS], dtype=bool)
+        minhash = np.where(block[:, None, :], col_hash[None, :, :], empty).min(axis=2)
+        band = minhash.reshape(len(block), -1, band_rows).astype(np.uint64)
+
+        key = np.zeros(band.shape[:2], dtype=np.uint64)
+        for r in range(band_rows):
+            key = (key * np.uint64(1000003)) ^ band[:, :, r]
+        key = (key ^ (key >> np.uint64(32))) << np.uint64(32)
+        fine = block[:, :len(set_weights)].astype(np.uint64) @ set_weights
+        keys[:, start:start + len(block)] = (key | fine[:, None]).T
+    return keys
+
+
+#  Students like you
+@traced("similarity.build")
+def build_index(encoded_file=ENCODED_FILE, output_dir=INDEX_DIR, **kwargs):
+    df = load_encoded(encoded_file)
+    X = df.drop(columns=[TARGET_COL])
+    feature_names = [str(c) for c in X.columns]
+    binary = [c for c in feature_names if c.split("_")[0] in MULTI_VALUED_COLS]
+
+    index = StudentIndex.build(X.sparse.to_coo().tocsr(), feature_names, binary,
+                               df[TARGET_COL].to_numpy(), source_hash=file_hash(encoded_file), **kwargs)
+    index.save(output_dir)
+    return index
+
+
+# Loads the index, (re)building it from the encoded data the first time and
+# whenever that file has changed since (e.g. after feature_engineering.py)
+def load_index(path=INDEX_DIR, encoded_file=ENCODED_FILE):
+    if os.path.exists(os.path.join(path, "meta.json")):
+        try:
+            index = StudentIndex.load(path)
+            if index.source_hash == file_hash(encoded_file):
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+    return build_index(encoded_file, path)
+
+
+# One raw student record -> DataFrame of similar past students and their careers
+@traced("similarity.query")
+def similar_students(index, preprocessor, record, k=10, metric="cosine", backend="auto"):
+    ids, sims = index.query(preprocessor.transform(record), k=k, metric=metric, backend=backend)
+    found = ids[0] >= 0
+    return pd.DataFrame({
+        "student": ids[0][found],
+        "similarity": sims[0][found],
+        "career": preprocessor.decode_target(index.labels[ids[0][found]]),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the 'students like you' similarity index.")
+    parser.add_argument("--encoded", default=ENCODED_FILE)
+    parser.add_argument("--output", default=INDEX_DIR)
+    args = parser.parse_args()
+
+    index = build_index(args.encoded, args.output)
+    print(f"Indexed {len(index.labels)} students ({len(index.feature_names)} features, "
+          f"{len(index.binary_features)} multi-hot) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import os
+import sys
+import time
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.instrumentation import span
+
+RAW_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "career_data.csv")
+
+MULTI_VALUED_COLS = ["Skills", "Languages", "ClubMemberships"]
+NUMERIC_COLS = ["GPA"]
+SEP = ", "
+
+GPA_BINS = 10
+# pseudo-rows of the marginal mixed into every conditional table, so states
+# never seen together in the raw data can still be drawn
+SMOOTHING = 5.0
+# an edge is kept when its G-test against independence is significant at this level
+P_VALUE = 0.01
+CHUNK_ROWS = 500_000
+
+
+#  Synthetic students
+# Learns the joint distribution of the raw CSV and draws new rows from it,
+# so scaling work can run on any number of rows without real student data.
+#
+# Every column becomes a discrete variable: categories as they are, GPA as
+# one of GPA_BINS quantile bins, a multi-valued column (Skills, ...) as its
+# number of items. A Chow-Liu tree over these variables keeps the strongest
+# pairwise dependencies (maximum mutual information, edges that fail a
+# G-test are dropped, so independent columns stay independent), and rows are
+# drawn root to leaf from smoothed conditional tables:
+#
+#   - GPA: uniform inside the drawn bin, 2 decimals like the raw file
+#   - multi-valued: that many distinct items, weighted by how often each
+#     appears in the raw column, in random order (Plackett-Luce), joined
+#     into one string per row within the chunk
+#
+# Sampling is vectorized over a whole chunk; memory is bounded by chunk_rows.
+class SyntheticStudents:
+
+    def fit(self, df):
+        self.columns_ = list(df.columns)
+        self.categories_ = {}
+        self.items_ = {}
+        self.item_weights_ = {}
+        self.gpa_edges_ = {}
+
+        codes = {}
+        for col in self.columns_:
+            if col in MULTI_VALUED_COLS:
+                items = df[col].astype(str).str.split(SEP)
+                counts = pd.Series([t.strip() for row in items for t in row]).value_counts().sort_index()
+                self.items_[col] = counts.index.tolist()
+                self.item_weights_[col] = counts.to_numpy() / counts.sum()
+                # 1..len(items) items
+                codes[col] = np.clip(items.str.len().to_numpy(), 1, len(counts)) - 1
+            elif col in NUMERIC_COLS:
+                values = df[col].to_numpy(dtype=np.float64)
+                edges = np.unique(np.quantile(values, np.linspace(0, 1, GPA_BINS + 1)))
+                self.gpa_edges_[col] = edges
+                codes[col] = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+            else:
+                cat = pd.Categorical(df[col].astype(str))
+                self.categories_[col] = list(cat.categories)
+                codes[col] = cat.codes.astype(np.int64)
+
+        self.n_states_ = {col: int(self._n_states(col)) for col in self.columns_}
+        self.parents_ = self._chow_liu(codes)
+        self.order_ = self._topological_order()
+        self.tables_ = {col: self._table(col, codes) for col in self.columns_}
+        self.dictionaries_ = {col: pa.array(values, type=pa.string())
+                              for col, values in {**self.categories_, **self.items_}.items()}
+        return self
+
+    def _n_states(self, col):
+        if col in MULTI_VALUED_COLS:
+            return len(self.items_[col])
+        if col in NUMERIC_COLS:
+            return len(self.gpa_edges_[col]) - 1
+        return len(self.categories_[col])
+
+    #  Structure
+    def _chow_liu(self, codes):
+        from scipy.stats import chi2
+
+        cols = self.columns_
+        n = len(next(iter(codes.values())))
+        edges = []
+        for a, b in itertools.combinations(cols, 2):
+            ka, kb = self.n_states_[a], self.n_states_[b]
+            joint = np.bincount(codes[a] * kb + codes[b], minlength=ka * kb).reshape(ka, kb) / n
+            p_a, p_b = joint.sum(axis=1, keepdims=True), joint.sum(axis=0, keepdims=True)
+            nz = joint > 0
+            mi = float((joint[nz] * np.log(joint[nz] / (p_a @ p_b)[nz])).sum())
+            if 2 * n * mi > chi2.ppf(1 - P_VALUE, max((ka - 1) * (kb - 1), 1)):
+                edges.append((mi, a, b))
+
+        # maximum spanning forest (Kruskal)
+        component = {col: col for col in cols}
+
+        def find(col):
+            while component[col] != col:
+                component[col] = component[component[col]]
+                col = component[col]
+            return col
+
+        neighbours = {col: [] for col in cols}
+        for _, a, b in sorted(edges, reverse=True):
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                component[ra] = rb
+                neighbours[a].append(b)
+                neighbours[b].append(a)
+
+        # orient every tree away from its first column
+        parents, seen = {}, set()
+        for root in cols:
+            if root in seen:
+                continue
+            parents[root] = None
+            seen.add(root)
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for other in neighbours[node]:
+                    if other not in seen:
+                        parents[other] = node
+                        seen.add(other)
+                        stack.append(other)
+        return parents
+
+    def _topological_order(self):
+        order = []
+        while len(order) < len(self.columns_):
+            for col in self.columns_:
+                if col not in order and (self.parents_[col] is None or self.parents_[col] in order):
+                    order.append(col)
+        return order
+
+    # cumulative P(col | parent) as one flat array: row p holds p + cdf, so a
+    # whole chunk is drawn with a single searchsorted(flat, parent + u)
+    def _table(self, col, codes):
+        k = self.n_states_[col]
+        marginal = np.bincount(codes[col], minlength=k).astype(np.float64)
+        marginal /= marginal.sum()
+
+        parent = self.parents_[col]
+        if parent is None:
+            probs = marginal[None, :]
+        else:
+            kp = self.n_states_[parent]
+            joint = np.bincount(codes[parent] * k + codes[col], minlength=kp * k).reshape(kp, k)
+            probs = (joint + SMOOTHING * marginal) / (joint.sum(axis=1, keepdims=True) + SMOOTHING)
+
+        cdf = np.cumsum(probs, axis=1)
+        cdf[:, -1] = 1.0
+        return (np.arange(len(cdf))[:, None] + cdf).ravel()
+
+    #  Sampling
+    def sample_codes(self, n_rows, rng):
+        codes = {}
+        for col in self.order_:
+            parent = self.parents_[col]
+            offset = codes[parent] if parent is not None else np.zeros(n_rows, dtype=np.int64)
+            flat = np.searchsorted(self.tables_[col], offset + rng.random(n_rows), side="right")
+            codes[col] = flat - offset * self.n_states_[col]
+        return codes
+
+    # -> string array, row i the first n_items[i] items of a weighted random
+    # order joined with SEP, e.g. "Art Club, Coding Club". Built as a list
+    # array of item ids and joined by Arrow, so the cost is linear in the
+    # items drawn (the k! orderings are never enumerated)
+    def _items(self, col, n_items, rng):
+        k = len(self.items_[col])
+        # Gumbel keys: sorting them draws items without replacement, weighted
+        keys = np.log(self.item_weights_[col]) - np.log(-np.log(rng.random((len(n_items), k))))
+        order = np.argsort(-keys, axis=1)
+
+        taken = order[np.arange(k)[None, :] < n_items[:, None]]
+        offsets = np.concatenate([[0], np.cumsum(n_items)]).astype(np.int32)
+        lists = pa.ListArray.from_arrays(pa.array(offsets), self.dictionaries_[col].take(pa.array(taken)))
+        return pc.binary_join(lists, SEP)
+
+    def sample_table(self, n_rows, rng):
+        codes = self.sample_codes(n_rows, rng)
+        arrays = []
+        for col in self.columns_:
+            if col in NUMERIC_COLS:
+                edges = self.gpa_edges_[col]
+                lo, hi = edges[codes[col]], edges[codes[col] + 1]
+                arrays.append(pa.array(np.round(lo + (hi - lo) * rng.random(n_rows), 2)))
+                continue
+            if col in MULTI_VALUED_COLS:
+                arrays.append(self._items(col, codes[col] + 1, rng))
+                continue
+            arrays.append(pa.DictionaryArray.from_arrays(pa.array(codes[col].astype(np.int32)),
+                                                         self.dictionaries_[col]))
+        return pa.Table.from_arrays(arrays, names=self.columns_)
+
+    def sample(self, n_rows, seed=0):
+        return self.sample_table(n_rows, np.random.default_rng(seed)).to_pandas()
+
+
+def fit(path=RAW_DATA_PATH):
+    return SyntheticStudents().fit(pd.read_csv(path))
+
+
+#  Writing
+# Chunks go straight from Arrow to disk: .csv through Arrow's CSV writer
+# (an order of magnitude faster than DataFrame.to_csv), anything else as an
+# uncompressed Feather file like the rest of data/processed (data_io.py).
+def generate(output_path, n_rows, seed=0, chunk_rows=CHUNK_ROWS, model=None, input_path=RAW_DATA_PATH):
+    import pyarrow.csv as pcsv
+    import pyarrow.ipc as ipc
+
+    model = model or fit(input_path)
+    rng = np.random.default_rng(seed)
+    is_csv = output_path.lower().endswith(".csv")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    writer = None
+    with span("synthetic.generate", rows=n_rows), pa.OSFile(output_path, "wb") as sink:
+        for start in range(0, n_rows, chunk_rows):
+            table = model.sample_table(min(chunk_rows, n_rows - start), rng)
+            if is_csv:
+                # the CSV writer does not take dictionary columns
+                table = _decoded(table)
+            if writer is None:
+                writer = pcsv.CSVWriter(sink, table.schema) if is_csv else ipc.new_file(sink, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    return output_path
+
+
+def _decoded(table):
+    return pa.Table.from_arrays(
+        [col.cast(pa.string()) if pa.types.is_dictionary(col.type) else col for col in table.columns],
+        names=table.column_names,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic student rows in the raw CSV schema.")
+    parser.add_argument("output", help=".csv, or any other extension for Feather")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--input", default=RAW_DATA_PATH, help="raw CSV the distributions are learned from")
+    parser.add_argument("--show-structure", action="store_true", help="print the learned dependency tree")
+    args = parser.parse_args()
+
+    model = fit(args.input)
+    if args.show_structure:
+        for col in model.order_:
+            print(f"{col:<28} <- {model.parents_[col] or '-'}")
+
+    start = time.perf_counter()
+    generate(args.output, args.rows, args.seed, args.chunk_rows, model=model)
+    seconds = time.perf_counter() - start
+    size_mb = os.path.getsize(args.output) / 2**20
+    print(f"{args.rows} rows -> {args.output} ({size_mb:.0f} MB) in {seconds:.1f}s "
+          f"({args.rows / seconds * 60 / 1e6:.1f}M rows/min)")
+
+
+if __name__ == "__main__":
+    main()
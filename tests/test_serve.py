@@ -0,0 +1,149 @@
+import os
+import sys
+import json
+import asyncio
+
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+from tornado.testing import AsyncHTTPTestCase, gen_test
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src import inference
+from src.preprocessing import CareerPreprocessor
+from src.serve import make_app
+
+RAW_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "career_data.csv")
+
+# Long enough for every request of a test to land in one batch
+WINDOW_MS = 200
+
+
+# A small model fitted on the raw CSV (InterestArea as the target), so the
+# tests don't depend on the trained artifacts in data/models
+def fit_model():
+    df = pd.read_csv(RAW_DATA_PATH, nrows=300)
+    y = df.pop("InterestArea")
+    preprocessor = CareerPreprocessor().fit(df, y)
+    model = DecisionTreeClassifier(max_depth=4, random_state=0)
+    model.fit(preprocessor.transform(df), preprocessor.encode_target(y))
+    return model, preprocessor, df
+
+
+class RecommendTest(AsyncHTTPTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.model, cls.preprocessor, cls.raw = fit_model()
+
+    def get_app(self):
+        self.app = make_app(self.model, self.preprocessor, window_ms=WINDOW_MS)
+        return self.app
+
+    def tearDown(self):
+        self.app.batcher.close()
+        super().tearDown()
+
+    def record(self, i=0, **changes):
+        record = self.raw.iloc[i].to_dict()
+        record.update(changes)
+        return record
+
+    # the record as the handler hands it to the batcher (lower-case keys)
+    def preprocessor_record(self, i):
+        return {k.lower(): v for k, v in self.record(i).items()}
+
+    def post(self, body):
+        if not isinstance(body, (str, bytes)):
+            body = json.dumps(body)
+        return self.http_client.fetch(self.get_url("/recommend"), method="POST", body=body,
+                                      raise_error=False)
+
+    #  Batching
+    @gen_test
+    async def test_concurrent_requests_share_a_batch(self):
+        records = [self.record(i) for i in range(8)]
+        responses = await asyncio.gather(*[self.post(r) for r in records])
+
+        for record, response in zip(records, responses):
+            self.assertEqual(response.code, 200)
+            body = json.loads(response.body)
+            expected = inference.recommend(self.model, self.preprocessor, record)
+            self.assertEqual(body["career"], expected["career"])
+            self.assertAlmostEqual(body["score"], expected["score"])
+            self.assertGreater(body["batch_size"], 1)
+        self.assertEqual(self.app.batcher.metrics.requests, len(records))
+
+    def test_quiz_request(self):
+        quiz = {"env_key": "opt_tech", "problem_solving": 8, "activity": "Coding / Gaming",
+                "communication": 5, "language": "English"}
+        response = self.fetch("/recommend", method="POST", body=json.dumps({"quiz": quiz}))
+        self.assertEqual(response.code, 200)
+        self.assertIn(json.loads(response.body)["career"], self.preprocessor.target_classes_)
+
+    def test_numeric_text_is_converted(self):
+        response = self.fetch("/recommend", method="POST", body=json.dumps(self.record(gpa="6.54")))
+        self.assertEqual(response.code, 200)
+
+    #  400s
+    def assertBadRequest(self, body, reason):
+        response = self.fetch("/recommend", method="POST",
+                              body=body if isinstance(body, str) else json.dumps(body))
+        self.assertEqual(response.code, 400)
+        self.assertIn(reason, response.reason)
+        return response
+
+    def test_invalid_json(self):
+        self.assertBadRequest("{not json", "Invalid request")
+
+    def test_body_not_an_object(self):
+        self.assertBadRequest([self.record()], "expected a JSON object")
+
+    def test_missing_field(self):
+        record = self.record()
+        del record["GPA"]
+        self.assertBadRequest(record, "Missing fields: gpa")
+
+    def test_non_numeric_gpa(self):
+        self.assertBadRequest(self.record(GPA="high"), "gpa: expected a number")
+
+    def test_non_finite_gpa(self):
+        self.assertBadRequest(self.record(GPA="nan"), "gpa: expected a finite number")
+
+    def test_non_text_category(self):
+        self.assertBadRequest(self.record(Location=["Delhi"]), "location: expected text")
+
+    def test_bad_quiz(self):
+        self.assertBadRequest({"quiz": {"env_key": "opt_nope"}}, "Invalid request")
+
+    def test_errors_are_counted(self):
+        self.assertBadRequest(self.record(GPA="high"), "gpa")
+        self.assertEqual(self.app.batcher.metrics.errors, 1)
+
+    #  One bad record in a batch
+    @gen_test
+    async def test_bad_request_does_not_fail_its_batch(self):
+        bodies = [self.record(i) for i in range(4)] + [self.record(4, GPA="high")]
+        responses = await asyncio.gather(*[self.post(b) for b in bodies])
+
+        self.assertEqual([r.code for r in responses], [200, 200, 200, 200, 400])
+        self.assertEqual(json.loads(responses[0].body)["batch_size"], 4)
+
+    # a record that passes validation but fails in the model is retried
+    # alone: only its own request fails
+    @gen_test
+    async def test_failing_record_is_isolated(self):
+        batcher = self.app.batcher
+        records = [self.preprocessor_record(i) for i in range(4)]
+        records[2]["gpa"] = "high"
+
+        results = await asyncio.gather(*[batcher.submit(r) for r in records], return_exceptions=True)
+
+        self.assertIsInstance(results[2], ValueError)
+        for i in (0, 1, 3):
+            expected = inference.recommend(self.model, self.preprocessor, records[i])
+            self.assertEqual(results[i]["career"], expected["career"])
+        self.assertEqual(batcher.metrics.errors, 1)
+        self.assertEqual(batcher.metrics.requests, 3)